@@ -15,14 +15,19 @@ if config.config_file_name is not None:
     fileConfig(config.config_file_name)
 
 # add your model's MetaData object here
-# for 'autogenerate' support
-from app.core.database import Base
-from app.models.product import Product
-from app.models.order import Order
-from app.models.user import User
+# for 'autogenerate' support. Imported after fileConfig(), which would
+# otherwise disable the loggers these modules create.
+import app.models  # noqa: E402,F401 - registers every model on Base.metadata
+from app.core.config import settings  # noqa: E402
+from app.core.database import Base  # noqa: E402
+from app.core.migrations import include_object  # noqa: E402
 
 target_metadata = Base.metadata
 
+# Migrate the database the app uses (DATABASE_URL / .env), not the
+# placeholder URL in alembic.ini
+config.set_main_option("sqlalchemy.url", settings.database_url)
+
 # other values from the config, defined by the needs of env.py,
 # can be acquired:
 # my_important_option = config.get_main_option("my_important_option")
@@ -45,6 +50,7 @@ def run_migrations_offline() -> None:
     context.configure(
         url=url,
         target_metadata=target_metadata,
+        include_object=include_object,
         literal_binds=True,
         dialect_opts={"paramstyle": "named"},
     )
@@ -67,7 +73,11 @@ def run_migrations_online() -> None:
     )
 
     with connectable.connect() as connection:
-        context.configure(connection=connection, target_metadata=target_metadata)
+        context.configure(
+            connection=connection,
+            target_metadata=target_metadata,
+            include_object=include_object,
+        )
 
         with context.begin_transaction():
             context.run_migrations()
@@ -0,0 +1,29 @@
+"""add orders created_at index
+
+Revision ID: 3f9a1c7d2b60
+Revises: c24fec326076
+Create Date: 2026-10-18 11:20:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3f9a1c7d2b60"
+down_revision: Union[str, None] = "c24fec326076"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Newest-first order listing and keyset pagination on (created_at, id)
+    op.create_index(
+        "ix_orders_created_at_id", "orders", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_orders_created_at_id", table_name="orders")
@@ -0,0 +1,60 @@
+"""add query pattern indexes
+
+Revision ID: 5c7d2e8f4a16
+Revises: d41c7e9b2a05
+Create Date: 2026-10-18 14:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5c7d2e8f4a16"
+down_revision: Union[str, None] = "d41c7e9b2a05"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Order history by owner, newest first, with (created_at, id) keyset
+    op.create_index(
+        "ix_orders_user_id_created_at",
+        "orders",
+        ["user_id", "created_at", "id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_orders_customer_email_created_at",
+        "orders",
+        ["customer_email", "created_at", "id"],
+        unique=False,
+    )
+    # Covered by the composite index above
+    op.drop_index("ix_orders_customer_email", table_name="orders")
+    # selectinload fetches items with order_id IN (...)
+    op.create_index(
+        "ix_order_items_order_id", "order_items", ["order_id"], unique=False
+    )
+    # Active catalog in ID order
+    op.create_index(
+        "ix_products_active_id",
+        "products",
+        ["id"],
+        unique=False,
+        sqlite_where=sa.text("is_active = 1"),
+        postgresql_where=sa.text("is_active = 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_products_active_id", table_name="products")
+    op.drop_index("ix_order_items_order_id", table_name="order_items")
+    op.create_index(
+        "ix_orders_customer_email", "orders", ["customer_email"], unique=False
+    )
+    op.drop_index("ix_orders_customer_email_created_at", table_name="orders")
+    op.drop_index("ix_orders_user_id_created_at", table_name="orders")
@@ -0,0 +1,83 @@
+"""add product full-text search index
+
+Revision ID: 8b2e4f6a1d93
+Revises: 3f9a1c7d2b60
+Create Date: 2026-10-18 12:10:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8b2e4f6a1d93"
+down_revision: Union[str, None] = "3f9a1c7d2b60"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+TSVECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(sku, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+
+def upgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute(
+            f"CREATE INDEX ix_products_search ON products USING gin (({TSVECTOR}))"
+        )
+        return
+
+    # SQLite: external-content FTS5 table kept in sync by triggers
+    op.execute(
+        """
+        CREATE VIRTUAL TABLE products_fts USING fts5(
+            name, description, sku, content='products', content_rowid='id'
+        )
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER products_fts_ai AFTER INSERT ON products BEGIN
+            INSERT INTO products_fts(rowid, name, description, sku)
+            VALUES (new.id, new.name, new.description, new.sku);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER products_fts_ad AFTER DELETE ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+            VALUES ('delete', old.id, old.name, old.description, old.sku);
+        END
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER products_fts_au
+        AFTER UPDATE OF name, description, sku ON products BEGIN
+            INSERT INTO products_fts(products_fts, rowid, name, description, sku)
+            VALUES ('delete', old.id, old.name, old.description, old.sku);
+            INSERT INTO products_fts(rowid, name, description, sku)
+            VALUES (new.id, new.name, new.description, new.sku);
+        END
+        """
+    )
+    # Index the existing catalog
+    op.execute("INSERT INTO products_fts(products_fts) VALUES ('rebuild')")
+
+
+def downgrade() -> None:
+    dialect = op.get_bind().dialect.name
+    if dialect == "postgresql":
+        op.execute("DROP INDEX ix_products_search")
+        return
+
+    op.execute("DROP TRIGGER products_fts_au")
+    op.execute("DROP TRIGGER products_fts_ad")
+    op.execute("DROP TRIGGER products_fts_ai")
+    op.execute("DROP TABLE products_fts")
@@ -0,0 +1,29 @@
+"""add product image variants
+
+Revision ID: d41c7e9b2a05
+Revises: 8b2e4f6a1d93
+Create Date: 2026-10-18 13:30:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d41c7e9b2a05"
+down_revision: Union[str, None] = "8b2e4f6a1d93"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("products", sa.Column("image_variants", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    # Plain ALTER TABLE (SQLite 3.35+); a batch rebuild would drop the
+    # products_fts triggers along with the old table
+    op.drop_column("products", "image_variants")
@@ -0,0 +1,9 @@
+"""
+3D Print Shop API package.
+"""
+
+import time
+
+# Reference point for the startup-time budget; importing app.main always
+# imports this package first, so it covers the whole application import.
+IMPORT_STARTED = time.perf_counter()
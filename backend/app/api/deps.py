@@ -2,12 +2,16 @@
 API dependencies.
 """
 
-from typing import Generator, Optional
+import hmac
+from typing import Optional
 
 from fastapi import Depends, HTTPException, status
-from fastapi.security import OAuth2PasswordBearer
-from jose import JWTError, jwt
-from sqlalchemy.orm import Session
+from fastapi.security import (
+    HTTPAuthorizationCredentials,
+    HTTPBearer,
+    OAuth2PasswordBearer,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core import security
 from app.core.config import settings
@@ -19,10 +23,11 @@ oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/login/access-token")
 oauth2_scheme_optional = OAuth2PasswordBearer(
     tokenUrl="/api/v1/auth/login/access-token", auto_error=False
 )
+internal_token_scheme = HTTPBearer(auto_error=False)
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(oauth2_scheme)
+async def get_current_user(
+    db: AsyncSession = Depends(get_db), token: str = Depends(oauth2_scheme)
 ) -> User:
     """
     Get the current authenticated user from the JWT token.
@@ -47,7 +52,7 @@ def get_current_user(
     except ValueError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.id == user_id_int).first()
+    user = await UserService.get_user_by_id(db, user_id_int)
 
     if user is None:
         raise credentials_exception
@@ -55,8 +60,8 @@ def get_current_user(
     return user
 
 
-def get_current_user_optional(
-    db: Session = Depends(get_db),
+async def get_current_user_optional(
+    db: AsyncSession = Depends(get_db),
     token: Optional[str] = Depends(oauth2_scheme_optional),
 ) -> Optional[User]:
     """
@@ -79,11 +84,11 @@ def get_current_user_optional(
     except ValueError:
         return None
 
-    user = db.query(User).filter(User.id == user_id_int).first()
+    user = await UserService.get_user_by_id(db, user_id_int)
     return user
 
 
-def get_current_active_user(
+async def get_current_active_user(
     current_user: User = Depends(get_current_user),
 ) -> User:
     """
@@ -92,3 +97,26 @@ def get_current_active_user(
     if not current_user.is_active:
         raise HTTPException(status_code=400, detail="Inactive user")
     return current_user
+
+
+async def require_internal_token(
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(
+        internal_token_scheme
+    ),
+) -> None:
+    """
+    Allow only callers presenting INTERNAL_API_TOKEN as a bearer token.
+
+    The endpoints are hidden (404) when no token is configured.
+    """
+    expected = settings.internal_api_token
+    if not expected:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if credentials is None or not hmac.compare_digest(
+        credentials.credentials.encode(), expected.encode()
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid internal API token",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
@@ -0,0 +1,62 @@
+"""
+HTTP caching helpers: strong ETags, If-None-Match and Cache-Control.
+"""
+
+import hashlib
+from typing import Any, Dict, Optional
+
+from fastapi import Request, Response, status
+from starlette.staticfiles import StaticFiles
+
+from app.core.config import settings
+
+
+def compute_etag(body: bytes) -> str:
+    """Strong ETag derived from the serialized response body."""
+    return f'"{hashlib.sha1(body).hexdigest()}"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """
+    Evaluate an If-None-Match header against an ETag.
+
+    Uses the weak comparison RFC 9110 prescribes for If-None-Match, so a
+    ``W/`` prefix added by a proxy (e.g. nginx gzip) still matches.
+    """
+    if not if_none_match:
+        return False
+    candidates = [tag.strip() for tag in if_none_match.split(",")]
+    return "*" in candidates or etag in (tag.removeprefix("W/") for tag in candidates)
+
+
+def cache_headers(body: bytes) -> Dict[str, str]:
+    """ETag and Cache-Control headers for a cacheable catalog response."""
+    headers = {"ETag": compute_etag(body)}
+    if settings.catalog_cache_control:
+        headers["Cache-Control"] = settings.catalog_cache_control
+    return headers
+
+
+def conditional_json_response(
+    request: Request, body: bytes, headers: Dict[str, str]
+) -> Response:
+    """Return 304 Not Modified if the client's copy is current, else the body."""
+    if etag_matches(request.headers.get("if-none-match"), headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class ImmutableStaticFiles(StaticFiles):
+    """
+    Static files under content-addressed paths, cached for a year.
+
+    Only use this for files whose URL changes whenever their content does.
+    """
+
+    def file_response(self, *args: Any, **kwargs: Any) -> Response:
+        response = super().file_response(*args, **kwargs)
+        response.headers["Cache-Control"] = IMMUTABLE_CACHE_CONTROL
+        return response
@@ -0,0 +1,141 @@
+"""
+Idempotency-Key support for endpoints that clients retry on timeouts.
+
+A request carrying an ``Idempotency-Key`` header runs at most once per key:
+its JSON response is stored and returned again, marked with
+``Idempotent-Replayed: true``, for any retry of the same request within
+``IDEMPOTENCY_TTL_SECONDS``. Reusing a key for a different request, or
+as a different user, is rejected with 422.
+"""
+
+import asyncio
+from typing import Awaitable, Callable, Optional, Tuple
+from weakref import WeakValueDictionary
+
+from fastapi import HTTPException, Request, Response, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.services.idempotency_service import (
+    IdempotencyKeyInProgress,
+    IdempotencyKeyMismatch,
+    IdempotencyService,
+    request_fingerprint,
+)
+
+IDEMPOTENCY_KEY_HEADER = "Idempotency-Key"
+REPLAYED_HEADER = "Idempotent-Replayed"
+MAX_KEY_LENGTH = 255
+
+# Duplicates arriving at the same worker queue here and then replay the
+# stored response; the database claim covers duplicates on other workers.
+# Entries disappear once no request holds or waits for them.
+_key_locks: "WeakValueDictionary[Tuple[str, str], asyncio.Lock]" = WeakValueDictionary()
+
+
+def _key_lock(scope: str, key: str) -> asyncio.Lock:
+    lock = _key_locks.get((scope, key))
+    if lock is None:
+        lock = asyncio.Lock()
+        _key_locks[(scope, key)] = lock
+    return lock
+
+
+# Handlers receive this to store their response in their own transaction
+StoreResponse = Callable[[BaseModel], Awaitable[None]]
+
+
+async def _store_nothing(response: BaseModel) -> None:
+    pass
+
+
+def json_response(body: str, status_code: int, replayed: bool = False) -> Response:
+    headers = {REPLAYED_HEADER: "true"} if replayed else None
+    return Response(
+        content=body,
+        status_code=status_code,
+        media_type="application/json",
+        headers=headers,
+    )
+
+
+async def run_idempotent(
+    request: Request,
+    db: AsyncSession,
+    key: Optional[str],
+    handler: Callable[[StoreResponse], Awaitable[BaseModel]],
+    status_code: int = status.HTTP_200_OK,
+    user_id: Optional[int] = None,
+) -> Response:
+    """
+    Run ``handler`` once per Idempotency-Key and replay its response.
+
+    Without a key the handler simply runs. A request that fails (any
+    exception, including HTTPException) releases its key so it can be
+    retried. A duplicate still being handled by another worker gets 409.
+
+    A handler that commits its work should pass its response to the
+    ``store_response`` callback it is given before committing, so the
+    response is stored in the same transaction. Otherwise the response is
+    stored in a separate transaction after the handler returns, and a
+    worker dying in between leaves a claim that is taken over after
+    ``CLAIM_TIMEOUT``, running the handler again; external side effects
+    (such as Stripe payment intents) can then happen twice.
+    """
+    if key is None:
+        return json_response(
+            (await handler(_store_nothing)).model_dump_json(), status_code
+        )
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"{IDEMPOTENCY_KEY_HEADER} must be 1-{MAX_KEY_LENGTH} characters",
+        )
+
+    scope = request.url.path
+    # The caller's user ID is part of the fingerprint, so one user can never
+    # be served another user's stored response. Hashing the Authorization
+    # header instead would reject a retry made with a refreshed token.
+    fingerprint = request_fingerprint(
+        request.method.encode(),
+        await request.body(),
+        b"" if user_id is None else str(user_id).encode(),
+    )
+    async with _key_lock(scope, key):
+        try:
+            stored = await IdempotencyService.claim(db, scope, key, fingerprint)
+        except IdempotencyKeyMismatch:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail=f"{IDEMPOTENCY_KEY_HEADER} was already used for a "
+                "different request",
+            )
+        except IdempotencyKeyInProgress:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"A request with this {IDEMPOTENCY_KEY_HEADER} is still "
+                "being processed",
+                headers={"Retry-After": "1"},
+            )
+        if stored is not None:
+            return json_response(
+                str(stored.response_body), int(stored.status_code), replayed=True
+            )
+
+        recorded = False
+
+        async def store_response(response: BaseModel) -> None:
+            nonlocal recorded
+            await IdempotencyService.record_response(
+                db, scope, key, status_code, response.model_dump_json()
+            )
+            recorded = True
+
+        try:
+            body = (await handler(store_response)).model_dump_json()
+        except Exception:
+            await IdempotencyService.release(db, scope, key)
+            raise
+        if not recorded:
+            await IdempotencyService.complete(db, scope, key, status_code, body)
+    return json_response(body, status_code)
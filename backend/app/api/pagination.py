@@ -0,0 +1,120 @@
+"""
+Opaque cursors for keyset pagination.
+
+A cursor encodes the sort key of the last row of a page. The next page is
+fetched with ``WHERE key < cursor`` (or ``>``) instead of ``OFFSET``, so
+deep pages cost the same as the first one. The cursor for the next page is
+returned in the ``X-Next-Cursor`` response header, which keeps list bodies
+unchanged for existing clients.
+"""
+
+import base64
+import json
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from fastapi import HTTPException, Response, status
+
+from app.models.order import Order
+from app.models.product import Product
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+OrderCursor = Tuple[datetime, int]
+SearchCursor = Tuple[float, int]
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Encode sort-key values as a URL-safe opaque string."""
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> List[Any]:
+    """Decode a cursor produced by encode_cursor."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        values = None
+    if not isinstance(values, list):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+    return values
+
+
+def decode_order_cursor(cursor: Optional[str]) -> Optional[OrderCursor]:
+    """Parse an orders cursor into its (created_at, id) sort key."""
+    if cursor is None:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        created_at, order_id = values
+        return datetime.fromisoformat(created_at), int(order_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def decode_product_cursor(cursor: Optional[str]) -> Optional[int]:
+    """Parse a products cursor into the last product ID."""
+    if cursor is None:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        (product_id,) = values
+        return int(product_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def decode_search_cursor(cursor: Optional[str]) -> Optional[SearchCursor]:
+    """Parse a search cursor into its (score, id) sort key."""
+    if cursor is None:
+        return None
+    values = decode_cursor(cursor)
+    try:
+        score, product_id = values
+        return float(score), int(product_id)
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor"
+        )
+
+
+def next_order_cursor(orders: Sequence[Order], limit: int) -> Optional[str]:
+    """Cursor for the page after a full page of orders, else None."""
+    if orders and len(orders) >= limit:
+        last = orders[-1]
+        return encode_cursor([last.created_at.isoformat(), last.id])
+    return None
+
+
+def set_next_order_cursor(
+    response: Response, orders: Sequence[Order], limit: int
+) -> None:
+    """Set X-Next-Cursor when the page of orders is full."""
+    next_cursor = next_order_cursor(orders, limit)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+
+
+def next_product_cursor(products: Sequence[Product], limit: int) -> Optional[str]:
+    """Cursor for the page after a full page of products, else None."""
+    if products and len(products) >= limit:
+        return encode_cursor([products[-1].id])
+    return None
+
+
+def next_search_cursor(
+    results: Sequence[Tuple[Product, float]], limit: int
+) -> Optional[str]:
+    """Cursor for the page after a full page of search results, else None."""
+    if results and len(results) >= limit:
+        product, score = results[-1]
+        return encode_cursor([score, product.id])
+    return None
@@ -4,7 +4,15 @@ API v1 router combining all endpoints.
 
 from fastapi import APIRouter
 
-from app.api.v1.endpoints import auth, health, orders, payments, products, users
+from app.api.v1.endpoints import (
+    auth,
+    health,
+    internal,
+    orders,
+    payments,
+    products,
+    users,
+)
 
 # Create main API router
 api_router = APIRouter(prefix="/api/v1")
@@ -16,3 +24,4 @@ api_router.include_router(orders.router)
 api_router.include_router(auth.router)
 api_router.include_router(payments.router)
 api_router.include_router(users.router)
+api_router.include_router(internal.router)
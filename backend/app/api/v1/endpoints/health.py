@@ -10,7 +10,7 @@ router = APIRouter(tags=["health"])
 
 
 @router.get("/health")
-def health_check() -> dict:
+async def health_check() -> dict:
     """
     Health check endpoint.
 
@@ -25,6 +25,6 @@ def health_check() -> dict:
 
 
 @router.get("/ping")
-def ping() -> dict:
+async def ping() -> dict:
     """Simple ping endpoint to verify server is running."""
     return {"message": "pong"}
@@ -0,0 +1,40 @@
+"""
+Internal operational endpoints (metrics for capacity planning).
+
+Every endpoint requires the INTERNAL_API_TOKEN bearer token.
+"""
+
+from fastapi import APIRouter, Depends, Request
+
+from app.api.deps import require_internal_token
+from app.core.cache import product_cache
+from app.core.database import pool_metrics
+
+router = APIRouter(
+    prefix="/internal",
+    tags=["internal"],
+    dependencies=[Depends(require_internal_token)],
+)
+
+
+@router.get("/db-pool")
+async def db_pool_stats() -> dict:
+    """
+    Connection pool counters per engine.
+
+    Includes checked-out and overflow connections and the time requests
+    spent waiting for a connection on checkout.
+    """
+    return {name: metrics.snapshot() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/startup")
+async def startup_stats(request: Request) -> dict:
+    """Time spent importing the app and running lifespan startup."""
+    return getattr(request.app.state, "startup", {})
+
+
+@router.get("/cache")
+async def cache_stats() -> dict:
+    """Hit/miss counters of the in-process product cache."""
+    return {"products": product_cache.stats()}
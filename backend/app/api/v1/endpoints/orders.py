@@ -4,41 +4,50 @@ Order API endpoints.
 
 from typing import List, Optional, cast
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.api.idempotency import StoreResponse, run_idempotent
+from app.api.pagination import decode_order_cursor, set_next_order_cursor
+from app.core.database import get_db, get_read_db
 from app.schemas.order import OrderCreate, OrderResponse, OrderUpdate
 from app.services.order_service import OrderService
-from app.services.product_service import ProductService
+from app.services.product_service import InsufficientStockError, ProductService
 from app.api import deps
+from app.models.order import Order
 from app.models.user import User
 
 router = APIRouter(prefix="/orders", tags=["orders"])
 
 
 @router.get("/", response_model=List[OrderResponse])
-def list_orders(
+async def list_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[OrderResponse]:
     """
     List all orders with pagination (admin only).
 
     - **skip**: Number of orders to skip (default: 0)
     - **limit**: Maximum orders to return (default: 100, max: 100)
+    - **cursor**: Value of a previous X-Next-Cursor header; overrides skip
     """
     if limit > 100:
         limit = 100
-    orders = OrderService.get_all_orders(db, skip=skip, limit=limit)
+    orders = await OrderService.get_all_orders(
+        db, skip=skip, limit=limit, after=decode_order_cursor(cursor)
+    )
+    set_next_order_cursor(response, orders, limit)
     return [OrderResponse.model_validate(o) for o in orders]
 
 
 @router.get("/{order_id}", response_model=OrderResponse)
-def get_order(order_id: int, db: Session = Depends(get_db)) -> OrderResponse:
+async def get_order(order_id: int, db: AsyncSession = Depends(get_db)) -> OrderResponse:
     """Get an order by ID."""
-    order = OrderService.get_order_by_id(db, order_id)
+    order = await OrderService.get_order_by_id(db, order_id)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -48,11 +57,11 @@ def get_order(order_id: int, db: Session = Depends(get_db)) -> OrderResponse:
 
 
 @router.get("/number/{order_number}", response_model=OrderResponse)
-def get_order_by_number(
-    order_number: str, db: Session = Depends(get_db)
+async def get_order_by_number(
+    order_number: str, db: AsyncSession = Depends(get_db)
 ) -> OrderResponse:
     """Get an order by order number."""
-    order = OrderService.get_order_by_number(db, order_number)
+    order = await OrderService.get_order_by_number(db, order_number)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -62,39 +71,73 @@ def get_order_by_number(
 
 
 @router.get("/customer/{email}", response_model=List[OrderResponse])
-def get_customer_orders(
+async def get_customer_orders(
     email: str,
+    response: Response,
     skip: int = 0,
     limit: int = 50,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    db: AsyncSession = Depends(get_read_db),
 ) -> List[OrderResponse]:
     """Get all orders for a customer by email."""
     if limit > 100:
         limit = 100
-    orders = OrderService.get_orders_by_email(db, email, skip=skip, limit=limit)
+    orders = await OrderService.get_orders_by_email(
+        db, email, skip=skip, limit=limit, after=decode_order_cursor(cursor)
+    )
+    set_next_order_cursor(response, orders, limit)
     return [OrderResponse.model_validate(o) for o in orders]
 
 
 @router.post("/", response_model=OrderResponse, status_code=status.HTTP_201_CREATED)
-def create_order(
+async def create_order(
     order: OrderCreate,
-    db: Session = Depends(get_db),
+    request: Request,
+    db: AsyncSession = Depends(get_db),
     current_user: Optional[User] = Depends(deps.get_current_user_optional),
-) -> OrderResponse:
-    """Create a new order."""
+    idempotency_key: Optional[str] = Header(None),
+) -> Response:
+    """
+    Create a new order, reserving stock for every item.
+
+    Send an ``Idempotency-Key`` header to make retries safe: a repeated
+    request with the same key returns the original order instead of placing
+    another one.
+    """
     user_id = cast(int, current_user.id) if current_user else None
-    new_order = OrderService.create_order(db, order, user_id=user_id)
-    return new_order
+
+    async def place_order(store_response: StoreResponse) -> OrderResponse:
+        # The stored response is committed with the order itself, so a crash
+        # cannot leave an order whose key would let a retry place another
+        async def before_commit(new_order: Order) -> None:
+            await store_response(OrderResponse.model_validate(new_order))
+
+        try:
+            new_order = await OrderService.create_order(
+                db, order, user_id=user_id, before_commit=before_commit
+            )
+        except InsufficientStockError as e:
+            raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+        return OrderResponse.model_validate(new_order)
+
+    return await run_idempotent(
+        request,
+        db,
+        idempotency_key,
+        place_order,
+        status.HTTP_201_CREATED,
+        user_id=user_id,
+    )
 
 
 @router.put("/{order_id}", response_model=OrderResponse)
-def update_order(
+async def update_order(
     order_id: int,
     order_update: OrderUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> OrderResponse:
     """Update an order (status, payment ID, etc.)."""
-    order = OrderService.update_order(db, order_id, order_update)
+    order = await OrderService.update_order(db, order_id, order_update)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -104,10 +147,10 @@ def update_order(
 
 
 @router.post("/{order_id}/status/{new_status}", response_model=OrderResponse)
-def update_order_status(
+async def update_order_status(
     order_id: int,
     new_status: str,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> OrderResponse:
     """Update order status (pending, paid, shipped, delivered, cancelled)."""
     valid_statuses = ["pending", "paid", "shipped", "delivered", "cancelled"]
@@ -117,7 +160,7 @@ def update_order_status(
             detail=f"Invalid status. Must be one of: {', '.join(valid_statuses)}",
         )
 
-    order = OrderService.update_order_status(db, order_id, new_status)
+    order = await OrderService.update_order_status(db, order_id, new_status)
     if not order:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -127,37 +170,32 @@ def update_order_status(
 
 
 @router.post("/{order_id}/process-payment")
-def process_payment(
+async def process_payment(
     order_id: int,
     payment_data: dict,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """
     Process payment for an order (Stripe integration placeholder).
 
     This is a simplified endpoint. In production, integrate with Stripe.
     """
-    order = OrderService.get_order_by_id(db, order_id)
-    if not order:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Order with ID {order_id} not found",
-        )
-
-    if order.status != "pending":
+    # TODO: Integrate with Stripe API
+    # For now, just mark as paid if payment_data is valid
+    stripe_payment_id = payment_data.get("stripe_payment_id", "PLACEHOLDER_ID")
+    if not await OrderService.pay_order(db, order_id, stripe_payment_id):
+        # Only the failure path needs to look at the order
+        order = await OrderService.get_order_by_id(db, order_id)
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Order with ID {order_id} not found",
+            )
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Cannot process payment for order with status: {order.status}",
         )
 
-    # TODO: Integrate with Stripe API
-    # For now, just mark as paid if payment_data is valid
-    stripe_payment_id = payment_data.get("stripe_payment_id", "PLACEHOLDER_ID")
-    OrderService.update_order_status(db, order_id, "paid")
-    OrderService.update_order(
-        db, order_id, OrderUpdate(stripe_payment_id=stripe_payment_id)
-    )
-
     return {
         "status": "success",
         "message": "Payment processed",
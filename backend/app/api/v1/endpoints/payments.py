@@ -2,21 +2,33 @@
 Payment API endpoints.
 """
 
-from typing import Dict
-
-from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+import asyncio
+from typing import Dict, Optional, cast
+
+from fastapi import (
+    APIRouter,
+    Depends,
+    Header,
+    HTTPException,
+    Request,
+    Response,
+    status,
+)
 from pydantic import BaseModel, Field
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.api import deps
+from app.api.idempotency import StoreResponse, run_idempotent
 from app.services.payment_service import PaymentService
 from app.services.order_service import OrderService
 from app.core.database import get_db
+from app.models.user import User
 
 router = APIRouter(prefix="/payments", tags=["payments"])
 
 
 class PaymentIntentCreate(BaseModel):
-    amount: float = Field(..., gt=0, description="Amount in dollars")
+    order_id: int = Field(..., description="Pending order to pay")
     currency: str = Field("usd", description="Currency code")
 
 
@@ -25,21 +37,56 @@ class PaymentIntentResponse(BaseModel):
 
 
 @router.post("/create-intent", response_model=PaymentIntentResponse)
-def create_payment_intent(payment_data: PaymentIntentCreate):
+async def create_payment_intent(
+    payment_data: PaymentIntentCreate,
+    request: Request,
+    db: AsyncSession = Depends(get_db),
+    current_user: Optional[User] = Depends(deps.get_current_user_optional),
+    idempotency_key: Optional[str] = Header(None),
+) -> Response:
     """
-    Create a Stripe PaymentIntent for the frontend to process payment.
+    Create a Stripe PaymentIntent for the frontend to pay a pending order.
+
+    The amount is the order's server-computed total, so the customer is
+    charged exactly what the order records. With an ``Idempotency-Key``
+    header, retries return the original client secret without creating
+    another PaymentIntent.
     """
-    intent = PaymentService.create_payment_intent(
-        amount=payment_data.amount, currency=payment_data.currency
+
+    # The intent is created in Stripe, outside any transaction, so the
+    # response is stored after it returns (see run_idempotent)
+    async def create_intent(store_response: StoreResponse) -> PaymentIntentResponse:
+        order = await OrderService.get_order_by_id(db, payment_data.order_id)
+        if not order:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Order with ID {payment_data.order_id} not found",
+            )
+        if order.status != "pending":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Cannot pay for order with status: {order.status}",
+            )
+        # The Stripe SDK is blocking, so run it off the event loop
+        intent = await asyncio.to_thread(
+            PaymentService.create_payment_intent,
+            amount=order.total_amount,
+            currency=payment_data.currency,
+            metadata={"order_id": str(order.id)},
+        )
+        return PaymentIntentResponse(clientSecret=intent.client_secret)
+
+    user_id = cast(int, current_user.id) if current_user else None
+    return await run_idempotent(
+        request, db, idempotency_key, create_intent, user_id=user_id
     )
-    return {"clientSecret": intent.client_secret}
 
 
 @router.post("/webhook")
 async def stripe_webhook(
     request: Request,
     stripe_signature: str = Header(None),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ):
     """
     Handle Stripe webhooks for payment updates.
@@ -62,7 +109,9 @@ async def stripe_webhook(
         payment_id = payment_intent["id"]
 
         # Update order status to 'paid'
-        order = OrderService.update_order_status_by_payment_id(db, payment_id, "paid")
+        order = await OrderService.update_order_status_by_payment_id(
+            db, payment_id, "paid"
+        )
 
         if order:
             print(f"Order {order.order_number} status updated to 'paid'")
@@ -2,74 +2,344 @@
 Product API endpoints.
 """
 
-from typing import List
+from typing import AsyncIterator, Dict, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import StreamingResponse
+from pydantic import TypeAdapter
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.schemas.product import ProductCreate, ProductResponse, ProductUpdate
+from app.api.http_cache import cache_headers, conditional_json_response
+from app.api.pagination import (
+    NEXT_CURSOR_HEADER,
+    decode_product_cursor,
+    decode_search_cursor,
+    next_product_cursor,
+    next_search_cursor,
+)
+from app.core.cache import product_cache
+from app.core.config import settings
+from app.core.database import (
+    ReadSessionOpener,
+    get_db,
+    get_read_db,
+    get_read_session_opener,
+    get_stream_db,
+)
+from app.schemas.product import (
+    ProductBatchRequest,
+    ProductBatchResponse,
+    ProductCreate,
+    ProductImportReport,
+    ProductResponse,
+    ProductUpdate,
+    StockCheckLine,
+    StockCheckRequest,
+    StockCheckResponse,
+)
+from app.services.image_service import (
+    ImageService,
+    ImageTooLargeError,
+    detect_image_type,
+)
+from app.services.product_export import EXPORT_FORMATS, ProductExportService
+from app.services.product_import import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ProductImportService,
+    detect_format,
+)
 from app.services.product_service import ProductService
 
 router = APIRouter(prefix="/products", tags=["products"])
 
+# Catalog reads are served from product_cache as pre-serialized JSON together
+# with their ETag. They open a read session only on a cache miss, so a hit
+# does not touch the database (not even a read replica's liveness check).
+product_list_adapter = TypeAdapter(List[ProductResponse])
+
 
 @router.get("/", response_model=List[ProductResponse])
-def list_products(
+async def list_products(
+    request: Request,
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
-) -> List[ProductResponse]:
+    cursor: Optional[str] = None,
+    read_session: ReadSessionOpener = Depends(get_read_session_opener),
+) -> Response:
     """
     List all active products with pagination.
 
     - **skip**: Number of products to skip (default: 0)
     - **limit**: Maximum products to return (default: 100, max: 100)
+    - **cursor**: Value of a previous X-Next-Cursor header; overrides skip
     """
     if limit > 100:
         limit = 100
-    products = ProductService.get_all_products(db, skip=skip, limit=limit)
-    return [ProductResponse.model_validate(p) for p in products]
+    after_id = decode_product_cursor(cursor)
+    key = ("list", skip if after_id is None else 0, limit, after_id)
+    cached = product_cache.get(key)
+    if cached is None:
+        generation = product_cache.generation
+        async with read_session() as db:
+            products = await ProductService.get_all_products(
+                db, skip=skip, limit=limit, after_id=after_id
+            )
+        next_cursor = next_product_cursor(products, limit)
+        body = product_list_adapter.dump_json(
+            product_list_adapter.validate_python(products, from_attributes=True)
+        )
+        headers = cache_headers(body)
+        if next_cursor:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+        cached = (body, headers)
+        product_cache.set(key, cached, generation)
+    return conditional_json_response(request, *cached)
 
 
-@router.get("/{product_id}", response_model=ProductResponse)
-def get_product(product_id: int, db: Session = Depends(get_db)) -> ProductResponse:
-    """Get a product by ID."""
-    product = ProductService.get_product_by_id(db, product_id)
-    if not product:
+@router.post("/batch", response_model=ProductBatchResponse)
+async def get_products_batch(
+    request: ProductBatchRequest,
+    db: AsyncSession = Depends(get_read_db),
+) -> ProductBatchResponse:
+    """
+    Get up to 100 products by ID in one request.
+
+    Products are returned in request order; unknown IDs are listed in
+    ``missing``.
+    """
+    products = await ProductService.get_products_by_ids(db, request.ids)
+    found = {product.id for product in products}
+    return ProductBatchResponse(
+        products=[ProductResponse.model_validate(p) for p in products],
+        missing=[pid for pid in dict.fromkeys(request.ids) if pid not in found],
+    )
+
+
+@router.get("/export")
+async def export_products(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    db: AsyncSession = Depends(get_stream_db),
+) -> StreamingResponse:
+    """
+    Stream every active product as NDJSON or CSV, e.g. for shopping feeds.
+
+    The catalog is read with a server-side cursor and written in batches, so
+    memory use stays flat regardless of catalog size.
+    """
+    if format not in EXPORT_FORMATS:
+        await db.close()
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail=f"Product with ID {product_id} not found",
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify format=ndjson or format=csv",
         )
-    return product
+
+    async def body() -> AsyncIterator[str]:
+        try:
+            async for chunk in ProductExportService.iter_export(db, format):
+                yield chunk
+        finally:
+            await db.close()
+
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_FORMATS[format],
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'},
+    )
+
+
+@router.get("/search", response_model=List[ProductResponse])
+async def search_products(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    read_session: ReadSessionOpener = Depends(get_read_session_opener),
+) -> Response:
+    """
+    Full-text search over product name, description and SKU.
+
+    - **q**: Search terms; every term must match, as a word prefix
+    - **limit**: Maximum products to return (default: 20, max: 100)
+    - **cursor**: Value of a previous X-Next-Cursor header
+
+    Results are ordered by relevance.
+    """
+    if limit > 100:
+        limit = 100
+    after = decode_search_cursor(cursor)
+    key = ("search", q, limit, after)
+    cached = product_cache.get(key)
+    if cached is None:
+        generation = product_cache.generation
+        async with read_session() as db:
+            results = await ProductService.search_products(
+                db, q, limit=limit, after=after
+            )
+        next_cursor = next_search_cursor(results, limit)
+        body = product_list_adapter.dump_json(
+            product_list_adapter.validate_python(
+                [product for product, _ in results], from_attributes=True
+            )
+        )
+        headers = cache_headers(body)
+        if next_cursor:
+            headers[NEXT_CURSOR_HEADER] = next_cursor
+        cached = (body, headers)
+        product_cache.set(key, cached, generation)
+    return conditional_json_response(request, *cached)
+
+
+@router.get("/{product_id}", response_model=ProductResponse)
+async def get_product(
+    product_id: int,
+    request: Request,
+    read_session: ReadSessionOpener = Depends(get_read_session_opener),
+) -> Response:
+    """Get a product by ID."""
+    key = ("product", product_id)
+    cached = product_cache.get(key)
+    if cached is None:
+        generation = product_cache.generation
+        async with read_session() as db:
+            product = await ProductService.get_product_by_id(db, product_id)
+        if not product:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Product with ID {product_id} not found",
+            )
+        body = ProductResponse.model_validate(product).model_dump_json().encode()
+        cached = (body, cache_headers(body))
+        product_cache.set(key, cached, generation)
+    return conditional_json_response(request, *cached)
 
 
 @router.post("/", response_model=ProductResponse, status_code=status.HTTP_201_CREATED)
-def create_product(
+async def create_product(
     product: ProductCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ProductResponse:
     """Create a new product."""
     # Check if product with same SKU exists
-    existing = ProductService.get_product_by_sku(db, product.sku)
+    existing = await ProductService.get_product_by_sku(db, product.sku)
     if existing:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=f"Product with SKU {product.sku} already exists",
         )
 
-    new_product = ProductService.create_product(db, product)
+    new_product = await ProductService.create_product(db, product)
     return new_product
 
 
+@router.post("/import", response_model=ProductImportReport)
+async def import_products(
+    file: UploadFile = File(...),
+    format: Optional[str] = Query(None, description="csv or jsonl"),
+    batch_size: int = Query(DEFAULT_BATCH_SIZE, ge=1, le=5000),
+    db: AsyncSession = Depends(get_db),
+) -> ProductImportReport:
+    """
+    Bulk create or update products by SKU from a CSV or JSONL upload.
+
+    - **file**: CSV with a header row, or one JSON product per line
+    - **format**: Overrides the format guessed from the file name
+    - **batch_size**: Rows written per transaction
+
+    Invalid rows are skipped and reported; valid rows are still imported.
+    """
+    fmt = format or detect_format(file.filename)
+    if fmt not in IMPORT_FORMATS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Specify format=csv or format=jsonl",
+        )
+    # The upload is spooled to disk by the multipart parser and read back
+    # in batches, so large catalogs do not sit in memory
+    return await ProductImportService.import_products(
+        db, file.file, fmt, batch_size=batch_size
+    )
+
+
+@router.post(
+    "/{product_id}/image",
+    response_model=ProductResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def upload_product_image(
+    product_id: int,
+    background_tasks: BackgroundTasks,
+    file: UploadFile = File(...),
+    db: AsyncSession = Depends(get_db),
+) -> ProductResponse:
+    """
+    Upload a JPEG, PNG, GIF or WebP image for a product.
+
+    Images over ``IMAGE_MAX_PIXELS`` are rejected with 400, based on their
+    header, before any pixels are decoded.
+
+    The original is stored and becomes ``image_url`` immediately. Thumbnail
+    and medium JPEG/WebP variants are built in a process pool after the
+    response is sent and appear in ``image_variants`` once ready.
+    """
+    product = await ProductService.get_product_by_id(db, product_id)
+    if not product:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Product with ID {product_id} not found",
+        )
+
+    data = await file.read(settings.image_max_upload_bytes + 1)
+    if len(data) > settings.image_max_upload_bytes:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail="Image is too large",
+        )
+    extension = detect_image_type(data)
+    if extension is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload a JPEG, PNG, GIF or WebP image",
+        )
+    try:
+        await ImageService.verify_upload(data)
+    except ImageTooLargeError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Image has more than {settings.image_max_pixels} pixels",
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Upload a JPEG, PNG, GIF or WebP image",
+        )
+
+    key = await ImageService.attach_image(db, product, data, extension)
+    background_tasks.add_task(
+        ImageService.generate_variants, db.bind, product_id, key, extension
+    )
+    return ProductResponse.model_validate(product)
+
+
 @router.put("/{product_id}", response_model=ProductResponse)
-def update_product(
+async def update_product(
     product_id: int,
     product_update: ProductUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> ProductResponse:
     """Update an existing product."""
-    product = ProductService.update_product(db, product_id, product_update)
+    product = await ProductService.update_product(db, product_id, product_update)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -79,9 +349,9 @@ def update_product(
 
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
-def delete_product(product_id: int, db: Session = Depends(get_db)) -> None:
+async def delete_product(product_id: int, db: AsyncSession = Depends(get_db)) -> None:
     """Delete (soft delete) a product by ID."""
-    success = ProductService.delete_product(db, product_id)
+    success = await ProductService.delete_product(db, product_id)
     if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -97,23 +367,63 @@ class CheckStockRequest(BaseModel):
 
 
 @router.post("/{product_id}/check-stock")
-def check_stock(
+async def check_stock(
     product_id: int,
     request: CheckStockRequest,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> dict:
     """Check if a product has sufficient stock."""
-    product = ProductService.get_product_by_id(db, product_id)
+    product = await ProductService.get_product_by_id(db, product_id)
     if not product:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Product with ID {product_id} not found",
         )
 
-    has_stock = ProductService.check_stock(db, product_id, request.quantity)
+    has_stock = product.stock >= request.quantity
     return {
         "product_id": product_id,
         "requested_quantity": request.quantity,
         "available_stock": product.stock,
         "has_sufficient_stock": has_stock,
     }
+
+
+@router.post("/check-stock", response_model=StockCheckResponse)
+async def check_cart_stock(
+    request: StockCheckRequest,
+    db: AsyncSession = Depends(get_db),
+) -> StockCheckResponse:
+    """
+    Check stock and current prices for a whole cart with one query.
+
+    Lines for the same product are checked against their combined quantity.
+    Missing or inactive products are reported as unavailable.
+    """
+    products = await ProductService.get_products_by_ids(
+        db, [item.product_id for item in request.items]
+    )
+    by_id = {product.id: product for product in products}
+    demand: Dict[int, int] = {}
+    for item in request.items:
+        demand[item.product_id] = demand.get(item.product_id, 0) + item.quantity
+
+    lines = []
+    for item in request.items:
+        product = by_id.get(item.product_id)
+        lines.append(
+            StockCheckLine(
+                product_id=item.product_id,
+                requested_quantity=item.quantity,
+                available_stock=product.stock if product else 0,
+                price=product.price if product else None,
+                has_sufficient_stock=bool(
+                    product
+                    and product.is_active
+                    and product.stock >= demand[item.product_id]
+                ),
+            )
+        )
+    return StockCheckResponse(
+        items=lines, all_available=all(line.has_sufficient_stock for line in lines)
+    )
@@ -2,13 +2,14 @@
 User API endpoints.
 """
 
-from typing import Any, List, cast
+from typing import Any, List, Optional, cast
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api import deps
-from app.core.database import get_db
+from app.api.pagination import decode_order_cursor, set_next_order_cursor
+from app.core.database import get_db, get_read_db
 from app.models.user import User
 from app.schemas.order import OrderResponse
 from app.schemas.user import UserResponse, UserUpdate
@@ -19,7 +20,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 
 
 @router.get("/me", response_model=UserResponse)
-def read_user_me(
+async def read_user_me(
     current_user: User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -29,28 +30,36 @@ def read_user_me(
 
 
 @router.get("/me/orders", response_model=List[OrderResponse])
-def read_user_orders(
+async def read_user_orders(
+    response: Response,
     skip: int = 0,
     limit: int = 50,
+    cursor: Optional[str] = None,
     current_user: User = Depends(deps.get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
 ) -> Any:
     """
     Get current user's orders.
     """
-    return OrderService.get_orders_by_user_id(
-        db, user_id=cast(int, current_user.id), skip=skip, limit=limit
+    orders = await OrderService.get_orders_by_user_id(
+        db,
+        user_id=cast(int, current_user.id),
+        skip=skip,
+        limit=limit,
+        after=decode_order_cursor(cursor),
     )
+    set_next_order_cursor(response, orders, limit)
+    return orders
 
 
 @router.put("/me", response_model=UserResponse)
-def update_user_me(
+async def update_user_me(
     user_in: UserUpdate,
     current_user: User = Depends(deps.get_current_active_user),
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
 ) -> Any:
     """
     Update own user.
     """
-    user = UserService.update_user(db, current_user, user_in)
+    user = await UserService.update_user(db, current_user, user_in)
     return user
@@ -3,7 +3,7 @@ Application configuration settings.
 Loads from environment variables using pydantic-settings.
 """
 
-from typing import List
+from typing import List, Optional
 
 from pydantic_settings import BaseSettings
 
@@ -16,14 +16,103 @@ class Settings(BaseSettings):
     app_version: str = "0.1.0"
     debug: bool = True
     environment: str = "development"
+    log_level: str = "INFO"
 
     # Database configuration
     database_url: str = "sqlite:///./ecommerce.db"
+    # Optional read replicas for read-only endpoints (round-robin)
+    replica_database_urls: List[str] = []
+
+    # Query logging: statements slower than the threshold are logged as
+    # warnings; a fraction of all statements can be logged for debugging
+    db_slow_query_ms: float = 200.0
+    db_query_log_sample_rate: float = 0.0
+
+    # Per-request query counting (Server-Timing header). In debug mode a
+    # statement repeated more than the threshold in one request is logged
+    # as a possible N+1.
+    query_stats_enabled: bool = True
+    db_repeated_query_threshold: int = 5
+
+    # Connection pool (ignored for in-memory SQLite)
+    db_pool_size: int = 5
+    db_max_overflow: int = 10
+    db_pool_timeout: float = 30.0  # seconds to wait for a free connection
+    db_pool_recycle: int = 1800  # seconds before a connection is replaced
+    db_pool_pre_ping: bool = True
+
+    # SQLite tuning, applied as PRAGMAs on every new connection
+    sqlite_pragmas_enabled: bool = True
+    sqlite_journal_mode: str = "WAL"
+    sqlite_synchronous: str = "NORMAL"
+    sqlite_busy_timeout_ms: int = 5000
+    sqlite_cache_size_kib: int = 64000  # page cache per connection
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # bytes of memory-mapped I/O
+    sqlite_temp_store: str = "MEMORY"
+
+    # In-process cache of serialized product responses. Each worker has its
+    # own copy; writes clear it locally and the TTL bounds staleness elsewhere.
+    # A TTL of 0 disables the cache.
+    product_cache_ttl_seconds: float = 60.0
+    product_cache_max_entries: int = 1024
+    # Cache-Control for catalog responses, which also carry an ETag. The
+    # default makes browsers and proxies revalidate (cheap 304) every time.
+    catalog_cache_control: str = "public, no-cache"
+
+    # Uploaded product images. Originals and resized variants are written
+    # under media_root and served from media_url with immutable caching.
+    media_root: str = "./media"
+    media_url: str = "/media"
+    image_max_upload_bytes: int = 10 * 1024 * 1024
+    # Width * height cap, checked from the header before decoding: a small
+    # compressed file can expand to a huge bitmap
+    image_max_pixels: int = 40_000_000
+    image_workers: int = 2  # processes for resizing
+
+    # Order pricing: totals are computed server-side from catalog prices as
+    # subtotal + flat shipping + tax on the subtotal
+    order_shipping_cost: float = 9.99
+    order_tax_rate: float = 0.08
+    # Worker ID (0-1023) embedded in order numbers. Defaults to a random ID
+    # per process; give every process a distinct value to rule out duplicate
+    # order numbers (which are retried once with a new random ID).
+    order_worker_id: Optional[int] = None
+
+    # Idempotency-Key handling for order and payment-intent creation: stored
+    # responses are replayed for retries within the TTL, and expired keys are
+    # purged at most once per interval per worker
+    idempotency_ttl_seconds: int = 24 * 60 * 60
+    idempotency_purge_interval_seconds: float = 300.0
+
+    # Transactional outbox: side effects (emails) are recorded in the same
+    # transaction as the change causing them and delivered by a background
+    # worker in each process. Failed deliveries are retried with exponential
+    # backoff until max attempts; a claimed event is retried after the lease.
+    # Events that gave up are kept for inspection for the retention period
+    # and purged at most once per interval per worker.
+    outbox_worker_enabled: bool = True
+    outbox_batch_size: int = 50
+    outbox_poll_interval_seconds: float = 1.0
+    outbox_lease_seconds: float = 60.0
+    outbox_max_attempts: int = 10
+    outbox_retry_base_seconds: float = 2.0
+    outbox_retry_max_seconds: float = 300.0
+    outbox_failed_retention_seconds: int = 7 * 24 * 60 * 60
+    outbox_purge_interval_seconds: float = 300.0
 
     # Security settings
     secret_key: str = "your-super-secret-key-change-this-in-production"
     algorithm: str = "HS256"
     access_token_expire_minutes: int = 30
+    # Bearer token for the /api/v1/internal metrics endpoints; they answer
+    # 404 while it is empty
+    internal_api_token: str = ""
+
+    # Startup: Alembic revision check ("strict", "warn" or "off") and the
+    # time budget for app import plus lifespan startup
+    db_schema_check: str = "warn"
+    startup_time_budget_seconds: float = 5.0
+    import_time_budget_seconds: float = 3.0  # `import app.main` alone
 
     # CORS settings
     cors_origins: List[str] = [
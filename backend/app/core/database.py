@@ -2,36 +2,240 @@
 Database configuration and session management.
 """
 
-from typing import Generator
+import itertools
+import logging
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncGenerator,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+)
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
+from sqlalchemy import Engine, event
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+from sqlalchemy.orm import declarative_base
 
 from app.core.config import settings
+from app.core.pool_metrics import InstrumentedQueuePool, PoolMetrics, instrument_engine
+from app.core.query_log import register_query_logging
+
+logger = logging.getLogger(__name__)
+
+# Async drivers for the sync URLs used in .env files and alembic.ini
+ASYNC_DRIVERS = {
+    "sqlite": "sqlite+aiosqlite",
+    "postgresql": "postgresql+asyncpg",
+    "postgres": "postgresql+asyncpg",
+}
 
-# Create database engine
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False}
-    if "sqlite" in settings.database_url
-    else {},
-    echo=settings.debug,
+
+def get_async_database_url(url: str) -> str:
+    """
+    Map a plain database URL onto its async driver.
+
+    URLs that already name a driver (e.g. ``sqlite+aiosqlite://``) are
+    returned unchanged.
+    """
+    scheme, sep, rest = url.partition("://")
+    if not sep or "+" in scheme:
+        return url
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+
+def get_sqlite_pragmas() -> Dict[str, Any]:
+    """Build the PRAGMA profile for SQLite connections from settings."""
+    return {
+        "journal_mode": settings.sqlite_journal_mode,
+        "synchronous": settings.sqlite_synchronous,
+        "busy_timeout": settings.sqlite_busy_timeout_ms,
+        # Negative cache_size is interpreted by SQLite as KiB, not pages
+        "cache_size": -settings.sqlite_cache_size_kib,
+        "mmap_size": settings.sqlite_mmap_size,
+        "temp_store": settings.sqlite_temp_store,
+    }
+
+
+def register_sqlite_pragmas(sync_engine: Engine) -> None:
+    """
+    Apply the SQLite PRAGMA profile to every connection the engine opens.
+
+    PRAGMAs are per-connection state, so they are set from a connect-event
+    hook rather than once at startup.
+    """
+    pragmas = get_sqlite_pragmas()
+
+    @event.listens_for(sync_engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+
+def get_engine_options(url: str) -> Dict[str, Any]:
+    """Build engine keyword arguments, including pool sizing from settings."""
+    options: Dict[str, Any] = {}
+    if "sqlite" in url:
+        options["connect_args"] = {"check_same_thread": False}
+        if ":memory:" in url:
+            # In-memory databases live in a single connection; keep the
+            # dialect's default pool
+            return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.db_pool_size,
+        max_overflow=settings.db_max_overflow,
+        pool_timeout=settings.db_pool_timeout,
+        pool_recycle=settings.db_pool_recycle,
+        pool_pre_ping=settings.db_pool_pre_ping,
+    )
+    return options
+
+
+def create_database_engine(url: str) -> AsyncEngine:
+    """Create an instrumented async engine for a database URL."""
+    async_url = get_async_database_url(url)
+    db_engine = create_async_engine(async_url, **get_engine_options(async_url))
+    if db_engine.dialect.name == "sqlite" and settings.sqlite_pragmas_enabled:
+        register_sqlite_pragmas(db_engine.sync_engine)
+    register_query_logging(
+        db_engine.sync_engine,
+        slow_query_ms=settings.db_slow_query_ms,
+        sample_rate=settings.db_query_log_sample_rate,
+    )
+    return db_engine
+
+
+# Create async database engine
+engine = create_database_engine(settings.database_url)
+
+# Pool counters per engine, exposed on the internal metrics endpoint
+pool_metrics: Dict[str, PoolMetrics] = {"primary": instrument_engine(engine)}
+
+# Create session factory. Objects stay usable after commit so endpoints can
+# serialize them without triggering implicit IO outside the event loop.
+AsyncSessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
 )
 
-# Create session factory
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+class ReadRouter:
+    """
+    Hands out sessions for read-only traffic.
+
+    Replicas are used round-robin; if none are configured or the chosen
+    replica cannot be reached, the session falls back to the primary.
+    """
+
+    def __init__(
+        self,
+        primary: async_sessionmaker[AsyncSession],
+        replicas: List[async_sessionmaker[AsyncSession]],
+    ) -> None:
+        self.primary = primary
+        self.replicas = replicas
+        self._cycle = itertools.cycle(replicas)
+
+    async def open_session(self) -> AsyncSession:
+        """Open a session on the next replica, or on the primary."""
+        if self.replicas:
+            db = next(self._cycle)()
+            try:
+                # Check out the connection now so a dead replica is detected
+                # before the endpoint runs
+                await db.connection()
+                return db
+            except (DBAPIError, OSError) as e:
+                await db.close()
+                logger.warning("Read replica unavailable, using primary: %s", e)
+        return self.primary()
+
+
+replica_engines = [
+    create_database_engine(url) for url in settings.replica_database_urls
+]
+for index, replica_engine in enumerate(replica_engines):
+    pool_metrics[f"replica-{index}"] = instrument_engine(replica_engine)
+
+read_router = ReadRouter(
+    AsyncSessionLocal,
+    [
+        async_sessionmaker(bind=replica, autoflush=False, expire_on_commit=False)
+        for replica in replica_engines
+    ],
+)
 
 # Base class for SQLAlchemy models
 Base = declarative_base()
 
 
-def get_db() -> Generator:
+async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency for getting database session in endpoints.
-    Yields a database session and ensures it's closed after use.
+    Yields an async database session and ensures it's closed after use.
     """
-    db = SessionLocal()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+ReadSessionOpener = Callable[[], AsyncContextManager[AsyncSession]]
+
+
+@asynccontextmanager
+async def open_read_session() -> AsyncIterator[AsyncSession]:
+    """Open a read session through ``read_router`` and close it on exit."""
+    db = await read_router.open_session()
     try:
         yield db
     finally:
-        db.close()
+        await db.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency for read-only endpoints.
+    Yields a session on a read replica when configured, otherwise the primary.
+    Do not use it for writes or read-after-write flows.
+    """
+    async with open_read_session() as db:
+        yield db
+
+
+def get_read_session_opener() -> ReadSessionOpener:
+    """
+    Dependency for read-only endpoints that often need no database, such as
+    cached catalog reads.
+
+    Returns a context manager factory instead of a session. The replica
+    check (which connects) only runs when it is entered, so a cache hit
+    checks out no connection.
+    """
+    return open_read_session
+
+
+async def get_stream_db() -> AsyncSession:
+    """
+    Dependency for read-only StreamingResponse endpoints.
+
+    FastAPI closes ``yield`` dependencies before a streaming body is sent, so
+    this returns an unmanaged read session; the response body must close it.
+    """
+    return await read_router.open_session()
+
+
+async def dispose_engines() -> None:
+    """Close all pooled connections on the primary and replica engines."""
+    await engine.dispose()
+    for replica in replica_engines:
+        await replica.dispose()
@@ -0,0 +1,96 @@
+"""
+Application middleware.
+"""
+
+import logging
+import time
+from typing import Optional
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.query_log import RequestQueryStats, current_query_stats, fingerprint
+
+logger = logging.getLogger("app.db.queries")
+
+
+class QueryStatsMiddleware:
+    """
+    Count SQL statements and database time per request.
+
+    Totals are returned as ``Server-Timing: db;dur=..;desc="N queries"``.
+    The response start is held back until the first body chunk: a streamed
+    body (more chunks to come) still has queries to run, so it gets no
+    header and its totals are logged at DEBUG once it finishes instead.
+    With ``warn_repeated`` set, statements that repeat more than
+    ``repeated_threshold`` times in one request (the N+1 pattern) are
+    logged as warnings.
+
+    Implemented as plain ASGI rather than BaseHTTPMiddleware so it adds no
+    extra task or response buffering per request.
+    """
+
+    def __init__(
+        self, app: ASGIApp, warn_repeated: bool = False, repeated_threshold: int = 5
+    ) -> None:
+        self.app = app
+        self.warn_repeated = warn_repeated
+        self.repeated_threshold = repeated_threshold
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestQueryStats()
+        token = current_query_stats.set(stats)
+        started = time.perf_counter()
+
+        start_message: Optional[Message] = None
+        streamed = False
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal start_message, streamed
+            if message["type"] == "http.response.start":
+                start_message = message
+                return
+            if message["type"] == "http.response.body" and start_message is not None:
+                if message.get("more_body", False):
+                    streamed = True
+                else:
+                    total_ms = (time.perf_counter() - started) * 1000
+                    headers = MutableHeaders(scope=start_message)
+                    headers.append(
+                        "Server-Timing",
+                        f"db;dur={stats.duration_ms:.2f};"
+                        f'desc="{stats.count} queries", '
+                        f"app;dur={total_ms:.2f}",
+                    )
+                await send(start_message)
+                start_message = None
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            current_query_stats.reset(token)
+            if streamed:
+                logger.debug(
+                    "%s %s streamed: %d queries, db %.2fms, total %.2fms",
+                    scope["method"],
+                    scope["path"],
+                    stats.count,
+                    stats.duration_ms,
+                    (time.perf_counter() - started) * 1000,
+                )
+            if self.warn_repeated:
+                for shape, count in stats.repeated(self.repeated_threshold):
+                    logger.warning(
+                        "possible N+1: %s %s ran %d times in one request "
+                        "fingerprint=%s statement=%s",
+                        scope["method"],
+                        scope["path"],
+                        count,
+                        fingerprint(shape),
+                        shape,
+                    )
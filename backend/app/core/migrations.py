@@ -0,0 +1,89 @@
+"""
+Alembic revision checks used at application startup.
+"""
+
+import logging
+from pathlib import Path
+from typing import Any, Optional, Set, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+# backend/alembic.ini, next to the app package
+ALEMBIC_INI = Path(__file__).resolve().parents[2] / "alembic.ini"
+
+
+# Tables the database creates for itself and that are not in Base.metadata:
+# the FTS5 product index (products_fts) and its shadow tables
+# (products_fts_data, _idx, _docsize, _config), created by raw DDL
+UNMANAGED_TABLE_PREFIXES = ("products_fts",)
+
+
+def include_object(
+    obj: Any, name: Optional[str], type_: str, reflected: bool, compare_to: Any
+) -> bool:
+    """
+    Alembic ``include_object`` hook that hides unmanaged tables.
+
+    Without it autogenerate sees the FTS tables in the database but not in
+    the models, and emits ``drop_table`` for the search index.
+    """
+    if type_ == "table" and name and name.startswith(UNMANAGED_TABLE_PREFIXES):
+        return False
+    return True
+
+
+class SchemaOutOfDateError(RuntimeError):
+    """Raised when the database is not at the Alembic head revision."""
+
+
+def get_head_revisions() -> Set[str]:
+    """Return the head revision(s) of the migration scripts."""
+    # Alembic is only needed for this check, so it is imported lazily
+    from alembic.config import Config
+    from alembic.script import ScriptDirectory
+
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("script_location", str(ALEMBIC_INI.parent / "alembic"))
+    return set(ScriptDirectory.from_config(config).get_heads())
+
+
+async def get_current_revisions(engine: AsyncEngine) -> Set[str]:
+    """Return the revision(s) recorded in the database's alembic_version table."""
+    from alembic.runtime.migration import MigrationContext
+
+    async with engine.connect() as conn:
+        heads = await conn.run_sync(
+            lambda sync_conn: MigrationContext.configure(sync_conn).get_current_heads()
+        )
+    return set(heads)
+
+
+async def check_schema_revision(
+    engine: AsyncEngine, mode: str = "warn"
+) -> Tuple[Set[str], Set[str]]:
+    """
+    Compare the database revision against the migration head.
+
+    Args:
+        engine: Engine for the primary database
+        mode: "strict" raises SchemaOutOfDateError, "warn" logs, "off" skips
+
+    Returns:
+        Tuple of (current revisions, head revisions)
+    """
+    if mode == "off":
+        return set(), set()
+
+    current = await get_current_revisions(engine)
+    head = get_head_revisions()
+    if current != head:
+        message = (
+            f"Database schema revision {sorted(current) or 'none'} is not at "
+            f"Alembic head {sorted(head)}; run `alembic upgrade head`"
+        )
+        if mode == "strict":
+            raise SchemaOutOfDateError(message)
+        logger.warning(message)
+    return current, head
@@ -0,0 +1,116 @@
+"""
+Monotonic, time-sortable order numbers.
+"""
+
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional, Tuple
+
+from app.core.config import settings
+
+# Snowflake layout: 41 bits of milliseconds since EPOCH_MS (good until 2093),
+# a 10-bit worker ID and a 12-bit sequence within the millisecond
+EPOCH_MS = 1_704_067_200_000  # 2024-01-01T00:00:00Z
+WORKER_BITS = 10
+SEQUENCE_BITS = 12
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+MAX_SEQUENCE = (1 << SEQUENCE_BITS) - 1
+
+# Crockford base32 sorts the same as the numbers it encodes; 13 characters
+# hold the 63-bit ID
+ALPHABET = "0123456789ABCDEFGHJKMNPQRSTVWXYZ"
+SUFFIX_LENGTH = 13
+
+
+def _encode(value: int) -> str:
+    chars = []
+    for _ in range(SUFFIX_LENGTH):
+        value, digit = divmod(value, 32)
+        chars.append(ALPHABET[digit])
+    return "".join(reversed(chars))
+
+
+def format_order_number(ms: int, worker_id: int = 0, sequence: int = 0) -> str:
+    """Format ``ORD-YYYYMMDD-<13 chars>`` for a Unix timestamp in milliseconds."""
+    day = datetime.fromtimestamp(ms / 1000, timezone.utc).strftime("%Y%m%d")
+    value = (ms - EPOCH_MS) << (WORKER_BITS + SEQUENCE_BITS)
+    value |= worker_id << SEQUENCE_BITS | sequence
+    return f"ORD-{day}-{_encode(value)}"
+
+
+def order_number_at(moment: datetime) -> str:
+    """
+    Lowest order number generated at or after ``moment`` (naive means UTC).
+
+    Order numbers sort by creation time, so ``order_number >=
+    order_number_at(start)`` is a range scan on the unique order_number index.
+    """
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return format_order_number(int(moment.timestamp() * 1000))
+
+
+class OrderNumberGenerator:
+    """
+    Thread-safe generator of unique, time-ordered order numbers.
+
+    Numbers from one process are strictly increasing, so inserts append to
+    the right-hand end of the order_number index, and workers with different
+    IDs can never produce the same number. Without a configured ID each
+    process draws a random one, which another process may also have drawn;
+    callers retry on a duplicate after ``reassign()``. If the clock steps
+    backwards or more than 4096 numbers are needed within a millisecond, the
+    generator keeps counting from the last millisecond it used instead of
+    repeating or waiting.
+    """
+
+    def __init__(
+        self,
+        worker_id: Optional[int] = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self._worker_id = worker_id
+        self._random_id: Optional[Tuple[int, int]] = None  # (pid, worker ID)
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._last_ms = 0
+        self._sequence = 0
+
+    @property
+    def worker_id(self) -> int:
+        """The configured worker ID, or a random one drawn per process."""
+        if self._worker_id is not None:
+            return self._worker_id
+        # Process IDs repeat across containers, so they make poor worker IDs.
+        # A forked child inherits the parent's draw (and `random` state), so
+        # draw again from the OS whenever the process ID changes.
+        pid = os.getpid()
+        if self._random_id is None or self._random_id[0] != pid:
+            self._random_id = (pid, secrets.randbelow(MAX_WORKER_ID + 1))
+        return self._random_id[1]
+
+    def reassign(self) -> None:
+        """Draw a new random worker ID; a configured one is kept."""
+        with self._lock:
+            self._random_id = None
+
+    def generate(self) -> str:
+        with self._lock:
+            now_ms = int(self._clock() * 1000)
+            if now_ms > self._last_ms:
+                self._last_ms = now_ms
+                self._sequence = 0
+            elif self._sequence < MAX_SEQUENCE:
+                self._sequence += 1
+            else:
+                self._last_ms += 1
+                self._sequence = 0
+            return format_order_number(self._last_ms, self.worker_id, self._sequence)
+
+
+order_numbers = OrderNumberGenerator(settings.order_worker_id)
@@ -0,0 +1,126 @@
+"""
+Connection pool instrumentation.
+
+Counters are fed by SQLAlchemy pool events so they can be read from an
+internal endpoint and used to size pools against real traffic.
+"""
+
+import threading
+import time
+from typing import Any, Dict
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, QueuePool
+
+# Key under which the pool stores how long a checkout waited
+WAIT_INFO_KEY = "_pool_wait_seconds"
+
+# Checkouts slower than this are counted as having queued for a connection
+QUEUED_THRESHOLD_SECONDS = 0.001
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    Async queue pool that records how long each checkout waited.
+
+    The wait time is stashed on the connection record and picked up by the
+    ``checkout`` event listener, so the pool itself stays stateless and
+    survives ``engine.dispose()`` (which recreates the pool from its class).
+    """
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        start = time.perf_counter()
+        record = super()._do_get()
+        record.info[WAIT_INFO_KEY] = time.perf_counter() - start
+        return record
+
+
+class PoolMetrics:
+    """Thread-safe pool counters for a single engine."""
+
+    def __init__(self, engine: AsyncEngine) -> None:
+        self.engine = engine
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        """Zero all counters."""
+        with self._lock:
+            self.connections_opened = 0
+            self.connections_invalidated = 0
+            self.checkouts = 0
+            self.checkins = 0
+            self.checked_out = 0
+            self.peak_checked_out = 0
+            self.queued_checkouts = 0
+            self.wait_seconds_total = 0.0
+            self.wait_seconds_max = 0.0
+
+    def on_connect(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.connections_opened += 1
+
+    def on_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        wait = connection_record.info.pop(WAIT_INFO_KEY, 0.0)
+        with self._lock:
+            self.checkouts += 1
+            self.checked_out += 1
+            self.peak_checked_out = max(self.peak_checked_out, self.checked_out)
+            self.wait_seconds_total += wait
+            self.wait_seconds_max = max(self.wait_seconds_max, wait)
+            if wait > QUEUED_THRESHOLD_SECONDS:
+                self.queued_checkouts += 1
+
+    def on_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.checked_out = max(self.checked_out - 1, 0)
+
+    def on_invalidate(
+        self, dbapi_connection: Any, connection_record: Any, exception: Any
+    ) -> None:
+        with self._lock:
+            self.connections_invalidated += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Return the current counters together with live pool state."""
+        pool = self.engine.sync_engine.pool
+        with self._lock:
+            data: Dict[str, Any] = {
+                "pool_class": type(pool).__name__,
+                "connections_opened": self.connections_opened,
+                "connections_invalidated": self.connections_invalidated,
+                "checkouts": self.checkouts,
+                "checkins": self.checkins,
+                "checked_out": self.checked_out,
+                "peak_checked_out": self.peak_checked_out,
+                "queued_checkouts": self.queued_checkouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_ms_avg": round(self.wait_seconds_total * 1000 / self.checkouts, 3)
+                if self.checkouts
+                else 0.0,
+            }
+        if isinstance(pool, QueuePool):
+            data.update(
+                {
+                    "pool_size": pool.size(),
+                    "idle": pool.checkedin(),
+                    "overflow": max(pool.overflow(), 0),
+                }
+            )
+        return data
+
+
+def instrument_engine(engine: AsyncEngine) -> PoolMetrics:
+    """Attach pool event listeners to an engine and return its counters."""
+    metrics = PoolMetrics(engine)
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "connect", metrics.on_connect)
+    event.listen(sync_engine, "checkout", metrics.on_checkout)
+    event.listen(sync_engine, "checkin", metrics.on_checkin)
+    event.listen(sync_engine, "invalidate", metrics.on_invalidate)
+    return metrics
@@ -0,0 +1,183 @@
+"""
+Structured SQL query logging.
+
+Statements are timed with cursor-execute events (and the error event for
+statements that raise). Only statements slower
+than a threshold are logged by default; a sample of all statements can be
+logged in full for debugging. When a request is being tracked (see
+app.core.middleware), each statement is also recorded into its
+RequestQueryStats.
+"""
+
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import Engine, event
+
+logger = logging.getLogger("app.db.queries")
+
+# Attribute holding the statement start times on an execution context. It is
+# a stack because a statement's defaults may run nested cursor executes.
+START_TIMES_ATTR = "_query_start_times"
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+_NAMED_PARAM = re.compile(r"(?:%\(\w+\)s|:\w+|\$\d+|__\[POSTCOMPILE_\w+\])")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_statement(statement: str) -> str:
+    """
+    Reduce a SQL statement to its shape: literals and bound parameters
+    become ``?``, IN-lists collapse to ``(?+)`` and whitespace is squashed.
+    """
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _NAMED_PARAM.sub("?", normalized)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?+)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+def fingerprint(statement: str) -> str:
+    """Short stable identifier for statements that share a shape."""
+    digest = hashlib.sha1(normalize_statement(statement).encode()).hexdigest()
+    return digest[:12]
+
+
+class RequestQueryStats:
+    """Statement count and database time for a single request."""
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.duration_ms = 0.0
+        self.statements: Counter = Counter()
+
+    def record(self, statement: str, duration_ms: float) -> None:
+        self.count += 1
+        self.duration_ms += duration_ms
+        # Keyed by compiled SQL; fingerprints are only computed for reports
+        self.statements[statement] += 1
+
+    def repeated(self, threshold: int) -> List[Tuple[str, int]]:
+        """Statement shapes executed more than ``threshold`` times."""
+        by_shape: Dict[str, int] = Counter()
+        for statement, count in self.statements.items():
+            by_shape[normalize_statement(statement)] += count
+        return [
+            (shape, count) for shape, count in by_shape.items() if count > threshold
+        ]
+
+
+current_query_stats: ContextVar[Optional[RequestQueryStats]] = ContextVar(
+    "current_query_stats", default=None
+)
+
+
+class QueryLogger:
+    """Times every statement and logs slow or sampled ones."""
+
+    def __init__(self, slow_query_ms: float, sample_rate: float = 0.0) -> None:
+        self.slow_query_ms = slow_query_ms
+        self.sample_rate = sample_rate
+
+    def before_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        # Kept on the execution context, not the pooled connection, so a
+        # statement that raises cannot leave a stale entry behind
+        starts = getattr(context, START_TIMES_ATTR, None)
+        if starts is None:
+            starts = []
+            setattr(context, START_TIMES_ATTR, starts)
+        starts.append(time.perf_counter())
+
+    def after_cursor_execute(
+        self,
+        conn: Any,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        started = getattr(context, START_TIMES_ATTR).pop()
+        rows: Optional[int] = cursor.rowcount if cursor.rowcount >= 0 else None
+        self._record(statement, started, rows, executemany, failed=False)
+
+    def handle_error(self, exception_context: Any) -> None:
+        """Count and time statements that raised (e.g. IntegrityError)."""
+        starts = getattr(exception_context.execution_context, START_TIMES_ATTR, None)
+        if not starts:
+            return  # failed before the cursor executed, or already recorded
+        self._record(
+            exception_context.statement or "",
+            starts.pop(),
+            None,
+            bool(exception_context.execution_context.executemany),
+            failed=True,
+        )
+
+    def _record(
+        self,
+        statement: str,
+        started: float,
+        rows: Optional[int],
+        executemany: bool,
+        failed: bool,
+    ) -> None:
+        duration_ms = (time.perf_counter() - started) * 1000
+
+        request_stats = current_query_stats.get()
+        if request_stats is not None:
+            request_stats.record(statement, duration_ms)
+
+        slow = duration_ms >= self.slow_query_ms
+        if not slow and not (self.sample_rate and random.random() < self.sample_rate):
+            return
+
+        record = {
+            "fingerprint": fingerprint(statement),
+            "duration_ms": round(duration_ms, 3),
+            "rows": rows,
+            "executemany": executemany,
+            "failed": failed,
+            "statement": normalize_statement(statement),
+        }
+        logger.log(
+            logging.WARNING if slow else logging.INFO,
+            "%s query fingerprint=%s duration_ms=%.3f rows=%s failed=%s "
+            "statement=%s",
+            "slow" if slow else "sampled",
+            record["fingerprint"],
+            record["duration_ms"],
+            record["rows"],
+            record["failed"],
+            record["statement"],
+            extra={"query": record},
+        )
+
+
+def register_query_logging(
+    sync_engine: Engine, slow_query_ms: float, sample_rate: float = 0.0
+) -> QueryLogger:
+    """Attach a QueryLogger to an engine's cursor-execute and error events."""
+    query_logger = QueryLogger(slow_query_ms, sample_rate)
+    event.listen(
+        sync_engine, "before_cursor_execute", query_logger.before_cursor_execute
+    )
+    event.listen(sync_engine, "after_cursor_execute", query_logger.after_cursor_execute)
+    event.listen(sync_engine, "handle_error", query_logger.handle_error)
+    return query_logger
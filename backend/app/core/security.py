@@ -3,25 +3,34 @@ JWT token generation and password hashing utilities.
 """
 
 from datetime import datetime, timedelta, timezone
-from typing import Optional
-
-from jose import JWTError, jwt
-from passlib.context import CryptContext
+from functools import lru_cache
+from typing import TYPE_CHECKING, Optional
 
 from app.core.config import settings
 
-# Password hashing context - using argon2 which doesn't have the 72-byte limit
-pwd_context = CryptContext(schemes=["argon2"], deprecated="auto")
+if TYPE_CHECKING:
+    from passlib.context import CryptContext
+
+# passlib/argon2 and jose are imported on first use rather than at startup;
+# most requests (catalog browsing, guest checkout) never need them.
+
+
+@lru_cache(maxsize=1)
+def get_pwd_context() -> "CryptContext":
+    """Password hashing context - argon2, which doesn't have the 72-byte limit."""
+    from passlib.context import CryptContext
+
+    return CryptContext(schemes=["argon2"], deprecated="auto")
 
 
 def hash_password(password: str) -> str:
     """Hash a password using argon2."""
-    return pwd_context.hash(password)
+    return get_pwd_context().hash(password)
 
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verify a password against its hash."""
-    return pwd_context.verify(plain_password, hashed_password)
+    return get_pwd_context().verify(plain_password, hashed_password)
 
 
 def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
@@ -35,6 +44,8 @@ def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -
     Returns:
         Encoded JWT token string
     """
+    from jose import jwt
+
     to_encode = data.copy()
     if expires_delta:
         expire = datetime.now(timezone.utc) + expires_delta
@@ -54,6 +65,8 @@ def create_password_reset_token(email: str) -> str:
     """
     Create a password reset token that expires in 15 minutes.
     """
+    from jose import jwt
+
     expire = datetime.now(timezone.utc) + timedelta(minutes=15)
     to_encode = {"exp": expire, "sub": email, "type": "password_reset"}
     encoded_jwt = jwt.encode(
@@ -66,6 +79,8 @@ def verify_password_reset_token(token: str) -> Optional[str]:
     """
     Verify a password reset token and return the email if valid.
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
@@ -87,6 +102,8 @@ def decode_token(token: str) -> Optional[dict]:
     Returns:
         Decoded token claims or None if invalid
     """
+    from jose import JWTError, jwt
+
     try:
         payload = jwt.decode(
             token, settings.secret_key, algorithms=[settings.algorithm]
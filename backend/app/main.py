@@ -2,15 +2,94 @@
 FastAPI application factory and configuration.
 """
 
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app import IMPORT_STARTED
+from app.api.http_cache import ImmutableStaticFiles
 from app.api.v1 import api_router
 from app.core.config import settings
-from app.core.database import Base, engine
+from app.core.database import AsyncSessionLocal, dispose_engines, engine
+from app.core.middleware import QueryStatsMiddleware
+from app.core.migrations import check_schema_revision
+from app.services.image_service import shutdown_image_pool
+from app.services.outbox_worker import OutboxWorker
+
+logger = logging.getLogger(__name__)
+
+
+def configure_logging() -> None:
+    """
+    Apply LOG_LEVEL to the ``app`` loggers and, unless the host process
+    (uvicorn's --log-config, an embedding application) already configured
+    logging, print their records to stderr. The root logger is left alone.
+    """
+    app_logger = logging.getLogger("app")
+    if app_logger.level == logging.NOTSET:
+        app_logger.setLevel(settings.log_level.upper())
+    if app_logger.handlers or logging.getLogger().handlers:
+        return
+    handler = logging.StreamHandler()
+    handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s")
+    )
+    app_logger.addHandler(handler)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    """Run startup work before serving and cleanup on shutdown."""
+    lifespan_started = time.perf_counter()
+    configure_logging()
+    logger.info(
+        "Starting %s v%s (environment: %s, debug: %s)",
+        settings.app_name,
+        settings.app_version,
+        settings.environment,
+        settings.debug,
+    )
+
+    # Schema changes are applied by `alembic upgrade head`, not by workers
+    await check_schema_revision(engine, mode=settings.db_schema_check)
+
+    # Side effects recorded in the outbox are delivered off the request path
+    outbox_worker = None
+    if settings.outbox_worker_enabled:
+        outbox_worker = OutboxWorker(AsyncSessionLocal)
+        outbox_worker.start()
+
+    # Measured from the end of the import rather than from IMPORT_STARTED, so
+    # a lifespan entered again in the same process (as in tests) is not
+    # charged for the time in between
+    import_seconds = IMPORT_FINISHED - IMPORT_STARTED
+    lifespan_seconds = time.perf_counter() - lifespan_started
+    app.state.startup = {
+        "import_seconds": round(import_seconds, 4),
+        "lifespan_seconds": round(lifespan_seconds, 4),
+        "total_seconds": round(import_seconds + lifespan_seconds, 4),
+        "budget_seconds": settings.startup_time_budget_seconds,
+    }
+    logger.info("Startup completed in %.3fs", app.state.startup["total_seconds"])
+    if app.state.startup["total_seconds"] > settings.startup_time_budget_seconds:
+        logger.warning(
+            "Startup took %.3fs, over the %.1fs budget",
+            app.state.startup["total_seconds"],
+            settings.startup_time_budget_seconds,
+        )
+
+    yield
+
+    logger.info("Shutting down application")
+    if outbox_worker is not None:
+        await outbox_worker.stop()
+    shutdown_image_pool()
+    await dispose_engines()
 
-# Create database tables
-Base.metadata.create_all(bind=engine)
 
 # Create FastAPI app
 app = FastAPI(
@@ -18,6 +97,7 @@ app = FastAPI(
     description="API for 3D printing e-commerce platform",
     version=settings.app_version,
     debug=settings.debug,
+    lifespan=lifespan,
 )
 
 # Configure CORS middleware
@@ -27,24 +107,28 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "Idempotent-Replayed"],
 )
 
+# Count SQL statements per request
+if settings.query_stats_enabled:
+    app.add_middleware(
+        QueryStatsMiddleware,
+        warn_repeated=settings.debug,
+        repeated_threshold=settings.db_repeated_query_threshold,
+    )
+
 # Include API routers
 app.include_router(api_router)
 
+# Uploaded product images (content-addressed, so cached as immutable)
+app.mount(
+    settings.media_url,
+    ImmutableStaticFiles(directory=settings.media_root, check_dir=False),
+    name="media",
+)
 
-@app.on_event("startup")
-async def startup_event() -> None:
-    """Run on application startup."""
-    print(f"🚀 Starting {settings.app_name} v{settings.app_version}")
-    print(f"Environment: {settings.environment}")
-    print(f"Debug: {settings.debug}")
-
-
-@app.on_event("shutdown")
-async def shutdown_event() -> None:
-    """Run on application shutdown."""
-    print("👋 Shutting down application")
+IMPORT_FINISHED = time.perf_counter()
 
 
 if __name__ == "__main__":
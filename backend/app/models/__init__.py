@@ -3,5 +3,7 @@
 from .user import User
 from .product import Product
 from .order import Order, OrderItem
+from .idempotency import IdempotencyKey
+from .outbox import OutboxEvent
 
-__all__ = ["User", "Product", "Order", "OrderItem"]
+__all__ = ["User", "Product", "Order", "OrderItem", "IdempotencyKey", "OutboxEvent"]
@@ -0,0 +1,37 @@
+"""
+Idempotency key model for SQLAlchemy ORM.
+"""
+
+from sqlalchemy import Column, Index, Integer, String, Text, UniqueConstraint, func
+
+from app.core.database import Base
+from app.models.types import Timestamp
+
+
+class IdempotencyKey(Base):
+    """
+    A client-supplied Idempotency-Key and the response it produced.
+
+    The row is inserted before the request is handled, so the unique
+    (scope, key) constraint doubles as a lock across workers; ``status_code``
+    stays NULL until the response has been stored.
+    """
+
+    __tablename__ = "idempotency_keys"
+    __table_args__ = (
+        UniqueConstraint("scope", "key", name="uq_idempotency_keys_scope_key"),
+        # Expired keys are purged in bulk
+        Index("ix_idempotency_keys_expires_at", "expires_at"),
+    )
+
+    id = Column(Integer, primary_key=True)
+    scope = Column(String(255), nullable=False)  # request path
+    key = Column(String(255), nullable=False)
+    fingerprint = Column(String(64), nullable=False)  # sha256 of the request
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(Timestamp, default=func.now(), nullable=False)
+    expires_at = Column(Timestamp, nullable=False)
+
+    def __repr__(self) -> str:
+        return f"<IdempotencyKey(scope={self.scope}, key={self.key}, status_code={self.status_code})>"
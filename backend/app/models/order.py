@@ -2,20 +2,41 @@
 Order model for SQLAlchemy ORM.
 """
 
-from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer, String, func
+from sqlalchemy import (
+    Column,
+    Float,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    func,
+)
 from sqlalchemy.orm import relationship
 
 from app.core.database import Base
+from app.models.types import Timestamp
 
 
 class Order(Base):
     """Order model representing a customer purchase."""
 
     __tablename__ = "orders"
+    __table_args__ = (
+        # Serves newest-first listing and keyset pagination
+        Index("ix_orders_created_at_id", "created_at", "id"),
+        # Per-customer order history: equality on the owner, newest first
+        Index("ix_orders_user_id_created_at", "user_id", "created_at", "id"),
+        Index(
+            "ix_orders_customer_email_created_at", "customer_email", "created_at", "id"
+        ),
+    )
+    # Fetch the SQL-generated timestamps with RETURNING as part of the INSERT
+    # or UPDATE instead of a SELECT afterwards
+    __mapper_args__ = {"eager_defaults": True}
 
     id = Column(Integer, primary_key=True, index=True)
     order_number = Column(String(50), unique=True, index=True, nullable=False)
-    customer_email = Column(String(255), index=True, nullable=False)
+    customer_email = Column(String(255), nullable=False)
     customer_name = Column(String(255), nullable=False)
     total_amount = Column(Float, nullable=False)
     status = Column(
@@ -23,9 +44,9 @@ class Order(Base):
     )  # pending, paid, shipped, delivered, cancelled
     stripe_payment_id = Column(String(255), nullable=True, unique=True)
     user_id = Column(Integer, ForeignKey("users.id"), nullable=True)
-    created_at = Column(DateTime, default=func.now(), nullable=False)
+    created_at = Column(Timestamp, default=func.now(), nullable=False)
     updated_at = Column(
-        DateTime, default=func.now(), onupdate=func.now(), nullable=False
+        Timestamp, default=func.now(), onupdate=func.now(), nullable=False
     )
 
     # Relationship to items
@@ -44,7 +65,7 @@ class OrderItem(Base):
     __tablename__ = "order_items"
 
     id = Column(Integer, primary_key=True, index=True)
-    order_id = Column(Integer, ForeignKey("orders.id"), nullable=False)
+    order_id = Column(Integer, ForeignKey("orders.id"), index=True, nullable=False)
     product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
     quantity = Column(Integer, nullable=False)
     price_at_purchase = Column(Float, nullable=False)
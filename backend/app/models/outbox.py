@@ -0,0 +1,45 @@
+"""
+Transactional outbox model for SQLAlchemy ORM.
+"""
+
+from sqlalchemy import JSON, Column, Index, Integer, String, Text, func, text
+
+from app.core.database import Base
+from app.models.types import Timestamp
+
+
+class OutboxEvent(Base):
+    """
+    A side effect recorded in the same transaction as the change causing it.
+
+    The outbox worker delivers due events (``available_at`` has passed and
+    ``failed_at`` is NULL) and deletes them. While a worker holds an event,
+    ``available_at`` is pushed out by the lease time, so an event whose worker
+    died is picked up again.
+    """
+
+    __tablename__ = "outbox_events"
+    __table_args__ = (
+        # Only undelivered events are polled
+        Index(
+            "ix_outbox_events_pending",
+            "available_at",
+            "id",
+            sqlite_where=text("failed_at IS NULL"),
+            postgresql_where=text("failed_at IS NULL"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True)
+    topic = Column(String(100), nullable=False)
+    payload = Column(JSON, nullable=False)
+    attempts = Column(Integer, default=0, nullable=False)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(Timestamp, default=func.now(), nullable=False)
+    available_at = Column(Timestamp, default=func.now(), nullable=False)
+    failed_at = Column(Timestamp, nullable=True)  # gave up after max attempts
+
+    def __repr__(self) -> str:
+        return (
+            f"<OutboxEvent(id={self.id}, topic={self.topic}, attempts={self.attempts})>"
+        )
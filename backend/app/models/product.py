@@ -2,7 +2,20 @@
 Product model for SQLAlchemy ORM.
 """
 
-from sqlalchemy import Column, Float, Integer, String, Text
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Column,
+    Float,
+    Index,
+    Integer,
+    String,
+    Text,
+    column,
+    event,
+    table,
+    text,
+)
 
 from app.core.database import Base
 
@@ -11,6 +24,16 @@ class Product(Base):
     """Product model representing a 3D printable item."""
 
     __tablename__ = "products"
+    __table_args__ = (
+        # Catalog listing and export walk active products in ID order; the
+        # partial index skips inactive rows and stays small
+        Index(
+            "ix_products_active_id",
+            "id",
+            sqlite_where=text("is_active = 1"),
+            postgresql_where=text("is_active = 1"),
+        ),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), unique=True, index=True, nullable=False)
@@ -19,7 +42,75 @@ class Product(Base):
     stock = Column(Integer, default=0)
     sku = Column(String(100), unique=True, index=True, nullable=False)
     image_url = Column(String(500), nullable=True)
+    # Variant name -> URL for uploaded images, filled in once resizing is done
+    image_variants = Column(JSON, nullable=True)
     is_active = Column(Integer, default=1)  # 1 = active, 0 = inactive
 
     def __repr__(self) -> str:
         return f"<Product(id={self.id}, name={self.name}, price={self.price})>"
+
+
+# Full-text search over name, description and SKU. On SQLite this is an
+# external-content FTS5 table kept in sync by triggers; on Postgres a GIN
+# index over the tsvector expression below. Both are maintained by the
+# database itself, so every write path (ORM, bulk imports, raw SQL) is covered.
+PRODUCT_FTS_TABLE = "products_fts"
+# Lightweight handle for queries; the table itself is created by the DDL below
+product_fts = table(PRODUCT_FTS_TABLE, column("rowid", Integer))
+
+PRODUCT_TSVECTOR = (
+    "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(sku, '')), 'A') || "
+    "setweight(to_tsvector('simple', coalesce(description, '')), 'B')"
+)
+
+SQLITE_SEARCH_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {PRODUCT_FTS_TABLE} USING fts5(
+        name, description, sku, content='products', content_rowid='id'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ai AFTER INSERT ON products BEGIN
+        INSERT INTO {PRODUCT_FTS_TABLE}(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_ad AFTER DELETE ON products BEGIN
+        INSERT INTO {PRODUCT_FTS_TABLE}({PRODUCT_FTS_TABLE}, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS products_fts_au
+    AFTER UPDATE OF name, description, sku ON products BEGIN
+        INSERT INTO {PRODUCT_FTS_TABLE}({PRODUCT_FTS_TABLE}, rowid, name, description, sku)
+        VALUES ('delete', old.id, old.name, old.description, old.sku);
+        INSERT INTO {PRODUCT_FTS_TABLE}(rowid, name, description, sku)
+        VALUES (new.id, new.name, new.description, new.sku);
+    END
+    """,
+]
+
+POSTGRES_SEARCH_DDL = [
+    f"CREATE INDEX IF NOT EXISTS ix_products_search ON products "
+    f"USING gin (({PRODUCT_TSVECTOR}))",
+]
+
+for statement in SQLITE_SEARCH_DDL:
+    event.listen(
+        Product.__table__, "after_create", DDL(statement).execute_if(dialect="sqlite")
+    )
+for statement in POSTGRES_SEARCH_DDL:
+    event.listen(
+        Product.__table__,
+        "after_create",
+        DDL(statement).execute_if(dialect="postgresql"),
+    )
+# The triggers go with the products table; the FTS table must be dropped
+event.listen(
+    Product.__table__,
+    "after_drop",
+    DDL(f"DROP TABLE IF EXISTS {PRODUCT_FTS_TABLE}").execute_if(dialect="sqlite"),
+)
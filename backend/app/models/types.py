@@ -0,0 +1,23 @@
+"""
+Column types shared by the ORM models.
+"""
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime
+from sqlalchemy.dialects import sqlite
+
+# SQLite stores func.now() as CURRENT_TIMESTAMP text without microseconds;
+# bind datetimes the same way so keyset comparisons match stored values.
+Timestamp = DateTime().with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d "
+        "%(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
+
+def utcnow() -> datetime:
+    """Naive UTC now, matching how Timestamp values are stored."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
@@ -21,7 +21,10 @@ class OrderItemBase(BaseModel):
 class OrderItemCreate(OrderItemBase):
     """Schema for creating an order item."""
 
-    pass
+    # Accepted for older clients; the current catalog price is always used
+    price_at_purchase: Optional[float] = Field(
+        None, description="Ignored; the item is priced from the catalog"
+    )
 
 
 class OrderItemResponse(OrderItemBase):
@@ -49,8 +52,14 @@ class OrderBase(BaseModel):
 class OrderCreate(OrderBase):
     """Schema for creating a new order."""
 
+    # Accepted for older clients; the total is computed from the items
+    total_amount: Optional[float] = Field(
+        None, description="Ignored; computed from catalog prices"
+    )
     status: str = Field(default="pending", description="Initial order status")
-    items: List[OrderItemCreate] = Field(..., description="List of items in the order")
+    items: List[OrderItemCreate] = Field(
+        ..., min_length=1, description="List of items in the order"
+    )
     stripe_payment_id: Optional[str] = Field(
         None, description="Stripe payment intent ID"
     )
@@ -2,7 +2,7 @@
 Pydantic schemas for Product request/response validation.
 """
 
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -47,8 +47,81 @@ class ProductResponse(ProductBase):
     """Schema for product responses from API."""
 
     id: int = Field(..., description="Unique product ID")
+    image_variants: Optional[Dict[str, str]] = Field(
+        None,
+        description="URLs of resized image variants (thumbnail, medium and "
+        "their _webp forms); null until processing finishes",
+    )
 
     class Config:
         """Pydantic config."""
 
         from_attributes = True
+
+
+class ProductBatchRequest(BaseModel):
+    """Schema for looking up several products at once."""
+
+    ids: List[int] = Field(
+        ..., min_length=1, max_length=100, description="Product IDs to fetch"
+    )
+
+
+class ProductBatchResponse(BaseModel):
+    """Products found for a batch lookup, in request order."""
+
+    products: List[ProductResponse]
+    missing: List[int] = Field(
+        default_factory=list, description="Requested IDs that do not exist"
+    )
+
+
+class ProductImportError(BaseModel):
+    """A row that could not be imported."""
+
+    line: int = Field(..., description="Line number in the uploaded file")
+    sku: Optional[str] = None
+    error: str
+
+
+class ProductImportReport(BaseModel):
+    """Outcome of a bulk product import."""
+
+    processed: int = 0
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[ProductImportError] = Field(
+        default_factory=list, description="First failed rows (see errors_truncated)"
+    )
+    errors_truncated: bool = False
+
+
+class StockCheckItem(BaseModel):
+    """One cart line to check."""
+
+    product_id: int
+    quantity: int = Field(..., gt=0, description="Quantity to check")
+
+
+class StockCheckRequest(BaseModel):
+    """Schema for checking stock for a whole cart."""
+
+    items: List[StockCheckItem] = Field(..., min_length=1, max_length=100)
+
+
+class StockCheckLine(BaseModel):
+    """Availability of one cart line."""
+
+    product_id: int
+    requested_quantity: int
+    available_stock: int = Field(0, description="0 if the product does not exist")
+    price: Optional[float] = Field(None, description="Current unit price")
+    has_sufficient_stock: bool
+
+
+class StockCheckResponse(BaseModel):
+    """Per-line availability for a cart, in request order."""
+
+    items: List[StockCheckLine]
+    all_available: bool
@@ -0,0 +1,157 @@
+"""
+Storage for Idempotency-Key claims and the responses they produced.
+"""
+
+import hashlib
+import time
+from datetime import timedelta
+from typing import Optional
+
+from sqlalchemy import delete, insert, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.idempotency import IdempotencyKey
+from app.models.types import utcnow
+
+# A claim still without a response after this long belongs to a request that
+# died (worker crash, cancelled client) and may be taken over
+CLAIM_TIMEOUT = timedelta(seconds=60)
+
+
+class IdempotencyKeyInProgress(Exception):
+    """Another request with the same key is still being handled."""
+
+
+class IdempotencyKeyMismatch(Exception):
+    """The key was already used for a different request."""
+
+
+def request_fingerprint(*parts: bytes) -> str:
+    """SHA-256 over length-prefixed request parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        digest.update(len(part).to_bytes(8, "big"))
+        digest.update(part)
+    return digest.hexdigest()
+
+
+class IdempotencyService:
+    """Service for idempotent request bookkeeping."""
+
+    # Monotonic time after which this worker next purges expired keys
+    _next_purge = 0.0
+
+    @staticmethod
+    async def claim(
+        db: AsyncSession, scope: str, key: str, fingerprint: str
+    ) -> Optional[IdempotencyKey]:
+        """
+        Claim ``key`` for a request, or find the response it already has.
+
+        The claim is an INSERT committed before the request is handled, so
+        the unique (scope, key) constraint stops a second worker from running
+        the same request concurrently.
+
+        Returns:
+            None if the caller now owns the key and must handle the request,
+            otherwise the stored record to replay
+
+        Raises:
+            IdempotencyKeyMismatch: the key was used with a different request
+            IdempotencyKeyInProgress: another request holds the key
+        """
+        await IdempotencyService.purge_expired(db)
+        now = utcnow()
+        for _ in range(2):
+            try:
+                await db.execute(
+                    insert(IdempotencyKey).values(
+                        scope=scope,
+                        key=key,
+                        fingerprint=fingerprint,
+                        created_at=now,
+                        expires_at=now
+                        + timedelta(seconds=settings.idempotency_ttl_seconds),
+                    )
+                )
+                await db.commit()
+                return None
+            except IntegrityError:
+                await db.rollback()
+
+            result = await db.execute(
+                select(IdempotencyKey).filter(
+                    IdempotencyKey.scope == scope, IdempotencyKey.key == key
+                )
+            )
+            record = result.scalars().first()
+            if record is None:
+                continue  # released in the meantime
+            abandoned = (
+                record.status_code is None and record.created_at <= now - CLAIM_TIMEOUT
+            )
+            if record.expires_at <= now or abandoned:
+                await db.execute(
+                    delete(IdempotencyKey).where(IdempotencyKey.id == record.id)
+                )
+                await db.commit()
+                continue
+            if record.fingerprint != fingerprint:
+                raise IdempotencyKeyMismatch()
+            if record.status_code is None:
+                raise IdempotencyKeyInProgress()
+            return record
+        raise IdempotencyKeyInProgress()
+
+    @staticmethod
+    async def record_response(
+        db: AsyncSession, scope: str, key: str, status_code: int, body: str
+    ) -> None:
+        """Store the response for a claimed key in the current transaction."""
+        await db.execute(
+            update(IdempotencyKey)
+            .where(IdempotencyKey.scope == scope, IdempotencyKey.key == key)
+            .values(status_code=status_code, response_body=body)
+        )
+
+    @staticmethod
+    async def complete(
+        db: AsyncSession, scope: str, key: str, status_code: int, body: str
+    ) -> None:
+        """Store the response for a claimed key and commit."""
+        await IdempotencyService.record_response(db, scope, key, status_code, body)
+        await db.commit()
+
+    @staticmethod
+    async def release(db: AsyncSession, scope: str, key: str) -> None:
+        """Drop a claim whose request failed, so the client can retry it."""
+        await db.rollback()
+        await db.execute(
+            delete(IdempotencyKey).where(
+                IdempotencyKey.scope == scope,
+                IdempotencyKey.key == key,
+                IdempotencyKey.status_code.is_(None),
+            )
+        )
+        await db.commit()
+
+    @staticmethod
+    async def purge_expired(db: AsyncSession, force: bool = False) -> int:
+        """
+        Delete expired keys, at most once per purge interval per worker.
+
+        Returns:
+            Number of keys deleted
+        """
+        if not force and time.monotonic() < IdempotencyService._next_purge:
+            return 0
+        IdempotencyService._next_purge = (
+            time.monotonic() + settings.idempotency_purge_interval_seconds
+        )
+        result = await db.execute(
+            delete(IdempotencyKey).where(IdempotencyKey.expires_at <= utcnow())
+        )
+        await db.commit()
+        return result.rowcount
@@ -0,0 +1,89 @@
+"""
+Image resizing run inside worker processes.
+
+Kept free of application imports so spawned workers start quickly; Pillow
+is only imported here.
+"""
+
+import io
+from pathlib import Path
+from typing import Dict, Tuple
+
+# Longest edge in pixels for each resized variant
+VARIANT_SIZES = {"thumbnail": 320, "medium": 960}
+JPEG_QUALITY = 85
+WEBP_QUALITY = 80
+
+
+class ImageTooLargeError(ValueError):
+    """The image has more pixels than allowed."""
+
+
+def _check_pixels(size: Tuple[int, int], max_pixels: int) -> None:
+    width, height = size
+    if width * height > max_pixels:
+        raise ImageTooLargeError(
+            f"Image is {width}x{height}, over the {max_pixels} pixel limit"
+        )
+
+
+def verify_image(data: bytes, max_pixels: int) -> None:
+    """
+    Check an upload's dimensions from its header, before any pixels are
+    decoded; a small, highly compressed file can expand to a huge bitmap.
+
+    Raises:
+        ImageTooLargeError: more than ``max_pixels`` pixels
+        ValueError: Pillow cannot read the image
+    """
+    from PIL import Image
+
+    try:
+        with Image.open(io.BytesIO(data)) as image:
+            _check_pixels(image.size, max_pixels)
+    except Image.DecompressionBombError as e:
+        raise ImageTooLargeError(str(e)) from e
+    except (OSError, SyntaxError) as e:
+        raise ValueError(f"Unreadable image: {e}") from e
+
+
+def build_variants(original: str, output_dir: str, max_pixels: int) -> Dict[str, str]:
+    """
+    Write JPEG and WebP copies of an image at each size in VARIANT_SIZES.
+
+    Images over ``max_pixels`` are rejected before they are decoded.
+
+    Returns:
+        Mapping of variant name (e.g. "thumbnail", "thumbnail_webp") to the
+        file name written in ``output_dir``
+    """
+    from PIL import Image, ImageOps
+
+    out = Path(output_dir)
+    files: Dict[str, str] = {}
+    with Image.open(original) as source:
+        _check_pixels(source.size, max_pixels)
+        image = ImageOps.exif_transpose(source)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+        for name, size in VARIANT_SIZES.items():
+            resized = image.copy()
+            resized.thumbnail((size, size), Image.Resampling.LANCZOS)
+
+            resized.save(out / f"{name}.webp", "WEBP", quality=WEBP_QUALITY)
+            files[f"{name}_webp"] = f"{name}.webp"
+
+            # JPEG has no alpha channel; flatten onto white
+            if resized.mode == "RGBA":
+                background = Image.new("RGB", resized.size, (255, 255, 255))
+                background.paste(resized, mask=resized.getchannel("A"))
+                resized = background
+            resized.save(
+                out / f"{name}.jpg",
+                "JPEG",
+                quality=JPEG_QUALITY,
+                optimize=True,
+                progressive=True,
+            )
+            files[name] = f"{name}.jpg"
+    return files
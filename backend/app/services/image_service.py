@@ -0,0 +1,145 @@
+"""
+Product image storage and background variant generation.
+"""
+
+import asyncio
+import hashlib
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Optional
+
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+
+from app.core.cache import product_cache
+from app.core.config import settings
+from app.models.product import Product
+from app.services.image_processing import (
+    ImageTooLargeError,
+    build_variants,
+    verify_image,
+)
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes of the accepted upload formats
+IMAGE_SIGNATURES = {
+    b"\xff\xd8\xff": "jpg",
+    b"\x89PNG\r\n\x1a\n": "png",
+    b"GIF87a": "gif",
+    b"GIF89a": "gif",
+}
+
+
+def detect_image_type(data: bytes) -> Optional[str]:
+    """Return the file extension for a supported image, sniffed from its bytes."""
+    if data[:4] == b"RIFF" and data[8:12] == b"WEBP":
+        return "webp"
+    for signature, extension in IMAGE_SIGNATURES.items():
+        if data.startswith(signature):
+            return extension
+    return None
+
+
+@lru_cache
+def get_image_pool() -> ProcessPoolExecutor:
+    """Process pool for resizing, created on first upload."""
+    # Spawned workers do not inherit the event loop or database threads
+    return ProcessPoolExecutor(
+        max_workers=settings.image_workers,
+        mp_context=multiprocessing.get_context("spawn"),
+    )
+
+
+def shutdown_image_pool() -> None:
+    """Stop the worker processes if the pool was ever started."""
+    if get_image_pool.cache_info().currsize:
+        get_image_pool().shutdown(wait=False, cancel_futures=True)
+        get_image_pool.cache_clear()
+
+
+def media_url(key: str, filename: str) -> str:
+    return f"{settings.media_url.rstrip('/')}/{key}/{filename}"
+
+
+class ImageService:
+    """Service for product images."""
+
+    @staticmethod
+    async def verify_upload(data: bytes) -> None:
+        """
+        Check an upload's dimensions against ``image_max_pixels``.
+
+        Raises:
+            ImageTooLargeError: too many pixels
+            ValueError: not a readable image
+        """
+        await asyncio.to_thread(verify_image, data, settings.image_max_pixels)
+
+    @staticmethod
+    def store_original(product_id: int, data: bytes, extension: str) -> str:
+        """
+        Write an uploaded image under a content-addressed key.
+
+        The key changes whenever the content does, so every stored URL can be
+        cached forever.
+
+        Returns:
+            Storage key, e.g. "products/12/3f2a9c0d1e4b5a67"
+        """
+        key = f"products/{product_id}/{hashlib.sha256(data).hexdigest()[:16]}"
+        directory = Path(settings.media_root) / key
+        directory.mkdir(parents=True, exist_ok=True)
+        (directory / f"original.{extension}").write_bytes(data)
+        return key
+
+    @staticmethod
+    async def attach_image(
+        db: AsyncSession, product: Product, data: bytes, extension: str
+    ) -> str:
+        """Store an upload as the product's image; variants follow later."""
+        key = await asyncio.to_thread(
+            ImageService.store_original, product.id, data, extension
+        )
+        product.image_url = media_url(key, f"original.{extension}")
+        product.image_variants = None
+        await db.commit()
+        product_cache.clear()
+        return key
+
+    @staticmethod
+    async def generate_variants(
+        bind: AsyncEngine, product_id: int, key: str, extension: str
+    ) -> Optional[Dict[str, str]]:
+        """
+        Resize an original in the process pool and record the variant URLs.
+
+        Runs after the upload response is sent. Skipped if the product has
+        since been given a different image.
+        """
+        directory = Path(settings.media_root) / key
+        loop = asyncio.get_running_loop()
+        try:
+            files = await loop.run_in_executor(
+                get_image_pool(),
+                build_variants,
+                str(directory / f"original.{extension}"),
+                str(directory),
+                settings.image_max_pixels,
+            )
+        except Exception:
+            logger.exception("Failed to build image variants for %s", key)
+            return None
+
+        variants = {"original": media_url(key, f"original.{extension}")}
+        variants.update({name: media_url(key, f) for name, f in files.items()})
+        async with AsyncSession(bind, expire_on_commit=False) as db:
+            product = await db.get(Product, product_id)
+            if product is None or product.image_url != variants["original"]:
+                return None
+            product.image_variants = variants
+            await db.commit()
+        product_cache.clear()
+        return variants
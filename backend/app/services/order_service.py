@@ -2,14 +2,35 @@
 Business logic for order operations.
 """
 
+from collections import Counter
 from datetime import datetime
-from typing import Optional
-from uuid import uuid4
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    Select,
+    insert,
+    literal,
+    select,
+    tuple_,
+    update,
+)
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+from sqlalchemy.orm.attributes import set_committed_value
 
+from app.core.cache import product_cache
+from app.core.config import settings
+from app.core.order_numbers import order_number_at, order_numbers
 from app.models.order import Order, OrderItem
 from app.schemas.order import OrderCreate, OrderUpdate
+from app.services.outbox_service import (
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    OutboxService,
+)
+from app.services.product_service import InsufficientStockError, ProductService
 
 
 class OrderService:
@@ -17,134 +38,363 @@ class OrderService:
 
     @staticmethod
     def generate_order_number() -> str:
-        """Generate a unique order number."""
-        # Format: ORD-YYYYMMDD-XXXXX
-        timestamp = datetime.now().strftime("%Y%m%d")
-        unique_id = str(uuid4())[:8].upper()
-        return f"ORD-{timestamp}-{unique_id}"
+        """Generate a unique, time-sortable order number."""
+        # Format: ORD-YYYYMMDD-XXXXXXXXXXXXX
+        return order_numbers.generate()
 
     @staticmethod
-    def create_order(
-        db: Session, order: OrderCreate, user_id: Optional[int] = None
+    def _select_orders() -> Select[tuple[Order]]:
+        """
+        Base order query. Items are loaded up front because async sessions
+        cannot lazy-load them when the response is serialized, and with
+        selectinload a page of orders costs one extra IN query for all of
+        its items instead of one query per order.
+        """
+        return select(Order).options(selectinload(Order.items))
+
+    @staticmethod
+    def _paginate(
+        query: Select[tuple[Order]],
+        skip: int,
+        limit: int,
+        after: Optional[Tuple[datetime, int]],
+    ) -> Select[tuple[Order]]:
+        """
+        Newest-first ordering with keyset or offset pagination.
+
+        ``after`` is the (created_at, id) of the last order on the previous
+        page; when given, ``skip`` is ignored and the page starts right
+        after it without scanning the skipped rows.
+        """
+        query = query.order_by(Order.created_at.desc(), Order.id.desc())
+        if after is not None:
+            created_at, order_id = after
+            query = query.filter(
+                tuple_(Order.created_at, Order.id)
+                < tuple_(literal(created_at, Order.created_at.type), order_id)
+            )
+        else:
+            query = query.offset(skip)
+        return query.limit(limit)
+
+    @staticmethod
+    def calculate_total(subtotal: float) -> float:
+        """Order total for an item subtotal: shipping plus tax on the items."""
+        tax = subtotal * settings.order_tax_rate
+        return round(subtotal + settings.order_shipping_cost + tax, 2)
+
+    @staticmethod
+    async def create_order(
+        db: AsyncSession,
+        order: OrderCreate,
+        user_id: Optional[int] = None,
+        before_commit: Optional[Callable[[Order], Awaitable[None]]] = None,
+    ) -> Order:
+        """
+        Create a new order with items, pricing it and reserving its stock.
+
+        Items are priced from the catalog (one IN query for all products) and
+        the total is computed here; prices and totals sent by the client are
+        ignored. Stock reservation, the order, one bulk insert of all of its
+        items and the ORDER_CREATED outbox event share a transaction, so
+        either the whole order is placed or nothing changes, and the
+        statement count does not grow with the number of lines. A duplicate
+        order number from another process is retried once.
+        ``before_commit`` is awaited with the placed order just before the
+        commit, to write more rows in the same transaction.
+
+        Raises:
+            InsufficientStockError: if any product is missing, inactive or
+                cannot cover its quantity
+        """
+        quantities: Counter[int] = Counter()
+        for item in order.items:
+            quantities[item.product_id] += item.quantity
+        products = await ProductService.get_products_by_ids(db, list(quantities))
+        prices = {product.id: product.price for product in products}
+
+        # Without a configured worker ID another process can generate the same
+        # order number; the transaction is then retried once with a new ID
+        for attempt in range(2):
+            try:
+                db_order = await OrderService._place_order(
+                    db, order, user_id, quantities, prices, before_commit
+                )
+                break
+            except IntegrityError as e:
+                await db.rollback()
+                if attempt or "order_number" not in str(e.orig):
+                    raise
+                order_numbers.reassign()
+
+        # Stock changed: drop every page that may show these products, but
+        # keep the other products' detail entries (and their ETags)
+        product_cache.discard_where(
+            lambda key: key[0] != "product" or key[1] in quantities
+        )
+        return db_order
+
+    @staticmethod
+    async def _place_order(
+        db: AsyncSession,
+        order: OrderCreate,
+        user_id: Optional[int],
+        quantities: Counter[int],
+        prices: Dict[int, float],
+        before_commit: Optional[Callable[[Order], Awaitable[None]]],
     ) -> Order:
-        """Create a new order with items."""
-        # Create the order
+        """Reserve stock, insert the order and its items, and commit."""
+        try:
+            await ProductService.reserve_stock(db, quantities)
+        except InsufficientStockError:
+            await db.rollback()
+            raise
+
+        # Every product exists and is active once its stock is reserved
+        subtotal = sum(prices[item.product_id] * item.quantity for item in order.items)
         db_order = Order(
             order_number=OrderService.generate_order_number(),
             customer_email=order.customer_email,
             customer_name=order.customer_name,
-            total_amount=order.total_amount,
+            total_amount=OrderService.calculate_total(subtotal),
             status=order.status,
             stripe_payment_id=order.stripe_payment_id,
             user_id=user_id,
         )
         db.add(db_order)
-        db.flush()  # Flush to get the ID for the order
-
-        # Create order items
-        for item_data in order.items:
-            db_item = OrderItem(
-                order_id=db_order.id,
-                product_id=item_data.product_id,
-                quantity=item_data.quantity,
-                price_at_purchase=item_data.price_at_purchase,
-            )
-            db.add(db_item)
+        # INSERT ... RETURNING fills in the ID and timestamps (eager_defaults)
+        await db.flush()
+
+        result = await db.execute(
+            insert(OrderItem).returning(OrderItem),
+            [
+                {
+                    "order_id": db_order.id,
+                    "product_id": item.product_id,
+                    "quantity": item.quantity,
+                    "price_at_purchase": prices[item.product_id],
+                }
+                for item in order.items
+            ],
+        )
 
-        db.commit()
-        db.refresh(db_order)
+        # Batched RETURNING rows are not guaranteed to be in insert order
+        items = sorted(result.scalars(), key=lambda item: item.id)
+        set_committed_value(db_order, "items", items)
+
+        OutboxService.add(
+            db,
+            ORDER_CREATED,
+            {
+                "order_id": db_order.id,
+                "order_number": db_order.order_number,
+                "customer_email": db_order.customer_email,
+                "total_amount": db_order.total_amount,
+            },
+        )
+        if before_commit is not None:
+            await before_commit(db_order)
+        await db.commit()
         return db_order
 
     @staticmethod
-    def get_order_by_id(db: Session, order_id: int) -> Optional[Order]:
+    async def get_order_by_id(db: AsyncSession, order_id: int) -> Optional[Order]:
         """Get an order by ID."""
-        return db.query(Order).filter(Order.id == order_id).first()
+        result = await db.execute(
+            OrderService._select_orders().filter(Order.id == order_id)
+        )
+        return result.scalars().first()
 
     @staticmethod
-    def get_order_by_number(db: Session, order_number: str) -> Optional[Order]:
+    async def get_order_by_number(
+        db: AsyncSession, order_number: str
+    ) -> Optional[Order]:
         """Get an order by order number."""
-        return db.query(Order).filter(Order.order_number == order_number).first()
+        result = await db.execute(
+            OrderService._select_orders().filter(Order.order_number == order_number)
+        )
+        return result.scalars().first()
 
     @staticmethod
-    def get_orders_by_email(
-        db: Session, email: str, skip: int = 0, limit: int = 50
+    async def get_orders_by_email(
+        db: AsyncSession,
+        email: str,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
     ) -> list[Order]:
         """Get all orders for a customer email."""
-        return (
-            db.query(Order)
-            .filter(Order.customer_email == email)
-            .order_by(Order.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        result = await db.execute(
+            OrderService._paginate(
+                OrderService._select_orders().filter(Order.customer_email == email),
+                skip,
+                limit,
+                after,
+            )
         )
+        return list(result.scalars().all())
 
     @staticmethod
-    def get_orders_by_user_id(
-        db: Session, user_id: int, skip: int = 0, limit: int = 50
+    async def get_orders_by_user_id(
+        db: AsyncSession,
+        user_id: int,
+        skip: int = 0,
+        limit: int = 50,
+        after: Optional[Tuple[datetime, int]] = None,
     ) -> list[Order]:
         """Get all orders for a specific user ID."""
-        return (
-            db.query(Order)
-            .filter(Order.user_id == user_id)
-            .order_by(Order.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
+        result = await db.execute(
+            OrderService._paginate(
+                OrderService._select_orders().filter(Order.user_id == user_id),
+                skip,
+                limit,
+                after,
+            )
         )
+        return list(result.scalars().all())
 
     @staticmethod
-    def update_order_status(
-        db: Session, order_id: int, new_status: str
+    async def _update_returning(
+        db: AsyncSession, condition: ColumnElement[bool], values: Dict[str, Any]
     ) -> Optional[Order]:
-        """Update order status."""
-        db_order = db.query(Order).filter(Order.id == order_id).first()
+        """
+        Apply ``values`` to the order matching ``condition`` and commit.
+
+        One ``UPDATE ... RETURNING`` brings back the updated row, including
+        the new ``updated_at``, plus one IN query for its items; there is no
+        SELECT beforehand and no refresh afterwards. Setting the status
+        records an ORDER_STATUS_CHANGED outbox event in the same transaction.
+        """
+        result = await db.execute(
+            update(Order)
+            .where(condition)
+            .values(**values)
+            .returning(Order)
+            .options(selectinload(Order.items))
+            .execution_options(populate_existing=True)
+        )
+        db_order = result.scalars().first()
         if not db_order:
             return None
-
-        db_order.status = new_status
-        db.commit()
-        db.refresh(db_order)
+        if "status" in values:
+            OrderService._add_status_event(
+                db,
+                db_order.id,
+                db_order.order_number,
+                db_order.customer_email,
+                db_order.status,
+            )
+        await db.commit()
         return db_order
 
     @staticmethod
-    def update_order(
-        db: Session, order_id: int, order_update: OrderUpdate
+    def _add_status_event(
+        db: AsyncSession,
+        order_id: int,
+        order_number: str,
+        customer_email: str,
+        status: str,
+    ) -> None:
+        """Record an ORDER_STATUS_CHANGED event in the current transaction."""
+        OutboxService.add(
+            db,
+            ORDER_STATUS_CHANGED,
+            {
+                "order_id": order_id,
+                "order_number": order_number,
+                "customer_email": customer_email,
+                "status": status,
+            },
+        )
+
+    @staticmethod
+    async def update_order_status(
+        db: AsyncSession, order_id: int, new_status: str
     ) -> Optional[Order]:
-        """Update an order."""
-        db_order = db.query(Order).filter(Order.id == order_id).first()
-        if not db_order:
-            return None
+        """Update order status."""
+        return await OrderService._update_returning(
+            db, Order.id == order_id, {"status": new_status}
+        )
 
+    @staticmethod
+    async def update_order(
+        db: AsyncSession, order_id: int, order_update: OrderUpdate
+    ) -> Optional[Order]:
+        """Update an order."""
         update_data = order_update.model_dump(exclude_unset=True)
-        for key, value in update_data.items():
-            setattr(db_order, key, value)
+        if not update_data:
+            return await OrderService.get_order_by_id(db, order_id)
+        return await OrderService._update_returning(
+            db, Order.id == order_id, update_data
+        )
 
-        db.commit()
-        db.refresh(db_order)
-        return db_order
+    @staticmethod
+    async def pay_order(db: AsyncSession, order_id: int, payment_id: str) -> bool:
+        """
+        Mark a pending order as paid and record its payment ID.
+
+        Status and payment ID are set by one conditional UPDATE, so an order
+        can only be paid once even under concurrent requests; the
+        ORDER_STATUS_CHANGED outbox event is committed with it.
+
+        Returns:
+            False if the order does not exist or is no longer pending
+        """
+        result = await db.execute(
+            update(Order)
+            .where(Order.id == order_id, Order.status == "pending")
+            .values(status="paid", stripe_payment_id=payment_id)
+            .returning(Order.order_number, Order.customer_email)
+            .execution_options(synchronize_session=False)
+        )
+        row = result.first()
+        if row is None:
+            return False
+        OrderService._add_status_event(
+            db, order_id, row.order_number, row.customer_email, "paid"
+        )
+        await db.commit()
+        return True
 
     @staticmethod
-    def get_all_orders(db: Session, skip: int = 0, limit: int = 100) -> list[Order]:
+    async def get_all_orders(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after: Optional[Tuple[datetime, int]] = None,
+    ) -> list[Order]:
         """Get all orders with pagination."""
-        return (
-            db.query(Order)
-            .order_by(Order.created_at.desc())
-            .offset(skip)
+        result = await db.execute(
+            OrderService._paginate(OrderService._select_orders(), skip, limit, after)
+        )
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def get_orders_placed_between(
+        db: AsyncSession, start: datetime, end: datetime, limit: int = 100
+    ) -> list[Order]:
+        """
+        Get orders placed in [start, end), oldest first.
+
+        Order numbers sort by creation time, so this is a range scan on the
+        order_number index rather than a sort by created_at.
+        """
+        result = await db.execute(
+            OrderService._select_orders()
+            .filter(
+                Order.order_number >= order_number_at(start),
+                Order.order_number < order_number_at(end),
+            )
+            .order_by(Order.order_number)
             .limit(limit)
-            .all()
         )
+        return list(result.scalars().all())
 
     @staticmethod
-    def update_order_status_by_payment_id(
-        db: Session, payment_id: str, new_status: str
+    async def update_order_status_by_payment_id(
+        db: AsyncSession, payment_id: str, new_status: str
     ) -> Optional[Order]:
         """Update order status by Stripe payment ID."""
-        db_order = db.query(Order).filter(Order.stripe_payment_id == payment_id).first()
-        if not db_order:
-            return None
-
-        db_order.status = new_status
-        db.commit()
-        db.refresh(db_order)
-        return db_order
+        return await OrderService._update_returning(
+            db, Order.stripe_payment_id == payment_id, {"status": new_status}
+        )
@@ -0,0 +1,131 @@
+"""
+Transactional outbox: side effects recorded alongside the change causing them.
+"""
+
+import time
+from datetime import timedelta
+from typing import Any, Dict, List, Tuple
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.models.outbox import OutboxEvent
+from app.models.types import utcnow
+
+# Event topics
+ORDER_CREATED = "order.created"
+ORDER_STATUS_CHANGED = "order.status_changed"
+PASSWORD_RESET_REQUESTED = "user.password_reset_requested"
+
+
+def retry_delay(attempts: int) -> timedelta:
+    """Exponential backoff before the next delivery attempt."""
+    seconds = settings.outbox_retry_base_seconds * 2 ** (attempts - 1)
+    return timedelta(seconds=min(seconds, settings.outbox_retry_max_seconds))
+
+
+class OutboxService:
+    """Service for outbox events."""
+
+    # Monotonic time after which this worker next purges failed events
+    _next_purge = 0.0
+
+    @staticmethod
+    def add(db: AsyncSession, topic: str, payload: Dict[str, Any]) -> None:
+        """
+        Record an event in the session's current transaction.
+
+        Nothing is written until the caller commits, so the event exists if
+        and only if the change it describes does.
+        """
+        db.add(OutboxEvent(topic=topic, payload=payload))
+
+    @staticmethod
+    async def claim_batch(db: AsyncSession, limit: int) -> List[OutboxEvent]:
+        """
+        Lease up to ``limit`` due events, oldest first, and commit.
+
+        One ``UPDATE ... RETURNING`` pushes ``available_at`` out by the lease
+        time and counts the attempt, so other workers skip these events until
+        they are delivered or the lease runs out.
+        """
+        now = utcnow()
+        due = (OutboxEvent.failed_at.is_(None), OutboxEvent.available_at <= now)
+        ids = (
+            select(OutboxEvent.id)
+            .where(*due)
+            .order_by(OutboxEvent.available_at, OutboxEvent.id)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(OutboxEvent)
+            # Re-checking ``due`` keeps a concurrent claim from taking the
+            # same rows where the subquery is not locked (SQLite)
+            .where(OutboxEvent.id.in_(ids), *due)
+            .values(
+                available_at=now + timedelta(seconds=settings.outbox_lease_seconds),
+                attempts=OutboxEvent.attempts + 1,
+            )
+            .returning(OutboxEvent)
+            .execution_options(populate_existing=True)
+        )
+        events = sorted(result.scalars().all(), key=lambda event: event.id)
+        await db.commit()
+        return events
+
+    @staticmethod
+    async def finish_batch(
+        db: AsyncSession,
+        delivered: List[int],
+        failed: List[Tuple[OutboxEvent, str]],
+    ) -> None:
+        """
+        Delete delivered events and schedule retries for failed ones.
+
+        An event that has failed ``outbox_max_attempts`` times gets
+        ``failed_at`` set and is kept for inspection instead of retried,
+        until ``purge_failed`` deletes it after the retention period.
+        """
+        now = utcnow()
+        if delivered:
+            await db.execute(
+                delete(OutboxEvent)
+                .where(OutboxEvent.id.in_(delivered))
+                .execution_options(synchronize_session=False)
+            )
+        for event, error in failed:
+            values: Dict[str, Any] = {"last_error": error[:2000]}
+            if event.attempts >= settings.outbox_max_attempts:
+                values["failed_at"] = now
+            else:
+                values["available_at"] = now + retry_delay(event.attempts)
+            await db.execute(
+                update(OutboxEvent)
+                .where(OutboxEvent.id == event.id)
+                .values(**values)
+                .execution_options(synchronize_session=False)
+            )
+        await db.commit()
+
+    @staticmethod
+    async def purge_failed(db: AsyncSession, force: bool = False) -> int:
+        """
+        Delete events that gave up longer ago than the retention period, at
+        most once per purge interval per worker.
+
+        Returns:
+            Number of events deleted
+        """
+        if not force and time.monotonic() < OutboxService._next_purge:
+            return 0
+        OutboxService._next_purge = (
+            time.monotonic() + settings.outbox_purge_interval_seconds
+        )
+        cutoff = utcnow() - timedelta(seconds=settings.outbox_failed_retention_seconds)
+        result = await db.execute(
+            delete(OutboxEvent).where(OutboxEvent.failed_at <= cutoff)
+        )
+        await db.commit()
+        return result.rowcount
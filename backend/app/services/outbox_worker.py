@@ -0,0 +1,166 @@
+"""
+Background delivery of outbox events.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from app.core.config import settings
+from app.core.security import create_password_reset_token
+from app.models.outbox import OutboxEvent
+from app.services.outbox_service import (
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    PASSWORD_RESET_REQUESTED,
+    OutboxService,
+)
+from app.utils.email import (
+    send_order_confirmation_email,
+    send_order_status_email,
+    send_password_reset_email,
+)
+
+logger = logging.getLogger(__name__)
+
+Handler = Callable[[Dict[str, Any]], Awaitable[None]]
+
+
+# Delivery is at-least-once: a worker that dies after sending but before
+# deleting the event sends it again once the lease runs out. The email
+# senders are blocking, so they run in a thread.
+async def send_order_confirmation(payload: Dict[str, Any]) -> None:
+    await asyncio.to_thread(
+        send_order_confirmation_email,
+        payload["customer_email"],
+        payload["order_number"],
+        payload["total_amount"],
+    )
+
+
+async def send_order_status(payload: Dict[str, Any]) -> None:
+    await asyncio.to_thread(
+        send_order_status_email,
+        payload["customer_email"],
+        payload["order_number"],
+        payload["status"],
+    )
+
+
+async def send_password_reset(payload: Dict[str, Any]) -> None:
+    # Minted per attempt, so a retried email carries a fresh token
+    token = create_password_reset_token(email=payload["email"])
+    await asyncio.to_thread(send_password_reset_email, payload["email"], token)
+
+
+HANDLERS: Dict[str, Handler] = {
+    ORDER_CREATED: send_order_confirmation,
+    ORDER_STATUS_CHANGED: send_order_status,
+    PASSWORD_RESET_REQUESTED: send_password_reset,
+}
+
+
+class OutboxWorker:
+    """
+    Drains the outbox from an asyncio task in the application's event loop.
+
+    Each round leases a batch of due events, runs their handlers
+    concurrently, then deletes the delivered ones and reschedules failures
+    in one transaction. A full batch is followed straight away by the next;
+    otherwise the worker sleeps for the poll interval.
+    """
+
+    def __init__(
+        self,
+        session_factory: async_sessionmaker[AsyncSession],
+        handlers: Optional[Dict[str, Handler]] = None,
+        batch_size: int = settings.outbox_batch_size,
+        poll_interval: float = settings.outbox_poll_interval_seconds,
+    ) -> None:
+        self.session_factory = session_factory
+        self.handlers = HANDLERS if handlers is None else handlers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self._task: Optional[asyncio.Task[None]] = None
+        self._stopping: Optional[asyncio.Event] = None
+
+    async def _deliver(self, event: OutboxEvent) -> Optional[str]:
+        """Run the event's handler; return the error, or None on success."""
+        handler = self.handlers.get(event.topic)
+        if handler is None:
+            return f"No handler for topic {event.topic!r}"
+        try:
+            await handler(event.payload)
+        except Exception as e:
+            logger.warning(
+                "Outbox event %s (%s) failed on attempt %s: %r",
+                event.id,
+                event.topic,
+                event.attempts,
+                e,
+            )
+            return repr(e)
+        return None
+
+    async def run_once(self) -> int:
+        """
+        Deliver one batch of due events.
+
+        Returns:
+            Number of events attempted
+        """
+        async with self.session_factory() as db:
+            await OutboxService.purge_failed(db)
+            events = await OutboxService.claim_batch(db, self.batch_size)
+            if not events:
+                return 0
+            errors = await asyncio.gather(*map(self._deliver, events))
+            delivered: List[int] = []
+            failed: List[Tuple[OutboxEvent, str]] = []
+            for event, error in zip(events, errors):
+                if error is None:
+                    delivered.append(event.id)
+                else:
+                    failed.append((event, error))
+            await OutboxService.finish_batch(db, delivered, failed)
+        return len(events)
+
+    async def _run(self) -> None:
+        assert self._stopping is not None
+        while not self._stopping.is_set():
+            try:
+                count = await self.run_once()
+            except Exception:
+                logger.exception("Outbox delivery round failed")
+                count = 0
+            if count < self.batch_size:
+                try:
+                    await asyncio.wait_for(self._stopping.wait(), self.poll_interval)
+                except asyncio.TimeoutError:
+                    pass
+
+    def start(self) -> None:
+        """Start draining in the background of the running event loop."""
+        self._stopping = asyncio.Event()
+        self._task = asyncio.create_task(self._run(), name="outbox-worker")
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """
+        Stop after the current round, cancelling it after ``timeout``.
+
+        Events of a cancelled round are delivered again once their lease
+        runs out.
+        """
+        if self._task is None or self._stopping is None:
+            return
+        self._stopping.set()
+        done, _ = await asyncio.wait({self._task}, timeout=timeout)
+        if not done:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+        self._task = None
@@ -2,38 +2,56 @@
 Payment service handling Stripe integration.
 """
 
-from typing import Any
-import stripe
-import stripe.error
+from functools import lru_cache
+from types import ModuleType
+from typing import Any, Dict, Optional
+
 from fastapi import HTTPException
 
 from app.core.config import settings
 
-# Initialize Stripe
-stripe.api_key = settings.stripe_secret_key
+
+@lru_cache(maxsize=1)
+def get_stripe() -> ModuleType:
+    """
+    Import and configure the Stripe SDK on first use.
+
+    The SDK takes a noticeable share of app import time and is only needed
+    by the payment endpoints, so it is kept off the cold-start path.
+    """
+    import stripe
+    import stripe.error
+
+    stripe.api_key = settings.stripe_secret_key
+    return stripe
 
 
 class PaymentService:
     @staticmethod
-    def create_payment_intent(amount: float, currency: str = "usd") -> Any:
+    def create_payment_intent(
+        amount: float, currency: str = "usd", metadata: Optional[Dict[str, str]] = None
+    ) -> Any:
         """
         Create a Stripe PaymentIntent.
 
         Args:
             amount: Amount in dollars (will be converted to cents)
             currency: Currency code (default: usd)
+            metadata: Key-value pairs stored on the PaymentIntent
 
         Returns:
             dict: PaymentIntent object from Stripe
         """
+        stripe = get_stripe()
         try:
-            # Convert to cents
-            amount_cents = int(amount * 100)
+            # Convert to cents; rounded, as e.g. 117.99 * 100 is 11798.999...
+            amount_cents = round(amount * 100)
 
             intent = stripe.PaymentIntent.create(
                 amount=amount_cents,
                 currency=currency,
                 automatic_payment_methods={"enabled": True},
+                metadata=metadata or {},
             )
             return intent
         except stripe.error.StripeError as e:
@@ -44,6 +62,7 @@ class PaymentService:
         """
         Verify and construct a Stripe webhook event.
         """
+        stripe = get_stripe()
         try:
             event = stripe.Webhook.construct_event(
                 payload, sig_header, settings.stripe_webhook_secret
@@ -0,0 +1,73 @@
+"""
+Streaming export of the product catalog as NDJSON or CSV.
+"""
+
+import csv
+import io
+from typing import AsyncIterator
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.product import Product
+from app.schemas.product import ProductResponse
+
+EXPORT_FORMATS = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+EXPORT_CSV_FIELDS = [
+    "id",
+    "sku",
+    "name",
+    "description",
+    "price",
+    "stock",
+    "image_url",
+    "is_active",
+]
+DEFAULT_EXPORT_BATCH_SIZE = 1000
+
+
+class ProductExportService:
+    """Service for catalog exports."""
+
+    @staticmethod
+    async def iter_export(
+        db: AsyncSession,
+        fmt: str,
+        batch_size: int = DEFAULT_EXPORT_BATCH_SIZE,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the active catalog as text chunks of ``batch_size`` products.
+
+        Rows come from a streamed result with ``yield_per``, so only one batch
+        of products is in memory at a time whatever the catalog size.
+        """
+        result = await db.stream(
+            select(Product)
+            .filter(Product.is_active == 1)
+            .order_by(Product.id)
+            .execution_options(yield_per=batch_size)
+        )
+
+        if fmt == "csv":
+            buffer = io.StringIO()
+            writer = csv.DictWriter(
+                buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore"
+            )
+            writer.writeheader()
+            yield buffer.getvalue()
+
+        async for products in result.scalars().partitions():
+            if fmt == "csv":
+                buffer = io.StringIO()
+                writer = csv.DictWriter(
+                    buffer, fieldnames=EXPORT_CSV_FIELDS, extrasaction="ignore"
+                )
+                writer.writerows(
+                    ProductResponse.model_validate(p).model_dump() for p in products
+                )
+                yield buffer.getvalue()
+            else:
+                yield "".join(
+                    ProductResponse.model_validate(p).model_dump_json() + "\n"
+                    for p in products
+                )
@@ -0,0 +1,170 @@
+"""
+Streaming bulk import of products from CSV or JSON Lines.
+"""
+
+import asyncio
+import codecs
+import csv
+from typing import IO, Any, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ValidationError
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.schemas.product import ProductCreate, ProductImportError, ProductImportReport
+from app.services.product_service import ProductService
+
+IMPORT_FORMATS = ("csv", "jsonl")
+DEFAULT_BATCH_SIZE = 500
+# Only the first failures are kept so the report stays small for any file
+MAX_REPORTED_ERRORS = 100
+
+# (line number, CSV record or JSON line)
+RawRow = Tuple[int, Union[dict, str]]
+
+
+def detect_format(filename: Optional[str]) -> Optional[str]:
+    """Guess the import format from a file name."""
+    if not filename:
+        return None
+    suffix = filename.rsplit(".", 1)[-1].lower()
+    if suffix in ("jsonl", "ndjson"):
+        return "jsonl"
+    if suffix == "csv":
+        return "csv"
+    return None
+
+
+def iter_raw_rows(file: IO[bytes], fmt: str) -> Iterator[RawRow]:
+    """Yield rows one at a time from a binary file; nothing is read ahead."""
+    # Decode line by line rather than via TextIOWrapper, which needs
+    # readable() and so rejects SpooledTemporaryFile uploads before 3.11
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    text = (decoder.decode(line) for line in file)
+    if fmt == "csv":
+        reader = csv.DictReader(text)
+        for record in reader:
+            yield reader.line_num, record
+    else:
+        for line_number, line in enumerate(text, start=1):
+            if line.strip():
+                yield line_number, line
+
+
+def parse_row(raw: Union[dict, str]) -> ProductCreate:
+    """Validate one CSV record or JSON line as a ProductCreate."""
+    if isinstance(raw, str):
+        return ProductCreate.model_validate_json(raw)
+    # Empty CSV cells fall back to the schema defaults
+    return ProductCreate.model_validate({k: v for k, v in raw.items() if v != ""})
+
+
+def format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc']) or 'row'}: {e['msg']}"
+        for e in error.errors()
+    )
+
+
+def row_sku(raw: Any) -> Optional[str]:
+    return raw.get("sku") if isinstance(raw, dict) else None
+
+
+class ProductImportService:
+    """Service for bulk product imports."""
+
+    @staticmethod
+    def _record_error(
+        report: ProductImportReport, line: int, sku: Optional[str], error: str
+    ) -> None:
+        report.failed += 1
+        if len(report.errors) < MAX_REPORTED_ERRORS:
+            report.errors.append(ProductImportError(line=line, sku=sku, error=error))
+        else:
+            report.errors_truncated = True
+
+    @staticmethod
+    def _read_batch(
+        rows: Iterator[RawRow], batch_size: int, report: ProductImportReport
+    ) -> List[Tuple[int, ProductCreate]]:
+        """
+        Read and validate rows until ``batch_size`` are valid.
+
+        Returns an empty list once the file is exhausted.
+        """
+        batch: List[Tuple[int, ProductCreate]] = []
+        for line, raw in rows:
+            report.processed += 1
+            try:
+                batch.append((line, parse_row(raw)))
+            except ValidationError as e:
+                ProductImportService._record_error(
+                    report, line, row_sku(raw), format_validation_error(e)
+                )
+                continue
+            if len(batch) >= batch_size:
+                break
+        return batch
+
+    @staticmethod
+    async def _flush(
+        db: AsyncSession,
+        batch: List[Tuple[int, ProductCreate]],
+        report: ProductImportReport,
+    ) -> None:
+        """Upsert a batch; if it hits a constraint, retry row by row."""
+        try:
+            created, updated = await ProductService.upsert_products(
+                db, [product for _, product in batch]
+            )
+        except IntegrityError:
+            created = updated = 0
+            for line, product in batch:
+                try:
+                    row_created, row_updated = await ProductService.upsert_products(
+                        db, [product]
+                    )
+                except IntegrityError as e:
+                    ProductImportService._record_error(
+                        report, line, product.sku, str(e.orig)
+                    )
+                    continue
+                created += row_created
+                updated += row_updated
+        report.created += created
+        report.updated += updated
+
+    @staticmethod
+    async def import_products(
+        db: AsyncSession,
+        file: IO[bytes],
+        fmt: str,
+        batch_size: int = DEFAULT_BATCH_SIZE,
+    ) -> ProductImportReport:
+        """
+        Upsert products by SKU from a CSV or JSONL file.
+
+        The file is read incrementally and written in batches of
+        ``batch_size`` rows, one transaction per batch, so memory use does not
+        depend on the file size. Reading and validating a batch runs in a
+        thread, so the file I/O and parsing do not block the event loop.
+        Invalid rows are reported and skipped.
+
+        Args:
+            db: Database session
+            file: Binary file positioned at the start of the data
+            fmt: "csv" (header row required) or "jsonl"
+            batch_size: Rows per INSERT ... ON CONFLICT executemany
+
+        Returns:
+            Counts of created, updated and failed rows plus the first errors
+        """
+        report = ProductImportReport()
+        rows = iter_raw_rows(file, fmt)
+        while True:
+            batch = await asyncio.to_thread(
+                ProductImportService._read_batch, rows, batch_size, report
+            )
+            if not batch:
+                return report
+            await ProductImportService._flush(db, batch, report)
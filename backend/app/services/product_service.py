@@ -2,40 +2,155 @@
 Business logic for product operations.
 """
 
-from typing import List, Optional
+import re
+from collections import defaultdict
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import (
+    ColumnElement,
+    Float,
+    Insert,
+    and_,
+    case,
+    func,
+    literal_column,
+    or_,
+    select,
+    update,
+)
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.models.product import Product
+from app.core.cache import product_cache
+from app.models.product import (
+    PRODUCT_FTS_TABLE,
+    PRODUCT_TSVECTOR,
+    Product,
+    product_fts,
+)
 from app.schemas.product import ProductCreate, ProductUpdate
 
+# Search terms are reduced to word characters and matched as prefixes, so
+# user input can never inject FTS5 / tsquery operators
+SEARCH_TOKEN = re.compile(r"\w+")
+
+# Columns an upsert may overwrite on an existing product (SKU is the key)
+UPSERT_COLUMNS = frozenset(
+    ["name", "description", "price", "stock", "image_url", "is_active"]
+)
+
+
+class InsufficientStockError(Exception):
+    """Raised when stock cannot be reserved for one or more products."""
+
+    def __init__(self, product_ids: List[int]) -> None:
+        super().__init__(
+            "Insufficient stock for product(s): "
+            + ", ".join(str(product_id) for product_id in product_ids)
+        )
+        self.product_ids = product_ids
+
 
 class ProductService:
     """Service for product operations."""
 
     @staticmethod
-    def get_all_products(db: Session, skip: int = 0, limit: int = 100) -> List[Product]:
-        """Get all active products with pagination."""
-        return (
-            db.query(Product)
-            .filter(Product.is_active == 1)
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
+    async def get_all_products(
+        db: AsyncSession,
+        skip: int = 0,
+        limit: int = 100,
+        after_id: Optional[int] = None,
+    ) -> List[Product]:
+        """
+        Get all active products with pagination.
+
+        Pass ``after_id`` (the last ID of the previous page) for keyset
+        pagination; ``skip`` is then ignored.
+        """
+        query = select(Product).filter(Product.is_active == 1).order_by(Product.id)
+        if after_id is not None:
+            query = query.filter(Product.id > after_id)
+        else:
+            query = query.offset(skip)
+        result = await db.execute(query.limit(limit))
+        return list(result.scalars().all())
+
+    @staticmethod
+    async def search_products(
+        db: AsyncSession,
+        query: str,
+        limit: int = 20,
+        after: Optional[Tuple[float, int]] = None,
+    ) -> List[Tuple[Product, float]]:
+        """
+        Full-text search over active products, best match first.
+
+        Returns (product, score) pairs ordered by ascending score then ID;
+        pass the last pair's (score, id) as ``after`` for the next page.
+        """
+        tokens = SEARCH_TOKEN.findall(query.lower())
+        if not tokens:
+            return []
+
+        dialect = db.get_bind().dialect.name
+        if dialect == "postgresql":
+            vector = literal_column(f"({PRODUCT_TSVECTOR})")
+            tsquery = func.to_tsquery(
+                "simple", " & ".join(f"{token}:*" for token in tokens)
+            )
+            score: ColumnElement[float] = -func.ts_rank(vector, tsquery)
+            stmt = select(Product, score).filter(vector.op("@@")(tsquery))
+        else:
+            # The hidden column named after the table drives MATCH and bm25
+            fts = literal_column(PRODUCT_FTS_TABLE)
+            # bm25 is lower-is-better; name and SKU hits outweigh description
+            score = func.bm25(fts, 10.0, 1.0, 10.0, type_=Float)
+            stmt = (
+                select(Product, score)
+                .select_from(product_fts)
+                .join(Product, Product.id == product_fts.c.rowid)
+                .filter(fts.op("MATCH")(" ".join(f'"{t}"*' for t in tokens)))
+            )
+
+        stmt = stmt.filter(Product.is_active == 1)
+        if after is not None:
+            last_score, last_id = after
+            stmt = stmt.filter(
+                or_(score > last_score, and_(score == last_score, Product.id > last_id))
+            )
+        result = await db.execute(stmt.order_by(score, Product.id).limit(limit))
+        return [(product, value) for product, value in result.all()]
 
     @staticmethod
-    def get_product_by_id(db: Session, product_id: int) -> Optional[Product]:
+    async def get_product_by_id(db: AsyncSession, product_id: int) -> Optional[Product]:
         """Get a product by ID."""
-        return db.query(Product).filter(Product.id == product_id).first()
+        result = await db.execute(select(Product).filter(Product.id == product_id))
+        return result.scalars().first()
+
+    @staticmethod
+    async def get_products_by_ids(
+        db: AsyncSession, product_ids: List[int]
+    ) -> List[Product]:
+        """
+        Get several products with one IN query.
+
+        Products are returned in the order of ``product_ids`` (duplicates
+        collapsed); IDs that do not exist are skipped.
+        """
+        unique_ids = list(dict.fromkeys(product_ids))
+        result = await db.execute(select(Product).filter(Product.id.in_(unique_ids)))
+        by_id = {product.id: product for product in result.scalars()}
+        return [by_id[pid] for pid in unique_ids if pid in by_id]
 
     @staticmethod
-    def get_product_by_sku(db: Session, sku: str) -> Optional[Product]:
+    async def get_product_by_sku(db: AsyncSession, sku: str) -> Optional[Product]:
         """Get a product by SKU."""
-        return db.query(Product).filter(Product.sku == sku).first()
+        result = await db.execute(select(Product).filter(Product.sku == sku))
+        return result.scalars().first()
 
     @staticmethod
-    def create_product(db: Session, product: ProductCreate) -> Product:
+    async def create_product(db: AsyncSession, product: ProductCreate) -> Product:
         """Create a new product."""
         db_product = Product(
             name=product.name,
@@ -47,56 +162,159 @@ class ProductService:
             is_active=1 if product.is_active else 0,
         )
         db.add(db_product)
-        db.commit()
-        db.refresh(db_product)
+        # The INSERT assigns the ID; nothing else is server-generated, so the
+        # object is complete without a refresh (sessions keep it on commit)
+        await db.commit()
+        product_cache.clear()
         return db_product
 
     @staticmethod
-    def update_product(
-        db: Session, product_id: int, product_update: ProductUpdate
-    ) -> Optional[Product]:
-        """Update an existing product."""
-        db_product = db.query(Product).filter(Product.id == product_id).first()
-        if not db_product:
-            return None
+    def _upsert_statement(db: AsyncSession, columns: Iterable[str]) -> Insert:
+        """
+        INSERT ... ON CONFLICT (sku) DO UPDATE for the session's dialect.
+
+        An existing product only gets ``columns`` overwritten; its other
+        values are kept.
+        """
+        dialect = db.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        stmt = insert(Product)
+        return stmt.on_conflict_do_update(
+            index_elements=[Product.sku],
+            set_={column: stmt.excluded[column] for column in columns},
+        )
+
+    @staticmethod
+    async def upsert_products(
+        db: AsyncSession, products: List[ProductCreate]
+    ) -> Tuple[int, int]:
+        """
+        Insert or update products by SKU and commit.
+
+        New products get schema defaults for fields they leave out, while
+        existing products only have the fields that were actually supplied
+        updated: a price-only row does not reset stock or reactivate a
+        deleted product. Rows are written with one executemany per set of
+        supplied fields. A later duplicate SKU in ``products`` wins. Raises
+        IntegrityError (with the transaction rolled back) if any row
+        violates another constraint.
+
+        Returns:
+            Tuple of (created, updated) counts
+        """
+        latest = {product.sku: product for product in products}
+        groups: Dict[FrozenSet[str], List[Dict[str, Any]]] = defaultdict(list)
+        for product in latest.values():
+            supplied = frozenset(product.model_fields_set & UPSERT_COLUMNS)
+            groups[supplied].append(
+                {**product.model_dump(), "is_active": 1 if product.is_active else 0}
+            )
+        result = await db.execute(select(Product.sku).filter(Product.sku.in_(latest)))
+        existing = len(result.scalars().all())
+        try:
+            for columns, rows in groups.items():
+                await db.execute(
+                    ProductService._upsert_statement(db, sorted(columns)), rows
+                )
+            await db.commit()
+        except IntegrityError:
+            await db.rollback()
+            raise
+        product_cache.clear()
+        return len(latest) - existing, existing
 
+    @staticmethod
+    async def update_product(
+        db: AsyncSession, product_id: int, product_update: ProductUpdate
+    ) -> Optional[Product]:
+        """Update an existing product with one UPDATE ... RETURNING."""
         update_data = product_update.model_dump(exclude_unset=True)
+        if not update_data:
+            return await ProductService.get_product_by_id(db, product_id)
         if "is_active" in update_data:
             update_data["is_active"] = 1 if update_data["is_active"] else 0
 
-        for key, value in update_data.items():
-            setattr(db_product, key, value)
-
-        db.commit()
-        db.refresh(db_product)
+        result = await db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(**update_data)
+            .returning(Product)
+            .execution_options(populate_existing=True)
+        )
+        db_product = result.scalars().first()
+        if not db_product:
+            return None
+        await db.commit()
+        product_cache.clear()
         return db_product
 
     @staticmethod
-    def delete_product(db: Session, product_id: int) -> bool:
+    async def delete_product(db: AsyncSession, product_id: int) -> bool:
         """Soft delete a product by marking it inactive."""
-        db_product = db.query(Product).filter(Product.id == product_id).first()
-        if not db_product:
+        result = await db.execute(
+            update(Product)
+            .where(Product.id == product_id)
+            .values(is_active=0)
+            .execution_options(synchronize_session=False)
+        )
+        if result.rowcount != 1:
             return False
-
-        db_product.is_active = 0
-        db.commit()
+        await db.commit()
+        product_cache.clear()
         return True
 
     @staticmethod
-    def check_stock(db: Session, product_id: int, quantity: int) -> bool:
+    async def check_stock(db: AsyncSession, product_id: int, quantity: int) -> bool:
         """Check if sufficient stock is available."""
-        product = db.query(Product).filter(Product.id == product_id).first()
+        product = await ProductService.get_product_by_id(db, product_id)
         if not product:
             return False
         return product.stock >= quantity
 
     @staticmethod
-    def reduce_stock(db: Session, product_id: int, quantity: int) -> bool:
-        """Reduce product stock by quantity."""
-        product = db.query(Product).filter(Product.id == product_id).first()
-        if not product or product.stock < quantity:
+    async def reserve_stock(db: AsyncSession, quantities: Dict[int, int]) -> None:
+        """
+        Take stock for several products inside the caller's transaction.
+
+        All products are decremented by one conditional
+        ``UPDATE ... SET stock = stock - CASE id ... END WHERE id IN (...) AND
+        stock >= CASE id ... END RETURNING id``, so concurrent reservations can
+        never oversell and the cost does not grow with the number of
+        products. Nothing is committed; on failure the caller must roll back.
+
+        Args:
+            db: Database session
+            quantities: Quantity to reserve per product ID
+
+        Raises:
+            InsufficientStockError: listing every product that is missing,
+                inactive or short of stock
+        """
+        quantity = case(quantities, value=Product.id)
+        result = await db.execute(
+            update(Product)
+            .where(
+                Product.id.in_(list(quantities)),
+                Product.is_active == 1,
+                Product.stock >= quantity,
+            )
+            .values(stock=Product.stock - quantity)
+            .returning(Product.id)
+            .execution_options(synchronize_session=False)
+        )
+        short = sorted(set(quantities) - set(result.scalars()))
+        if short:
+            raise InsufficientStockError(short)
+
+    @staticmethod
+    async def reduce_stock(db: AsyncSession, product_id: int, quantity: int) -> bool:
+        """Atomically reduce product stock by quantity."""
+        try:
+            await ProductService.reserve_stock(db, {product_id: quantity})
+        except InsufficientStockError:
+            await db.rollback()
             return False
 
-        product.stock -= quantity
-        db.commit()
+        await db.commit()
+        product_cache.clear()
         return True
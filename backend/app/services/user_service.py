@@ -2,9 +2,11 @@
 User service for handling business logic.
 """
 
+import asyncio
 from typing import List, Optional
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.security import hash_password
 from app.models.user import User
@@ -13,12 +15,19 @@ from app.schemas.user import UserCreate, UserUpdate
 
 class UserService:
     @staticmethod
-    def get_user_by_email(db: Session, email: str) -> Optional[User]:
-        return db.query(User).filter(User.email == email).first()
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.id == user_id))
+        return result.scalars().first()
 
     @staticmethod
-    def create_user(db: Session, user: UserCreate) -> User:
-        hashed_password = hash_password(user.password)
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate) -> User:
+        # Argon2 is CPU-bound; keep it off the event loop
+        hashed_password = await asyncio.to_thread(hash_password, user.password)
         db_user = User(
             email=user.email,
             hashed_password=hashed_password,
@@ -27,26 +36,33 @@ class UserService:
             is_superuser=user.is_superuser,
         )
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        # Sessions keep attributes on commit and no column is server-generated
+        # apart from the ID, so no refresh SELECT is needed
+        await db.commit()
         return db_user
 
     @staticmethod
-    def authenticate_user(db: Session, email: str, password: str) -> Optional[User]:
-        user = UserService.get_user_by_email(db, email)
+    async def authenticate_user(
+        db: AsyncSession, email: str, password: str
+    ) -> Optional[User]:
+        user = await UserService.get_user_by_email(db, email)
         if not user:
             return None
         from app.core.security import verify_password
 
-        if not verify_password(password, str(user.hashed_password)):
+        if not await asyncio.to_thread(
+            verify_password, password, str(user.hashed_password)
+        ):
             return None
         return user
 
     @staticmethod
-    def update_user(db: Session, db_user: User, user_in: UserUpdate) -> User:
+    async def update_user(db: AsyncSession, db_user: User, user_in: UserUpdate) -> User:
         update_data = user_in.model_dump(exclude_unset=True)
         if update_data.get("password"):
-            hashed_password = hash_password(update_data["password"])
+            hashed_password = await asyncio.to_thread(
+                hash_password, update_data["password"]
+            )
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
 
@@ -54,6 +70,5 @@ class UserService:
             setattr(db_user, field, value)
 
         db.add(db_user)
-        db.commit()
-        db.refresh(db_user)
+        await db.commit()
         return db_user
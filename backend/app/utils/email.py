@@ -9,3 +9,20 @@ def send_password_reset_email(to_email: str, token: str) -> None:
     reset_link = f"http://localhost:5173/reset-password?token={token}"
     print(f"\n[MOCK EMAIL] Password reset requested for {to_email}")
     print(f"[MOCK EMAIL] Link: {reset_link}\n")
+
+
+def send_order_confirmation_email(
+    to_email: str, order_number: str, total_amount: float
+) -> None:
+    """
+    Mock sending an order confirmation email by printing to console.
+    """
+    print(f"\n[MOCK EMAIL] Order {order_number} confirmed for {to_email}")
+    print(f"[MOCK EMAIL] Total: ${total_amount:.2f}\n")
+
+
+def send_order_status_email(to_email: str, order_number: str, status: str) -> None:
+    """
+    Mock sending an order status update email by printing to console.
+    """
+    print(f"\n[MOCK EMAIL] Order {order_number} for {to_email} is now '{status}'\n")
@@ -0,0 +1,101 @@
+"""
+Import-time profile of the application, for cold-start tuning.
+
+Runs ``python -X importtime -c "import app.main"`` in a fresh interpreter and
+summarizes the report: total import time, the slowest modules by cumulative
+and self time, and the cost per top-level package.
+
+Run with: python -m benchmarks.import_profile [--top 25] [--budget 3.0]
+"""
+
+import argparse
+import subprocess
+import sys
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional
+
+from app.core.config import settings
+
+
+class ImportEntry(NamedTuple):
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+
+def profile_imports(module: str = "app.main") -> List[ImportEntry]:
+    """Import a module in a fresh interpreter and parse its -X importtime report."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    entries = []
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:") :].split("|")
+        # Nesting is shown as two spaces of indentation per level
+        depth = (len(name) - len(name.lstrip(" ")) - 1) // 2
+        entries.append(
+            ImportEntry(name.strip(), int(self_us), int(cumulative_us), depth)
+        )
+    return entries
+
+
+def measure_import_seconds(module: str = "app.main") -> float:
+    """Wall-clock time to import a module in a fresh interpreter."""
+    code = (
+        "import time; start = time.perf_counter(); "
+        f"import {module}; print(time.perf_counter() - start)"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def summarize_packages(entries: List[ImportEntry]) -> Dict[str, int]:
+    """Total self time per top-level package, in microseconds."""
+    totals: Dict[str, int] = defaultdict(int)
+    for entry in entries:
+        totals[entry.module.split(".")[0]] += entry.self_us
+    return dict(totals)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument(
+        "--budget", type=float, default=settings.import_time_budget_seconds
+    )
+    args = parser.parse_args(argv)
+
+    entries = profile_imports(args.module)
+    seconds = measure_import_seconds(args.module)
+
+    print(f"import {args.module}: {seconds:.3f}s (budget {args.budget:.1f}s)\n")
+
+    print(f"Top {args.top} modules by cumulative time")
+    print(f"{'cumulative ms':>14}{'self ms':>10}  module")
+    for entry in sorted(entries, key=lambda e: e.cumulative_us, reverse=True)[
+        : args.top
+    ]:
+        print(
+            f"{entry.cumulative_us / 1000:>14.1f}{entry.self_us / 1000:>10.1f}  "
+            f"{'  ' * entry.depth}{entry.module}"
+        )
+
+    print(f"\nTop {args.top} packages by self time")
+    packages = sorted(summarize_packages(entries).items(), key=lambda kv: -kv[1])
+    for package, self_us in packages[: args.top]:
+        print(f"{self_us / 1000:>14.1f}  {package}")
+
+    return 1 if seconds > args.budget else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
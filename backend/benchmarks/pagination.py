@@ -0,0 +1,113 @@
+"""
+Benchmark OFFSET vs keyset (cursor) pagination of the order list.
+
+Seeds a fresh SQLite database with ``--rows`` orders and times fetching one
+page at increasing depths through ``OrderService.get_all_orders``, once with
+``skip`` and once with the cursor of the preceding row. OFFSET cost grows
+with depth; keyset pages stay flat because the index seek starts at the
+cursor.
+
+Run with: python -m benchmarks.pagination [--rows 1000000] [--limit 50]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+from typing import List, Tuple
+
+from sqlalchemy import insert, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import Base, create_database_engine
+from app.models.order import Order
+from app.services.order_service import OrderService
+
+BATCH_SIZE = 50_000
+REPEATS = 5
+
+
+def order_rows(start: int, count: int, epoch: datetime) -> List[dict]:
+    # Four orders per second, so the id tiebreak is exercised as well
+    return [
+        {
+            "order_number": f"BENCH-{i:08d}",
+            "customer_email": f"customer{i % 5000}@example.com",
+            "customer_name": "Bench Customer",
+            "total_amount": 10.0,
+            "status": "paid",
+            "created_at": epoch + timedelta(seconds=i // 4),
+            "updated_at": epoch + timedelta(seconds=i // 4),
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def seed(sessions: async_sessionmaker, rows: int) -> None:
+    epoch = datetime(2024, 1, 1)
+    async with sessions() as db:
+        for start in range(0, rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, rows - start)
+            await db.execute(insert(Order), order_rows(start, count, epoch))
+        await db.commit()
+
+
+async def time_page(sessions: async_sessionmaker, limit: int, **kwargs) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        async with sessions() as db:
+            start = time.perf_counter()
+            await OrderService.get_all_orders(db, limit=limit, **kwargs)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def cursor_at(sessions: async_sessionmaker, depth: int) -> Tuple[datetime, int]:
+    async with sessions() as db:
+        row = (
+            await db.execute(
+                select(Order.created_at, Order.id)
+                .order_by(Order.created_at.desc(), Order.id.desc())
+                .offset(depth - 1)
+                .limit(1)
+            )
+        ).one()
+    return row.created_at, row.id
+
+
+async def run(rows: int, limit: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(dir="."), "bench.db")
+    engine = create_database_engine(f"sqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    start = time.perf_counter()
+    await seed(sessions, rows)
+    print(f"seeded {rows} orders in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'depth':>10}{'offset ms':>12}{'keyset ms':>12}")
+    depths = sorted({0, 1_000, 10_000, 100_000, rows // 2, rows - limit})
+    for depth in (d for d in depths if 0 <= d < rows):
+        offset_s = await time_page(sessions, limit, skip=depth)
+        after = await cursor_at(sessions, depth) if depth else None
+        keyset_s = await time_page(sessions, limit, after=after)
+        print(f"{depth:>10}{offset_s * 1000:>12.2f}{keyset_s * 1000:>12.2f}")
+
+    await engine.dispose()
+    shutil.rmtree(os.path.dirname(path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows, args.limit))
+
+
+if __name__ == "__main__":
+    main()
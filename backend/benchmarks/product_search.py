@@ -0,0 +1,138 @@
+"""
+Benchmark full-text product search against LIKE '%q%' scans.
+
+Seeds a fresh SQLite database with ``--rows`` synthetic products (the FTS5
+index is filled by its triggers) and times a handful of queries through
+``ProductService.search_products`` and through an equivalent LIKE filter on
+name, description and SKU.
+
+Run with: python -m benchmarks.product_search [--rows 100000]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import shutil
+import string
+import tempfile
+import time
+from typing import List
+
+from sqlalchemy import insert, or_, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import Base, create_database_engine
+from app.models.product import Product
+from app.services.product_service import ProductService
+
+BATCH_SIZE = 20_000
+REPEATS = 5
+LIMIT = 20
+
+
+def vocabulary(rng: random.Random, size: int) -> List[str]:
+    # Pseudo-words give a catalog with realistic term selectivity
+    return sorted(
+        {
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 9)))
+            for _ in range(size)
+        }
+    )
+
+
+def product_rows(
+    start: int, count: int, rng: random.Random, words: List[str]
+) -> List[dict]:
+    return [
+        {
+            "name": f"{rng.choice(words)} {rng.choice(words)} {i}",
+            "description": " ".join(rng.choices(words, k=15)),
+            "price": 9.99,
+            "stock": 10,
+            "sku": f"SKU-{i:07d}",
+            "is_active": 1,
+        }
+        for i in range(start, start + count)
+    ]
+
+
+async def seed(sessions: async_sessionmaker, rows: int) -> List[str]:
+    """Insert the catalog and return search queries of varying selectivity."""
+    rng = random.Random(42)
+    words = vocabulary(rng, 3000)
+    async with sessions() as db:
+        for start in range(0, rows, BATCH_SIZE):
+            count = min(BATCH_SIZE, rows - start)
+            await db.execute(insert(Product), product_rows(start, count, rng, words))
+        await db.commit()
+    return [
+        words[0],  # single term
+        f"{words[1]} {words[2]}",  # two terms, both required
+        words[3][:4],  # prefix
+        "zzznomatch",  # no hits: LIKE scans everything
+    ]
+
+
+async def like_search(db, q: str) -> list:
+    filters = [
+        or_(
+            Product.name.ilike(f"%{term}%"),
+            Product.description.ilike(f"%{term}%"),
+            Product.sku.ilike(f"%{term}%"),
+        )
+        for term in q.split()
+    ]
+    result = await db.execute(
+        select(Product)
+        .filter(Product.is_active == 1, *filters)
+        .order_by(Product.id)
+        .limit(LIMIT)
+    )
+    return list(result.scalars().all())
+
+
+async def best_of(sessions: async_sessionmaker, search, q: str) -> float:
+    best = float("inf")
+    for _ in range(REPEATS):
+        async with sessions() as db:
+            start = time.perf_counter()
+            await search(db, q)
+            best = min(best, time.perf_counter() - start)
+    return best
+
+
+async def fts_search(db, q: str) -> list:
+    return await ProductService.search_products(db, q, limit=LIMIT)
+
+
+async def run(rows: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(dir="."), "bench.db")
+    engine = create_database_engine(f"sqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    start = time.perf_counter()
+    queries = await seed(sessions, rows)
+    print(f"seeded {rows} products in {time.perf_counter() - start:.1f}s\n")
+
+    print(f"{'query':<24}{'LIKE ms':>10}{'FTS ms':>10}")
+    for q in queries:
+        like_s = await best_of(sessions, like_search, q)
+        fts_s = await best_of(sessions, fts_search, q)
+        print(f"{q:<24}{like_s * 1000:>10.2f}{fts_s * 1000:>10.2f}")
+
+    await engine.dispose()
+    shutil.rmtree(os.path.dirname(path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100_000)
+    args = parser.parse_args()
+    asyncio.run(run(args.rows))
+
+
+if __name__ == "__main__":
+    main()
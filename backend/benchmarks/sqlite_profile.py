@@ -0,0 +1,111 @@
+"""
+Benchmark SQLite read/write throughput with and without the PRAGMA profile.
+
+Runs a checkout-like workload (one committed insert per request) and a
+catalog-like read workload concurrently against a fresh database file, once
+with SQLite defaults and once with the profile from ``Settings``.
+
+Run with: python -m benchmarks.sqlite_profile [--workers 8] [--ops 200]
+"""
+
+import argparse
+import asyncio
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict
+
+from sqlalchemy import select
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.database import Base, register_sqlite_pragmas
+from app.models.product import Product
+
+
+async def timed(coros: list, stats: Dict, key: str) -> None:
+    start = time.perf_counter()
+    await asyncio.gather(*coros)
+    stats[key] = time.perf_counter() - start
+
+
+async def writer(
+    sessions: async_sessionmaker, worker: int, ops: int, stats: Dict
+) -> None:
+    for i in range(ops):
+        async with sessions() as db:
+            db.add(
+                Product(
+                    name=f"bench-{worker}-{i}",
+                    price=9.99,
+                    stock=10,
+                    sku=f"BENCH-{worker}-{i}",
+                )
+            )
+            try:
+                await db.commit()
+                stats["writes"] += 1
+            except OperationalError:
+                await db.rollback()
+                stats["errors"] += 1
+
+
+async def reader(sessions: async_sessionmaker, ops: int, stats: Dict) -> None:
+    for i in range(ops):
+        async with sessions() as db:
+            try:
+                await db.execute(select(Product).filter(Product.id == i + 1))
+                stats["reads"] += 1
+            except OperationalError:
+                stats["errors"] += 1
+
+
+async def run_profile(tuned: bool, workers: int, ops: int) -> Dict:
+    # Use a directory on the real disk; /tmp is often tmpfs where fsync is free
+    path = os.path.join(tempfile.mkdtemp(dir="."), "bench.db")
+    engine: AsyncEngine = create_async_engine(
+        f"sqlite+aiosqlite:///{path}",
+        connect_args={"check_same_thread": False},
+        # Keep connections open so per-connection PRAGMAs are paid once
+        poolclass=AsyncAdaptedQueuePool,
+        pool_size=workers * 2,
+    )
+    if tuned:
+        register_sqlite_pragmas(engine.sync_engine)
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+    stats = {"writes": 0, "reads": 0, "errors": 0}
+    await asyncio.gather(
+        timed(
+            [writer(sessions, w, ops, stats) for w in range(workers)], stats, "write_s"
+        ),
+        timed([reader(sessions, ops, stats) for _ in range(workers)], stats, "read_s"),
+    )
+    await engine.dispose()
+    shutil.rmtree(os.path.dirname(path))
+    return stats
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--ops", type=int, default=200)
+    args = parser.parse_args()
+
+    print(f"{'profile':<10}{'writes/s':>12}{'reads/s':>12}{'errors':>10}")
+    for label, tuned in (("default", False), ("tuned", True)):
+        stats = asyncio.run(run_profile(tuned, args.workers, args.ops))
+        print(
+            f"{label:<10}"
+            f"{stats['writes'] / stats['write_s']:>12.0f}"
+            f"{stats['reads'] / stats['read_s']:>12.0f}"
+            f"{stats['errors']:>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Benchmark write endpoints: latency and SQL statements per request.
+
+Drives the app in-process through httpx's ASGI transport against a fresh
+SQLite database and reports, for each write endpoint, the median and p95
+latency over ``--requests`` calls together with the number of statements
+per call (from the Server-Timing header).
+
+Run with: python -m benchmarks.write_latency [--requests 300]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import re
+import shutil
+import statistics
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import Base, create_database_engine, get_db, get_read_db
+from app.main import app
+
+API = "/api/v1"
+QUERIES = re.compile(r'db;dur=[\d.]+;desc="(\d+) queries"')
+
+# (label, method, path for call i, JSON body for call i)
+Case = Tuple[str, str, Callable[[int], str], Callable[[int], Optional[Dict[str, Any]]]]
+
+
+async def measure(
+    client: httpx.AsyncClient, case: Case, calls: int, **kwargs: Any
+) -> Tuple[List[float], int, List[Any]]:
+    """Run one endpoint ``calls`` times; returns latencies, queries, bodies."""
+    label, method, path, body = case
+    latencies, queries, bodies = [], 0, []
+    for i in range(calls):
+        start = time.perf_counter()
+        response = await client.request(method, path(i), json=body(i), **kwargs)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code >= 400:
+            raise RuntimeError(f"{label}: {response.status_code} {response.text}")
+        match = QUERIES.search(response.headers.get("server-timing", ""))
+        queries = int(match.group(1)) if match else -1
+        bodies.append(response.json() if response.content else None)
+    return latencies, queries, bodies
+
+
+def report(label: str, latencies: List[float], queries: int) -> None:
+    ordered = sorted(latencies)
+    median = statistics.median(ordered) * 1000
+    p95 = ordered[int(len(ordered) * 0.95) - 1] * 1000
+    print(f"{label:<42}{median:>10.2f}{p95:>10.2f}{queries:>10}")
+
+
+async def run(calls: int) -> None:
+    path = os.path.join(tempfile.mkdtemp(dir="."), "bench.db")
+    engine = create_database_engine(f"sqlite:///{path}")
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        email, password = "bench@example.com", "Bench-Password-1"
+        await client.post(
+            f"{API}/auth/signup", json={"email": email, "password": password}
+        )
+        token = (
+            await client.post(
+                f"{API}/auth/login/access-token",
+                data={"username": email, "password": password},
+            )
+        ).json()["access_token"]
+        stocked = (
+            await client.post(
+                f"{API}/products/",
+                json={"name": "Bench Stock", "price": 5.0, "stock": 10**9, "sku": "BS"},
+            )
+        ).json()["id"]
+
+        print(f"{'endpoint':<42}{'p50 ms':>10}{'p95 ms':>10}{'queries':>10}")
+
+        products: List[int] = []
+        orders: List[int] = []
+        cases: List[Case] = [
+            (
+                "POST /products",
+                "POST",
+                lambda i: f"{API}/products/",
+                lambda i: {"name": f"Bench {i}", "price": 1.0, "sku": f"B-{i}"},
+            ),
+            (
+                "PUT /products/{id}",
+                "PUT",
+                lambda i: f"{API}/products/{products[i]}",
+                lambda i: {"price": 2.0, "stock": 5},
+            ),
+            (
+                "DELETE /products/{id}",
+                "DELETE",
+                lambda i: f"{API}/products/{products[i]}",
+                lambda i: None,
+            ),
+            (
+                "POST /orders",
+                "POST",
+                lambda i: f"{API}/orders/",
+                lambda i: {
+                    "customer_email": email,
+                    "customer_name": "Bench",
+                    "total_amount": 5.0,
+                    "items": [
+                        {"product_id": stocked, "quantity": 1, "price_at_purchase": 5.0}
+                    ],
+                },
+            ),
+            (
+                "PUT /orders/{id}",
+                "PUT",
+                lambda i: f"{API}/orders/{orders[i]}",
+                lambda i: {"status": "pending"},
+            ),
+            (
+                "POST /orders/{id}/process-payment",
+                "POST",
+                lambda i: f"{API}/orders/{orders[i]}/process-payment",
+                lambda i: {"stripe_payment_id": f"pi_bench_{i}"},
+            ),
+            (
+                "POST /orders/{id}/status/shipped",
+                "POST",
+                lambda i: f"{API}/orders/{orders[i]}/status/shipped",
+                lambda i: None,
+            ),
+        ]
+        for case in cases:
+            latencies, queries, bodies = await measure(client, case, calls)
+            if case[0] == "POST /products":
+                products = [body["id"] for body in bodies]
+            elif case[0] == "POST /orders":
+                orders = [body["id"] for body in bodies]
+            report(case[0], latencies, queries)
+
+        me: Case = (
+            "PUT /users/me",
+            "PUT",
+            lambda i: f"{API}/users/me",
+            lambda i: {"full_name": f"Bench {i}"},
+        )
+        latencies, queries, _ = await measure(
+            client, me, calls, headers={"Authorization": f"Bearer {token}"}
+        )
+        report(me[0], latencies, queries)
+
+    app.dependency_overrides.clear()
+    await engine.dispose()
+    shutil.rmtree(os.path.dirname(path))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=300)
+    args = parser.parse_args()
+    # Keep per-request access and pool logs out of the results table
+    logging.disable(logging.INFO)
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+import argparse
+import asyncio
+
+from app.core.database import AsyncSessionLocal
+from app.services.product_import import (
+    DEFAULT_BATCH_SIZE,
+    IMPORT_FORMATS,
+    ProductImportService,
+    detect_format,
+)
+
+
+async def import_file(path: str, fmt: str, batch_size: int):
+    async with AsyncSessionLocal() as db:
+        with open(path, "rb") as file:
+            report = await ProductImportService.import_products(
+                db, file, fmt, batch_size=batch_size
+            )
+
+    print(
+        f"Processed {report.processed} rows: {report.created} created, "
+        f"{report.updated} updated, {report.failed} failed"
+    )
+    for error in report.errors:
+        print(f"  line {error.line} ({error.sku or '-'}): {error.error}")
+    if report.errors_truncated:
+        print("  ... more errors not shown")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Bulk import products by SKU")
+    parser.add_argument("path", help="CSV (with header) or JSONL file")
+    parser.add_argument("--format", choices=IMPORT_FORMATS)
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        parser.error("cannot infer format from file name; pass --format")
+    asyncio.run(import_file(args.path, fmt, args.batch_size))
@@ -0,0 +1,58 @@
+"""
+Bring the database to the Alembic head revision, so the startup revision
+check passes.
+
+A fresh (empty) database gets the schema from the models and is stamped at
+head; a database already under Alembic is upgraded with `alembic upgrade
+head`. A database with tables but no recorded revision is left alone.
+Run with: python init_db.py
+"""
+
+import asyncio
+import sys
+from typing import List, Set, Tuple
+
+from alembic import command
+from alembic.config import Config
+from sqlalchemy import inspect
+
+from app.core.config import settings
+from app.core.database import Base, engine
+from app.core.migrations import ALEMBIC_INI, get_current_revisions
+import app.models  # noqa: F401  (register models on Base.metadata)
+
+
+async def inspect_database() -> Tuple[Set[str], List[str]]:
+    """Return the recorded Alembic revisions and the existing table names."""
+    revisions = await get_current_revisions(engine)
+    async with engine.connect() as conn:
+        tables = await conn.run_sync(
+            lambda sync_conn: inspect(sync_conn).get_table_names()
+        )
+    await engine.dispose()
+    return revisions, tables
+
+
+async def create_tables() -> None:
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    config = Config(str(ALEMBIC_INI))
+    config.set_main_option("sqlalchemy.url", settings.database_url)
+    revisions, tables = asyncio.run(inspect_database())
+    if revisions:
+        command.upgrade(config, "head")
+        print("Database migrated to Alembic head.")
+    elif not tables:
+        asyncio.run(create_tables())
+        command.stamp(config, "head")
+        print("Database schema created and stamped at Alembic head.")
+    else:
+        sys.exit(
+            "Database has tables but no Alembic revision. Stamp the revision "
+            "matching its schema (`alembic stamp <revision>`), then run "
+            "`python init_db.py` again."
+        )
@@ -1,40 +1,99 @@
+import os
+import re
+import tempfile
+from contextlib import asynccontextmanager
+
+# Point the application's own engine and media storage at a throwaway
+# directory so importing and starting the app never touches real data
+TEST_DATA_DIR = tempfile.mkdtemp(prefix="3dprint-tests-")
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{TEST_DATA_DIR}/app.db")
+os.environ.setdefault("MEDIA_ROOT", f"{TEST_DATA_DIR}/media")
+# The worker would poll the app's own (empty) database; outbox tests drive
+# an OutboxWorker on the test engine instead
+os.environ.setdefault("OUTBOX_WORKER_ENABLED", "false")
+os.environ.setdefault("INTERNAL_API_TOKEN", "test-internal-token")
+
 import pytest
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.ext.asyncio import async_sessionmaker
 from fastapi.testclient import TestClient
 
 from app.main import app
-from app.core.database import Base, get_db
+from app.core.cache import product_cache
+from app.core.database import (
+    Base,
+    create_database_engine,
+    get_db,
+    get_read_db,
+    get_read_session_opener,
+    get_stream_db,
+)
 
 # Use in-memory SQLite for testing
-SQLALCHEMY_DATABASE_URL = "sqlite:///:memory:"
+SQLALCHEMY_DATABASE_URL = "sqlite+aiosqlite:///:memory:"
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL,
-    connect_args={"check_same_thread": False},
-    poolclass=StaticPool,
-)
+# Same hooks as the app engine (query logging/counting); in-memory SQLite
+# keeps a single shared connection
+engine = create_database_engine(SQLALCHEMY_DATABASE_URL)
 
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = async_sessionmaker(
+    bind=engine, autoflush=False, expire_on_commit=False
+)
 
 
-def override_get_db():
-    try:
-        db = TestingSessionLocal()
+async def override_get_db():
+    async with TestingSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 
 app.dependency_overrides[get_db] = override_get_db
+app.dependency_overrides[get_read_db] = override_get_db
+app.dependency_overrides[get_read_session_opener] = lambda: asynccontextmanager(
+    override_get_db
+)
+
+
+async def override_get_stream_db():
+    return TestingSessionLocal()
+
+
+app.dependency_overrides[get_stream_db] = override_get_stream_db
+
+
+async def create_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+async def drop_tables():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.drop_all)
 
 
 @pytest.fixture(scope="module")
 def client():
-    # Create tables
-    Base.metadata.create_all(bind=engine)
     with TestClient(app) as c:
+        # Create tables
+        c.portal.call(create_tables)
+        product_cache.clear()
         yield c
-    # Drop tables
-    Base.metadata.drop_all(bind=engine)
+        # Drop tables
+        c.portal.call(drop_tables)
+
+
+def parse_query_count(response) -> int:
+    """Number of SQL statements reported in a response's Server-Timing header."""
+    match = re.search(
+        r'db;dur=[\d.]+;desc="(\d+) queries"', response.headers["server-timing"]
+    )
+    return int(match.group(1))
+
+
+@pytest.fixture
+def internal_headers():
+    """Credentials for the /api/v1/internal endpoints."""
+    return {"Authorization": f"Bearer {os.environ['INTERNAL_API_TOKEN']}"}
+
+
+@pytest.fixture
+def query_count():
+    return parse_query_count
@@ -0,0 +1,57 @@
+"""
+EXPLAIN QUERY PLAN helpers for checking that service queries use indexes.
+"""
+
+import re
+from contextlib import contextmanager
+from typing import Any, Iterator, List, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+# "SCAN products" (or "SCAN TABLE products" before SQLite 3.36) reads every
+# row. FTS virtual tables ("SCAN products_fts VIRTUAL TABLE ...") do not match.
+FULL_SCAN = re.compile(r"^SCAN (?:TABLE )?\w+(?: AS \w+)?$")
+# Walks a whole index: fine for an ordered listing cut short by LIMIT, but a
+# filtered query doing this is missing an index that leads with its filter
+INDEX_WALK = re.compile(r"^SCAN (?:TABLE )?\w+(?: AS \w+)? USING (?:COVERING )?INDEX")
+# The rows are sorted after the fact instead of read in index order
+TEMP_SORT = re.compile(r"^USE TEMP B-TREE FOR (?:RIGHT PART OF )?ORDER BY")
+
+Statement = Tuple[str, Any]
+
+
+@contextmanager
+def capture_statements(engine: AsyncEngine) -> Iterator[List[Statement]]:
+    """Collect the SELECT/UPDATE/DELETE statements run on ``engine``."""
+    statements: List[Statement] = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        verb = statement.lstrip().split(None, 1)[0].upper()
+        if not executemany and verb in ("SELECT", "UPDATE", "DELETE"):
+            statements.append((statement, parameters))
+
+    event.listen(engine.sync_engine, "before_cursor_execute", record)
+    try:
+        yield statements
+    finally:
+        event.remove(engine.sync_engine, "before_cursor_execute", record)
+
+
+async def explain(conn: AsyncConnection, statement: str, parameters: Any) -> List[str]:
+    """The plan steps SQLite reports for ``statement``."""
+    result = await conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [detail for *_, detail in result.all()]
+
+
+def plan_problems(
+    plan: List[str], allow_index_walk: bool = False, allow_sort: bool = False
+) -> List[str]:
+    """Full table scans, plus whole-index walks and sorts unless allowed."""
+    return [
+        step
+        for step in plan
+        if FULL_SCAN.match(step)
+        or (INDEX_WALK.match(step) and not allow_index_walk)
+        or (TEMP_SORT.match(step) and not allow_sort)
+    ]
@@ -0,0 +1,144 @@
+"""
+Tests for the in-process product cache.
+"""
+
+from contextlib import asynccontextmanager
+
+from app.core.cache import TTLCache
+from app.core.database import get_read_session_opener
+from app.main import app
+from tests.conftest import TestingSessionLocal
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_ttl_expiry():
+    clock = FakeClock()
+    cache = TTLCache(max_entries=10, ttl_seconds=5, clock=clock)
+    cache.set("a", 1, cache.generation)
+    assert cache.get("a") == 1
+    clock.now = 5
+    assert cache.get("a") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_lru_eviction():
+    cache = TTLCache(max_entries=2, ttl_seconds=60)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    cache.get("a")  # "b" is now least recently used
+    cache.set("c", 3, cache.generation)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_stale_load_is_not_cached():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    generation = cache.generation
+    cache.clear()  # a write lands while the read is in flight
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+
+def test_product_reads_are_cached_until_write(client, query_count, internal_headers):
+    response = client.post(
+        "/api/v1/products/",
+        json={"name": "Cached Product", "price": 5.0, "sku": "CACHE-001"},
+    )
+    product_id = response.json()["id"]
+
+    first = client.get(f"/api/v1/products/{product_id}")
+    second = client.get(f"/api/v1/products/{product_id}")
+    assert first.json() == second.json()
+    assert query_count(first) == 1
+    assert query_count(second) == 0
+
+    client.put(f"/api/v1/products/{product_id}", json={"price": 7.5})
+    third = client.get(f"/api/v1/products/{product_id}")
+    assert third.json()["price"] == 7.5
+    assert query_count(third) == 1
+
+    listing = client.get("/api/v1/products/")
+    assert query_count(client.get("/api/v1/products/")) == 0
+    assert product_id in [p["id"] for p in listing.json()]
+
+    stats = client.get("/api/v1/internal/cache", headers=internal_headers).json()[
+        "products"
+    ]
+    assert stats["hits"] >= 2
+    assert stats["invalidations"] >= 2
+
+
+def test_discard_where_keeps_other_entries():
+    cache = TTLCache(max_entries=10, ttl_seconds=60)
+    cache.set("a", 1, cache.generation)
+    cache.set("b", 2, cache.generation)
+    generation = cache.generation
+    cache.discard_where(lambda key: key == "a")
+    assert cache.get("a") is None
+    assert cache.get("b") == 2
+    cache.set("a", "stale", generation)
+    assert cache.get("a") is None
+
+
+def test_order_invalidates_pages_showing_its_stock(client, query_count):
+    ids = [
+        client.post(
+            "/api/v1/products/",
+            json={"name": f"Order Cache {n}", "price": 5.0, "stock": 5, "sku": sku},
+        ).json()["id"]
+        for n, sku in enumerate(["CACHE-ORD-1", "CACHE-ORD-2"])
+    ]
+    etags = [client.get(f"/api/v1/products/{pid}").headers["etag"] for pid in ids]
+    search = "/api/v1/products/search?q=Order+Cache"
+    client.get(search)
+    assert query_count(client.get(search)) == 0
+
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "cache@example.com",
+            "customer_name": "Cache",
+            "items": [{"product_id": ids[0], "quantity": 2}],
+        },
+    )
+    assert response.status_code == 201
+
+    ordered = client.get(f"/api/v1/products/{ids[0]}")
+    assert ordered.json()["stock"] == 3
+    assert ordered.headers["etag"] != etags[0]
+    untouched = client.get(f"/api/v1/products/{ids[1]}")
+    assert query_count(untouched) == 0
+    assert untouched.headers["etag"] == etags[1]
+    # List and search pages show stock too
+    stock = {p["id"]: p["stock"] for p in client.get(search).json()}
+    assert stock == {ids[0]: 3, ids[1]: 5}
+
+
+def test_cache_hit_opens_no_session(client, monkeypatch):
+    opened = []
+
+    @asynccontextmanager
+    async def open_session():
+        opened.append(True)
+        async with TestingSessionLocal() as db:
+            yield db
+
+    monkeypatch.setitem(
+        app.dependency_overrides, get_read_session_opener, lambda: open_session
+    )
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Lazy Session", "price": 5.0, "sku": "CACHE-LAZY"},
+    ).json()["id"]
+    for _ in range(3):
+        assert client.get(f"/api/v1/products/{product_id}").status_code == 200
+    assert len(opened) == 1
@@ -0,0 +1,229 @@
+"""
+Tests for database engine configuration.
+"""
+
+import asyncio
+import logging
+
+import pytest
+
+from alembic.autogenerate import compare_metadata
+from alembic.runtime.migration import MigrationContext
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+import app.models  # noqa: F401  (register models on Base.metadata)
+from app.core.database import (
+    Base,
+    ReadRouter,
+    get_async_database_url,
+    register_sqlite_pragmas,
+)
+from app.core.migrations import (
+    SchemaOutOfDateError,
+    check_schema_revision,
+    get_head_revisions,
+    include_object,
+)
+from app.core.query_log import (
+    RequestQueryStats,
+    current_query_stats,
+    fingerprint,
+    normalize_statement,
+    register_query_logging,
+)
+
+
+def test_async_database_url():
+    assert get_async_database_url("sqlite:///./x.db") == "sqlite+aiosqlite:///./x.db"
+    assert (
+        get_async_database_url("postgresql://u:p@db/shop")
+        == "postgresql+asyncpg://u:p@db/shop"
+    )
+    assert (
+        get_async_database_url("sqlite+aiosqlite:///x.db") == "sqlite+aiosqlite:///x.db"
+    )
+
+
+def test_sqlite_pragmas_applied_on_connect(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'pragmas.db'}")
+    register_sqlite_pragmas(engine.sync_engine)
+
+    async def read_pragmas():
+        async with engine.connect() as conn:
+            journal_mode = (await conn.execute(text("PRAGMA journal_mode"))).scalar()
+            synchronous = (await conn.execute(text("PRAGMA synchronous"))).scalar()
+            busy_timeout = (await conn.execute(text("PRAGMA busy_timeout"))).scalar()
+        await engine.dispose()
+        return journal_mode, synchronous, busy_timeout
+
+    journal_mode, synchronous, busy_timeout = asyncio.run(read_pragmas())
+    assert journal_mode == "wal"
+    assert synchronous == 1  # NORMAL
+    assert busy_timeout == 5000
+
+
+def _sqlite_sessionmaker(path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+    return engine, async_sessionmaker(bind=engine, expire_on_commit=False)
+
+
+async def _label(db):
+    return (await db.execute(text("SELECT name FROM node"))).scalar()
+
+
+def test_read_router_round_robin_and_fallback(tmp_path):
+    names = ["primary", "replica-a", "replica-b"]
+    engines, factories = zip(
+        *[_sqlite_sessionmaker(tmp_path / f"{n}.db") for n in names]
+    )
+    # A replica that cannot be opened (its directory does not exist)
+    dead_engine, dead_factory = _sqlite_sessionmaker(tmp_path / "missing" / "x.db")
+
+    async def run():
+        for engine, name in zip(engines, names):
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE node (name TEXT)"))
+                await conn.execute(text(f"INSERT INTO node VALUES ('{name}')"))
+
+        router = ReadRouter(factories[0], [factories[1], factories[2]])
+        seen = []
+        for _ in range(4):
+            db = await router.open_session()
+            seen.append(await _label(db))
+            await db.close()
+
+        fallback_router = ReadRouter(factories[0], [dead_factory])
+        db = await fallback_router.open_session()
+        fallback = await _label(db)
+        await db.close()
+
+        no_replicas = ReadRouter(factories[0], [])
+        db = await no_replicas.open_session()
+        primary_only = await _label(db)
+        await db.close()
+
+        for engine in (*engines, dead_engine):
+            await engine.dispose()
+        return seen, fallback, primary_only
+
+    seen, fallback, primary_only = asyncio.run(run())
+    assert seen == ["replica-a", "replica-b", "replica-a", "replica-b"]
+    assert fallback == "primary"
+    assert primary_only == "primary"
+
+
+def test_schema_revision_check(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'schema.db'}")
+    head = get_head_revisions()
+
+    async def run():
+        # Fresh database: no alembic_version table
+        with pytest.raises(SchemaOutOfDateError):
+            await check_schema_revision(engine, mode="strict")
+        current, _ = await check_schema_revision(engine, mode="warn")
+        assert current == set()
+
+        async with engine.begin() as conn:
+            await conn.execute(text("CREATE TABLE alembic_version (version_num TEXT)"))
+            for revision in head:
+                await conn.execute(
+                    text("INSERT INTO alembic_version VALUES (:rev)"), {"rev": revision}
+                )
+        current, expected = await check_schema_revision(engine, mode="strict")
+        await engine.dispose()
+        return current, expected
+
+    current, expected = asyncio.run(run())
+    assert current == expected == head
+
+
+def test_autogenerate_ignores_search_index(tmp_path):
+    # Schema as init_db.py creates it, including the FTS5 tables
+    engine = create_engine(f"sqlite:///{tmp_path / 'autogen.db'}")
+    Base.metadata.create_all(engine)
+    with engine.connect() as conn:
+        tables = conn.execute(text("SELECT name FROM sqlite_master")).scalars().all()
+        unfiltered = compare_metadata(MigrationContext.configure(conn), Base.metadata)
+        context = MigrationContext.configure(
+            conn, opts={"include_object": include_object}
+        )
+        diff = compare_metadata(context, Base.metadata)
+    engine.dispose()
+
+    assert "products_fts" in tables
+    # Without the filter the next autogenerate would drop the search index
+    assert {op[1].name for op in unfiltered if op[0] == "remove_table"} >= {
+        "products_fts",
+        "products_fts_data",
+    }
+    assert diff == []
+
+
+def test_normalize_statement_and_fingerprint():
+    a = "SELECT * FROM products WHERE id = 5 AND sku = 'A-1'"
+    b = "SELECT *  FROM products\n WHERE id = 42 AND sku = 'B''2'"
+    assert normalize_statement(a) == "SELECT * FROM products WHERE id = ? AND sku = ?"
+    assert fingerprint(a) == fingerprint(b)
+    assert normalize_statement("SELECT 1 FROM t WHERE id IN (?, ?, ?)") == (
+        "SELECT ? FROM t WHERE id IN (?+)"
+    )
+    assert fingerprint("SELECT 1 FROM t") != fingerprint("SELECT 1 FROM u")
+
+
+def test_slow_query_logging(tmp_path, caplog):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'log.db'}")
+    query_logger = register_query_logging(engine.sync_engine, slow_query_ms=0.0)
+
+    async def run(statement):
+        async with engine.connect() as conn:
+            await conn.execute(text(statement))
+
+    with caplog.at_level(logging.INFO, logger="app.db.queries"):
+        asyncio.run(run("SELECT 1"))
+        slow_records = [r for r in caplog.records if r.levelno == logging.WARNING]
+        assert slow_records
+        assert slow_records[-1].query["statement"] == "SELECT ?"
+        assert slow_records[-1].query["duration_ms"] >= 0
+
+        # Above the threshold and no sampling: nothing is logged
+        caplog.clear()
+        query_logger.slow_query_ms = 60_000
+        asyncio.run(run("SELECT 2"))
+        assert not caplog.records
+
+        # Sampled full logging
+        query_logger.sample_rate = 1.0
+        asyncio.run(run("SELECT 3"))
+        assert [r.levelno for r in caplog.records] == [logging.INFO]
+    asyncio.run(engine.dispose())
+
+
+def test_failed_statements_are_counted(tmp_path, caplog):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'failed.db'}")
+    register_query_logging(engine.sync_engine, slow_query_ms=0.0)
+    stats = RequestQueryStats()
+
+    async def run():
+        token = current_query_stats.set(stats)
+        try:
+            async with engine.begin() as conn:
+                await conn.execute(text("CREATE TABLE t (id INTEGER PRIMARY KEY)"))
+                await conn.execute(text("INSERT INTO t VALUES (1)"))
+            for _ in range(2):
+                async with engine.connect() as conn:
+                    with pytest.raises(IntegrityError):
+                        await conn.execute(text("INSERT INTO t VALUES (1)"))
+                    await conn.execute(text("SELECT id FROM t"))
+        finally:
+            current_query_stats.reset(token)
+        await engine.dispose()
+
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"):
+        asyncio.run(run())
+    # Both failed INSERTs are counted, and their timings do not leak into
+    # the statements that follow on the same pooled connection
+    assert stats.count == 6
+    assert stats.statements["INSERT INTO t VALUES (1)"] == 3
+    assert [r.query["failed"] for r in caplog.records].count(True) == 2
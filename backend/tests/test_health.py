@@ -5,6 +5,7 @@ Tests for health check endpoints.
 import pytest
 from fastapi.testclient import TestClient
 
+from app.core.config import settings
 from app.main import app
 
 client = TestClient(app)
@@ -33,3 +34,39 @@ async def test_cors_headers() -> None:
     """Test that CORS headers are present."""
     response = client.get("/api/v1/health")
     assert response.status_code == 200
+
+
+def test_db_pool_stats(client, internal_headers):
+    response = client.get("/api/v1/internal/db-pool", headers=internal_headers)
+    assert response.status_code == 200
+    primary = response.json()["primary"]
+    assert primary["pool_class"] == "InstrumentedQueuePool"
+    assert primary["checkouts"] >= primary["checkins"]
+    assert primary["checked_out"] >= 0
+    assert "overflow" in primary
+    assert "wait_ms_max" in primary
+
+
+def test_startup_stats(client, internal_headers):
+    response = client.get("/api/v1/internal/startup", headers=internal_headers)
+    assert response.status_code == 200
+    data = response.json()
+    assert data["total_seconds"] >= data["lifespan_seconds"]
+    assert data["total_seconds"] <= data["budget_seconds"]
+
+
+def test_internal_endpoints_require_token(client, monkeypatch):
+    for path in ("db-pool", "startup", "cache"):
+        response = client.get(f"/api/v1/internal/{path}")
+        assert response.status_code == 401
+        response = client.get(
+            f"/api/v1/internal/{path}", headers={"Authorization": "Bearer wrong"}
+        )
+        assert response.status_code == 401
+
+    # Without a configured token the endpoints do not exist
+    monkeypatch.setattr(settings, "internal_api_token", "")
+    response = client.get(
+        "/api/v1/internal/cache", headers={"Authorization": "Bearer "}
+    )
+    assert response.status_code == 404
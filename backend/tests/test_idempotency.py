@@ -0,0 +1,197 @@
+"""
+Tests for Idempotency-Key handling on order and payment-intent creation.
+"""
+
+import asyncio
+import threading
+import time
+import uuid
+from datetime import timedelta
+from types import SimpleNamespace
+
+import httpx
+import pytest
+
+from app.core.security import create_access_token
+from app.main import app
+from app.services.idempotency_service import IdempotencyService
+from app.services.payment_service import PaymentService
+
+
+@pytest.fixture
+def stripe_calls(monkeypatch):
+    """Replace Stripe with a slow fake and record every PaymentIntent."""
+    calls = []
+    lock = threading.Lock()
+
+    def create_payment_intent(amount, currency="usd", metadata=None):
+        time.sleep(0.05)
+        with lock:
+            calls.append(amount)
+            return SimpleNamespace(client_secret=f"secret_{len(calls)}")
+
+    monkeypatch.setattr(PaymentService, "create_payment_intent", create_payment_intent)
+    return calls
+
+
+def order_payload(product_id, quantity=1):
+    return {
+        "customer_email": "retry@example.com",
+        "customer_name": "Retry",
+        "items": [{"product_id": product_id, "quantity": quantity}],
+    }
+
+
+@pytest.fixture
+def pending_order(client):
+    """An unpaid order to create PaymentIntents for."""
+    sku = f"IDEM-PAY-{uuid.uuid4()}"
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": f"Idempotent {sku}", "price": 6.0, "stock": 5, "sku": sku},
+    ).json()["id"]
+    return client.post("/api/v1/orders/", json=order_payload(product_id)).json()
+
+
+def test_order_retry_is_replayed(client):
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Idempotent Item", "price": 4.0, "stock": 5, "sku": "IDEM-1"},
+    ).json()["id"]
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+
+    first = client.post(
+        "/api/v1/orders/", json=order_payload(product_id), headers=headers
+    )
+    assert first.status_code == 201
+    assert "idempotent-replayed" not in first.headers
+
+    retry = client.post(
+        "/api/v1/orders/", json=order_payload(product_id), headers=headers
+    )
+    assert retry.status_code == 201
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    # Stock was reserved once
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock"] == 4
+
+    # Same key, different request
+    response = client.post(
+        "/api/v1/orders/", json=order_payload(product_id, 2), headers=headers
+    )
+    assert response.status_code == 422
+
+    # A failed request is not stored; the key can be retried once it succeeds
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    response = client.post(
+        "/api/v1/orders/", json=order_payload(product_id, 10), headers=headers
+    )
+    assert response.status_code == 409
+    client.put(f"/api/v1/products/{product_id}", json={"stock": 20})
+    response = client.post(
+        "/api/v1/orders/", json=order_payload(product_id, 10), headers=headers
+    )
+    assert response.status_code == 201
+    assert "idempotent-replayed" not in response.headers
+
+
+def test_retry_with_refreshed_token_is_replayed(client, stripe_calls, pending_order):
+    user_ids = [
+        client.post(
+            "/api/v1/auth/signup",
+            json={"email": email, "password": "Idem-pass1"},
+        ).json()["id"]
+        for email in ("idem-a@example.com", "idem-b@example.com")
+    ]
+
+    def headers(user_id, minutes):
+        token = create_access_token(
+            {"sub": str(user_id)}, expires_delta=timedelta(minutes=minutes)
+        )
+        return {"Idempotency-Key": "intent-user", "Authorization": f"Bearer {token}"}
+
+    intent = {"order_id": pending_order["id"]}
+
+    first = client.post(
+        "/api/v1/payments/create-intent",
+        json=intent,
+        headers=headers(user_ids[0], 30),
+    )
+    refreshed = client.post(
+        "/api/v1/payments/create-intent",
+        json=intent,
+        headers=headers(user_ids[0], 60),
+    )
+    assert refreshed.status_code == 200
+    assert refreshed.headers["idempotent-replayed"] == "true"
+    assert refreshed.json() == first.json()
+
+    # Another user cannot reuse the key
+    other = client.post(
+        "/api/v1/payments/create-intent",
+        json=intent,
+        headers=headers(user_ids[1], 30),
+    )
+    assert other.status_code == 422
+    assert stripe_calls == [pending_order["total_amount"]]
+
+
+def test_order_response_is_stored_with_the_order(client, monkeypatch):
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Idempotent Crash", "price": 4.0, "stock": 5, "sku": "IDEM-2"},
+    ).json()["id"]
+
+    # Storing the response after the order's commit would fail here and
+    # release the key, letting the retry place a second order
+    async def crash(*args):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(IdempotencyService, "complete", crash)
+    headers = {"Idempotency-Key": str(uuid.uuid4())}
+    first = client.post(
+        "/api/v1/orders/", json=order_payload(product_id), headers=headers
+    )
+    retry = client.post(
+        "/api/v1/orders/", json=order_payload(product_id), headers=headers
+    )
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert retry.json() == first.json()
+    assert client.get(f"/api/v1/products/{product_id}").json()["stock"] == 4
+
+
+def test_payment_intent_retry_calls_stripe_once(client, stripe_calls, pending_order):
+    headers = {"Idempotency-Key": "intent-1"}
+    intent = {"order_id": pending_order["id"]}
+    first = client.post("/api/v1/payments/create-intent", json=intent, headers=headers)
+    retry = client.post("/api/v1/payments/create-intent", json=intent, headers=headers)
+    assert first.status_code == retry.status_code == 200
+    assert retry.json() == first.json() == {"clientSecret": "secret_1"}
+    assert stripe_calls == [pending_order["total_amount"]]
+
+    # Requests without a key are not deduplicated
+    client.post("/api/v1/payments/create-intent", json=intent)
+    client.post("/api/v1/payments/create-intent", json=intent)
+    assert len(stripe_calls) == 3
+
+
+def test_concurrent_duplicates_run_once(client, stripe_calls, pending_order):
+    async def send_all():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://t") as c:
+            return await asyncio.gather(
+                *(
+                    c.post(
+                        "/api/v1/payments/create-intent",
+                        json={"order_id": pending_order["id"]},
+                        headers={"Idempotency-Key": "intent-concurrent"},
+                    )
+                    for _ in range(8)
+                )
+            )
+
+    responses = client.portal.call(send_all)
+    assert [r.status_code for r in responses] == [200] * 8
+    assert {r.json()["clientSecret"] for r in responses} == {"secret_1"}
+    assert sum(r.headers.get("idempotent-replayed") == "true" for r in responses) == 7
+    assert stripe_calls == [pending_order["total_amount"]]
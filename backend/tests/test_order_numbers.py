@@ -0,0 +1,110 @@
+"""
+Tests for time-sortable order numbers.
+"""
+
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+import pytest
+
+from app.core.order_numbers import (
+    MAX_SEQUENCE,
+    OrderNumberGenerator,
+    order_number_at,
+)
+
+PER_PROCESS = 20_000
+
+
+class FakeClock:
+    def __init__(self, now: float) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def generate_batch(worker_id, start):
+    """Generate PER_PROCESS numbers in a separate process."""
+    generator = OrderNumberGenerator(worker_id)
+    start.wait()
+    return [generator.generate() for _ in range(PER_PROCESS)]
+
+
+def test_unique_across_processes():
+    ctx = multiprocessing.get_context("spawn")
+    with ctx.Manager() as manager:
+        start = manager.Event()
+        with ctx.Pool(4) as pool:
+            batches = [
+                pool.apply_async(generate_batch, (worker_id, start))
+                for worker_id in range(4)
+            ]
+            start.set()
+            results = [batch.get(timeout=60) for batch in batches]
+
+    numbers = [number for batch in results for number in batch]
+    assert len(set(numbers)) == len(numbers)
+    for batch in results:
+        assert batch == sorted(batch)
+        assert len(set(batch)) == len(batch)
+
+
+def test_unique_across_threads():
+    generator = OrderNumberGenerator(1)
+    with ThreadPoolExecutor(8) as pool:
+        batches = list(
+            pool.map(lambda _: [generator.generate() for _ in range(2000)], range(8))
+        )
+    numbers = [number for batch in batches for number in batch]
+    assert len(set(numbers)) == len(numbers)
+    for batch in batches:
+        assert batch == sorted(batch)
+
+
+def test_monotonic_when_clock_stalls_or_steps_back():
+    clock = FakeClock(1_790_000_000.0)
+    generator = OrderNumberGenerator(7, clock=clock)
+    numbers = [generator.generate() for _ in range(MAX_SEQUENCE + 10)]
+    clock.now -= 5
+    numbers += [generator.generate() for _ in range(10)]
+    assert numbers == sorted(numbers)
+    assert len(set(numbers)) == len(numbers)
+
+
+def test_format_and_range_bounds():
+    clock = FakeClock(datetime(2026, 10, 18, 12).timestamp())
+    generator = OrderNumberGenerator(3, clock=clock)
+    number = generator.generate()
+    assert number.startswith(f"ORD-{datetime.utcfromtimestamp(clock.now):%Y%m%d}-")
+    assert len(number) == 26
+
+    start = datetime.utcfromtimestamp(clock.now)
+    assert order_number_at(start) <= number
+    clock.now += 0.001
+    later = generator.generate()
+    assert number < later
+    assert later >= order_number_at(datetime.utcfromtimestamp(clock.now))
+
+
+def test_worker_id_is_validated():
+    for worker_id in (-1, 1024):
+        with pytest.raises(ValueError):
+            OrderNumberGenerator(worker_id)
+
+
+def test_random_worker_id_is_redrawn():
+    generator = OrderNumberGenerator()
+    worker_id = generator.worker_id
+    assert 0 <= worker_id <= 1023
+    assert generator.worker_id == worker_id
+    ids = {worker_id}
+    for _ in range(20):
+        generator.reassign()
+        ids.add(generator.worker_id)
+    assert len(ids) > 1
+
+    configured = OrderNumberGenerator(7)
+    configured.reassign()
+    assert configured.worker_id == 7
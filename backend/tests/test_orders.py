@@ -3,6 +3,11 @@ Tests for order endpoints.
 """
 import uuid
 
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.services.order_service import OrderService
+
 
 def create_test_order(client, sku_suffix=""):
     # First create a product with unique SKU
@@ -83,3 +88,172 @@ def test_update_order_status(client):
     # Invalid status
     response = client.post(f"/api/v1/orders/{order_id}/status/invalid_status")
     assert response.status_code == 400
+
+
+def test_order_list_query_count_is_constant(client, query_count):
+    email = f"bulk-{uuid.uuid4().hex[:8]}@example.com"
+    sku = f"BULK-SKU-{uuid.uuid4()}"
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": f"Bulk Product {sku}", "price": 5.0, "stock": 100, "sku": sku},
+    ).json()["id"]
+    for _ in range(6):
+        client.post(
+            "/api/v1/orders/",
+            json={
+                "customer_email": email,
+                "customer_name": "Bulk Buyer",
+                "total_amount": 10.0,
+                "items": [
+                    {"product_id": product_id, "quantity": 1, "price_at_purchase": 5.0},
+                    {"product_id": product_id, "quantity": 1, "price_at_purchase": 5.0},
+                ],
+            },
+        )
+
+    # Orders plus one batched load of their items, whatever the page size
+    for path in ("/api/v1/orders/", f"/api/v1/orders/customer/{email}"):
+        small = client.get(f"{path}?limit=1")
+        large = client.get(f"{path}?limit=100")
+        assert len(large.json()) > len(small.json())
+        assert all(len(o["items"]) >= 1 for o in large.json())
+        assert query_count(small) == query_count(large) == 2
+
+
+def test_list_orders_cursor_pagination(client):
+    # Orders created in the same second share created_at; the id tiebreak
+    # must still yield every order exactly once
+    created = [create_test_order(client).json()["id"] for _ in range(5)]
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/orders/", params=params)
+        assert response.status_code == 200
+        seen.extend(o["id"] for o in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert set(created) <= set(seen)
+    assert len(seen) == len(set(seen))
+
+
+def test_list_orders_invalid_cursor(client):
+    response = client.get("/api/v1/orders/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_order_priced_from_catalog(client, query_count):
+    suffix = uuid.uuid4().hex[:8]
+    products = [
+        client.post(
+            "/api/v1/products/",
+            json={
+                "name": f"Priced {suffix} {i}",
+                "price": 2.5 + i,
+                "stock": 10,
+                "sku": f"PRICED-{suffix}-{i}",
+            },
+        ).json()
+        for i in range(40)
+    ]
+
+    def place(lines):
+        return client.post(
+            "/api/v1/orders/",
+            json={
+                "customer_email": "priced@example.com",
+                "customer_name": "Priced",
+                "total_amount": 0.01,
+                "items": [
+                    {"product_id": p["id"], "quantity": 2, "price_at_purchase": 0.01}
+                    for p in lines
+                ],
+            },
+        )
+
+    # Client prices and totals are ignored
+    single = place(products[:1])
+    assert single.status_code == 201
+    assert single.json()["items"][0]["price_at_purchase"] == 2.5
+    assert single.json()["total_amount"] == OrderService.calculate_total(5.0)
+
+    bulk = place(products)
+    assert bulk.status_code == 201
+    subtotal = sum(p["price"] * 2 for p in products)
+    assert bulk.json()["total_amount"] == OrderService.calculate_total(subtotal)
+    assert len(bulk.json()["items"]) == 40
+    # One price lookup, one stock update and one bulk item insert, however
+    # many lines the order has
+    assert query_count(bulk) == query_count(single)
+
+
+def test_process_payment(client, query_count):
+    order_id = create_test_order(client).json()["id"]
+    payment_id = f"pi_{uuid.uuid4().hex}"
+
+    response = client.post(
+        f"/api/v1/orders/{order_id}/process-payment",
+        json={"stripe_payment_id": payment_id},
+    )
+    assert response.status_code == 200
+    assert response.json()["payment_id"] == payment_id
+    # Status and payment ID are written by a single UPDATE, committed with
+    # its outbox event
+    assert query_count(response) == 2
+    order = client.get(f"/api/v1/orders/{order_id}").json()
+    assert order["status"] == "paid"
+    assert order["stripe_payment_id"] == payment_id
+
+    # Already paid
+    response = client.post(
+        f"/api/v1/orders/{order_id}/process-payment",
+        json={"stripe_payment_id": f"pi_{uuid.uuid4().hex}"},
+    )
+    assert response.status_code == 400
+    assert client.get(f"/api/v1/orders/{order_id}").json()["stripe_payment_id"] == (
+        payment_id
+    )
+
+    response = client.post(
+        "/api/v1/orders/999999/process-payment", json={"stripe_payment_id": "pi_x"}
+    )
+    assert response.status_code == 404
+
+
+def test_duplicate_order_number_is_retried(client, monkeypatch):
+    taken = create_test_order(client).json()
+    product_id = taken["items"][0]["product_id"]
+    stock = client.get(f"/api/v1/products/{product_id}").json()["stock"]
+    numbers = iter([taken["order_number"], "ORD-20990101-0000000000000"])
+    monkeypatch.setattr(OrderService, "generate_order_number", lambda: next(numbers))
+
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "retry@example.com",
+            "customer_name": "Retry",
+            "items": [{"product_id": product_id, "quantity": 3}],
+        },
+    )
+    assert response.status_code == 201
+    assert response.json()["order_number"] == "ORD-20990101-0000000000000"
+    # The first attempt's stock reservation was rolled back
+    product = client.get(f"/api/v1/products/{product_id}").json()
+    assert product["stock"] == stock - 3
+
+    # A second duplicate is not retried again
+    numbers = iter([taken["order_number"]] * 2)
+    with pytest.raises(IntegrityError, match="order_number"):
+        client.post(
+            "/api/v1/orders/",
+            json={
+                "customer_email": "retry@example.com",
+                "customer_name": "Retry",
+                "items": [{"product_id": product_id, "quantity": 1}],
+            },
+        )
@@ -0,0 +1,228 @@
+"""
+Tests for the transactional outbox and its background worker.
+"""
+
+import asyncio
+import time
+from datetime import timedelta
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.config import settings
+from app.core.database import Base, create_database_engine, get_db
+from app.core.security import verify_password_reset_token
+from app.main import app
+from app.models.outbox import OutboxEvent
+from app.models.types import utcnow
+from app.services.outbox_service import (
+    ORDER_CREATED,
+    ORDER_STATUS_CHANGED,
+    PASSWORD_RESET_REQUESTED,
+    OutboxService,
+)
+from app.services import outbox_worker
+from app.services.outbox_worker import OutboxWorker
+from tests.conftest import TestingSessionLocal
+
+
+def outbox_events(client, sessions=TestingSessionLocal):
+    async def load():
+        async with sessions() as db:
+            result = await db.execute(select(OutboxEvent).order_by(OutboxEvent.id))
+            return list(result.scalars())
+
+    return client.portal.call(load)
+
+
+def make_due(client):
+    async def reset():
+        async with TestingSessionLocal() as db:
+            await db.execute(update(OutboxEvent).values(available_at=utcnow()))
+            await db.commit()
+
+    client.portal.call(reset)
+
+
+def clear_outbox(client):
+    async def clear():
+        async with TestingSessionLocal() as db:
+            await db.execute(OutboxEvent.__table__.delete())
+            await db.commit()
+
+    client.portal.call(clear)
+
+
+def place_order(client, sku, stock=10, quantity=1):
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": f"Outbox {sku}", "price": 10.0, "stock": stock, "sku": sku},
+    ).json()["id"]
+    return client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "outbox@example.com",
+            "customer_name": "Outbox",
+            "items": [{"product_id": product_id, "quantity": quantity}],
+        },
+    )
+
+
+def test_events_are_committed_with_their_change(client):
+    clear_outbox(client)
+    order = place_order(client, "OUTBOX-1").json()
+    client.post(f"/api/v1/orders/{order['id']}/status/shipped")
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "outbox@example.com", "password": "Outbox-pass1"},
+    )
+    client.post("/api/v1/auth/password-recovery/outbox@example.com")
+    client.post("/api/v1/auth/password-recovery/nobody@example.com")
+
+    events = outbox_events(client)
+    assert [event.topic for event in events] == [
+        ORDER_CREATED,
+        ORDER_STATUS_CHANGED,
+        PASSWORD_RESET_REQUESTED,
+    ]
+    assert events[0].payload == {
+        "order_id": order["id"],
+        "order_number": order["order_number"],
+        "customer_email": "outbox@example.com",
+        "total_amount": order["total_amount"],
+    }
+    assert events[1].payload["status"] == "shipped"
+    # No live reset token is stored; the worker mints one when sending
+    assert events[2].payload == {"email": "outbox@example.com"}
+
+    # A rejected order records nothing
+    assert place_order(client, "OUTBOX-2", stock=1, quantity=5).status_code == 409
+    assert len(outbox_events(client)) == 3
+
+
+def test_worker_delivers_and_retries(client, monkeypatch):
+    clear_outbox(client)
+    place_order(client, "OUTBOX-3")
+    place_order(client, "OUTBOX-4")
+    calls = []
+
+    async def flaky(payload):
+        calls.append(payload["order_number"])
+        if len(calls) == 1:
+            raise ConnectionError("SMTP unavailable")
+
+    worker = OutboxWorker(TestingSessionLocal, handlers={ORDER_CREATED: flaky})
+    assert client.portal.call(worker.run_once) == 2
+    events = outbox_events(client)
+    assert len(events) == 1
+    assert events[0].attempts == 1
+    assert "SMTP unavailable" in events[0].last_error
+    # Backed off, so not due yet
+    assert events[0].available_at > utcnow() + timedelta(seconds=1)
+    assert client.portal.call(worker.run_once) == 0
+
+    make_due(client)
+    assert client.portal.call(worker.run_once) == 1
+    assert outbox_events(client) == []
+    assert len(calls) == 3
+    assert calls[2] == calls[0]
+
+    # An event that keeps failing is kept, but no longer retried
+    monkeypatch.setattr(settings, "outbox_max_attempts", 2)
+    place_order(client, "OUTBOX-5")
+    worker = OutboxWorker(TestingSessionLocal, handlers={})
+    for _ in range(2):
+        assert client.portal.call(worker.run_once) == 1
+        make_due(client)
+    (event,) = outbox_events(client)
+    assert event.attempts == 2
+    assert event.last_error == f"No handler for topic {ORDER_CREATED!r}"
+    assert event.failed_at is not None
+    assert client.portal.call(worker.run_once) == 0
+
+    # Given-up events are purged once the retention period has passed
+    async def purge():
+        async with TestingSessionLocal() as db:
+            return await OutboxService.purge_failed(db, force=True)
+
+    assert client.portal.call(purge) == 0
+    monkeypatch.setattr(settings, "outbox_failed_retention_seconds", 0)
+    assert client.portal.call(purge) == 1
+    assert outbox_events(client) == []
+
+
+def test_password_reset_token_is_minted_on_delivery(client, monkeypatch):
+    clear_outbox(client)
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": "mint@example.com", "password": "Mint-pass1"},
+    )
+    client.post("/api/v1/auth/password-recovery/mint@example.com")
+    sent = []
+    monkeypatch.setattr(
+        outbox_worker,
+        "send_password_reset_email",
+        lambda email, token: sent.append((email, token)),
+    )
+
+    worker = OutboxWorker(TestingSessionLocal)
+    assert client.portal.call(worker.run_once) == 1
+    ((email, token),) = sent
+    assert email == "mint@example.com"
+    assert verify_password_reset_token(token) == "mint@example.com"
+
+
+@pytest.fixture
+def file_sessions(client, tmp_path, monkeypatch):
+    """
+    Serve requests from a file database, as in production. The shared
+    in-memory connection cannot run a worker and requests side by side.
+    """
+    engine = create_database_engine(f"sqlite:///{tmp_path}/outbox.db")
+    sessions = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+
+    async def override_get_db():
+        async with sessions() as db:
+            yield db
+
+    client.portal.call(setup)
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    yield sessions
+    client.portal.call(engine.dispose)
+
+
+def test_request_latency_independent_of_handler_cost(client, file_sessions):
+    release = asyncio.Event()
+    delivered = []
+
+    async def slow_email(payload):
+        await release.wait()
+        delivered.append(payload["order_number"])
+
+    worker = OutboxWorker(
+        file_sessions, handlers={ORDER_CREATED: slow_email}, poll_interval=0.01
+    )
+    client.portal.call(worker.start)
+    try:
+        started = time.perf_counter()
+        order = place_order(client, "OUTBOX-6").json()
+        assert time.perf_counter() - started < 1.0
+        # The worker has picked the event up and is still sending it
+        deadline = time.monotonic() + 5
+        while outbox_events(client, file_sessions)[0].attempts == 0:
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert delivered == []
+
+        client.portal.call(release.set)
+        while outbox_events(client, file_sessions):
+            assert time.monotonic() < deadline
+            time.sleep(0.01)
+        assert delivered == [order["order_number"]]
+    finally:
+        client.portal.call(worker.stop)
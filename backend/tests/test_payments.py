@@ -1,9 +1,29 @@
+import uuid
+
 import pytest
 from unittest.mock import MagicMock, patch
 from fastapi.testclient import TestClient
 
 
+def place_order(client: TestClient, price: float = 19.99, quantity: int = 1) -> dict:
+    sku = f"PAY-{uuid.uuid4()}"
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": f"Payment {sku}", "price": price, "stock": 10, "sku": sku},
+    ).json()["id"]
+    return client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "pay@example.com",
+            "customer_name": "Pay",
+            "total_amount": 1.0,
+            "items": [{"product_id": product_id, "quantity": quantity}],
+        },
+    ).json()
+
+
 def test_create_payment_intent(client: TestClient):
+    order = place_order(client, price=50.0, quantity=2)
     # Mock stripe.PaymentIntent.create
     with patch("stripe.PaymentIntent.create") as mock_create:
         # Setup mock return value
@@ -13,22 +33,37 @@ def test_create_payment_intent(client: TestClient):
 
         response = client.post(
             "/api/v1/payments/create-intent",
-            json={"amount": 39.99, "currency": "usd"},
+            json={"order_id": order["id"], "currency": "usd"},
         )
 
         assert response.status_code == 200
         assert response.json()["clientSecret"] == "pi_123_secret_456"
 
-        # Verify stripe was called with cents
+        # The server-computed order total is charged, in cents, not the
+        # total the client sent
+        assert order["total_amount"] == 117.99
         mock_create.assert_called_once()
         call_kwargs = mock_create.call_args[1]
-        assert call_kwargs["amount"] == 3999
+        assert call_kwargs["amount"] == 11799
         assert call_kwargs["currency"] == "usd"
+        assert call_kwargs["metadata"] == {"order_id": str(order["id"])}
+
+
+def test_create_payment_intent_requires_pending_order(client: TestClient):
+    response = client.post("/api/v1/payments/create-intent", json={"order_id": 999999})
+    assert response.status_code == 404
+
+    order = place_order(client)
+    client.post(f"/api/v1/orders/{order['id']}/status/cancelled")
+    response = client.post(
+        "/api/v1/payments/create-intent", json={"order_id": order["id"]}
+    )
+    assert response.status_code == 409
 
 
-def test_create_payment_intent_invalid_amount(client: TestClient):
+def test_create_payment_intent_amount_not_accepted(client: TestClient):
     response = client.post(
         "/api/v1/payments/create-intent",
-        json={"amount": -10, "currency": "usd"},
+        json={"amount": 39.99, "currency": "usd"},
     )
     assert response.status_code == 422
@@ -0,0 +1,111 @@
+"""
+Tests for product image upload and variants.
+"""
+
+import io
+import struct
+import zlib
+
+import pytest
+from PIL import Image
+
+from app.core.config import settings
+from app.services.image_processing import ImageTooLargeError, verify_image
+
+
+def make_png(width=1200, height=800) -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGBA", (width, height), (200, 30, 30, 128)).save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+def test_upload_image_builds_variants(client):
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Image Product", "price": 5.0, "sku": "IMG-001"},
+    ).json()["id"]
+
+    response = client.post(
+        f"/api/v1/products/{product_id}/image",
+        files={"file": ("photo.png", make_png(), "image/png")},
+    )
+    assert response.status_code == 202
+    assert response.json()["image_url"].endswith("/original.png")
+
+    # Background tasks have run by the time TestClient returns
+    variants = client.get(f"/api/v1/products/{product_id}").json()["image_variants"]
+    assert set(variants) == {
+        "original",
+        "thumbnail",
+        "thumbnail_webp",
+        "medium",
+        "medium_webp",
+    }
+
+    thumbnail = client.get(variants["thumbnail_webp"])
+    assert thumbnail.status_code == 200
+    assert thumbnail.headers["content-type"] == "image/webp"
+    assert "immutable" in thumbnail.headers["cache-control"]
+    assert max(Image.open(io.BytesIO(thumbnail.content)).size) == 320
+
+    medium = Image.open(io.BytesIO(client.get(variants["medium"]).content))
+    assert medium.format == "JPEG"
+    assert medium.size == (960, 640)
+
+
+def test_upload_rejects_non_images(client):
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Not Image Product", "price": 5.0, "sku": "IMG-002"},
+    ).json()["id"]
+
+    response = client.post(
+        f"/api/v1/products/{product_id}/image",
+        files={"file": ("photo.png", b"<html>nope</html>", "image/png")},
+    )
+    assert response.status_code == 400
+    assert (
+        client.post(
+            "/api/v1/products/999999/image",
+            files={"file": ("photo.png", make_png(10, 10), "image/png")},
+        ).status_code
+        == 404
+    )
+
+
+def png_header(width: int, height: int) -> bytes:
+    """A PNG that declares the given size but carries almost no data."""
+
+    def chunk(kind: bytes, body: bytes) -> bytes:
+        crc = zlib.crc32(kind + body)
+        return struct.pack(">I", len(body)) + kind + body + struct.pack(">I", crc)
+
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, 2, 0, 0, 0)
+    return (
+        b"\x89PNG\r\n\x1a\n"
+        + chunk(b"IHDR", ihdr)
+        + chunk(b"IDAT", zlib.compress(b""))
+        + chunk(b"IEND", b"")
+    )
+
+
+def test_oversized_images_rejected_before_decoding(client, monkeypatch):
+    # Far beyond Pillow's own decompression-bomb limit, and merely over ours
+    with pytest.raises(ImageTooLargeError):
+        verify_image(png_header(100_000, 100_000), settings.image_max_pixels)
+    with pytest.raises(ImageTooLargeError):
+        verify_image(png_header(8000, 6000), settings.image_max_pixels)
+    verify_image(png_header(4000, 3000), settings.image_max_pixels)
+
+    product_id = client.post(
+        "/api/v1/products/",
+        json={"name": "Huge Image Product", "price": 5.0, "sku": "IMG-003"},
+    ).json()["id"]
+    monkeypatch.setattr(settings, "image_max_pixels", 100 * 100)
+    response = client.post(
+        f"/api/v1/products/{product_id}/image",
+        files={"file": ("photo.png", make_png(101, 100), "image/png")},
+    )
+    assert response.status_code == 400
+    assert "pixels" in response.json()["detail"]
+    assert client.get(f"/api/v1/products/{product_id}").json()["image_url"] is None
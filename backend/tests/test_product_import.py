@@ -0,0 +1,115 @@
+"""
+Tests for bulk product import.
+"""
+
+import json
+
+
+def upload(client, filename, content, **params):
+    return client.post(
+        "/api/v1/products/import",
+        params=params,
+        files={"file": (filename, content.encode(), "text/plain")},
+    )
+
+
+def test_import_csv_upserts_and_reports_errors(client):
+    client.post(
+        "/api/v1/products/",
+        json={"name": "Import Existing", "price": 1.0, "sku": "IMP-EXISTING"},
+    )
+    csv_data = "\n".join(
+        [
+            "sku,name,description,price,stock",
+            "IMP-1,Import One,,10.00,5",
+            'IMP-2,Import Two,"Multi-line\ndescription",12.50,',
+            "IMP-EXISTING,Import Existing Renamed,,2.00,7",
+            "IMP-BAD,Import Bad,,0,1",  # price must be > 0
+            "IMP-DUP-NAME,Import One,,3.00,1",  # name already taken
+            "IMP-3,Import Three,,4.00,1",
+        ]
+    )
+
+    response = upload(client, "catalog.csv", csv_data, batch_size=2)
+    assert response.status_code == 200
+    report = response.json()
+    assert report["processed"] == 6
+    assert report["created"] == 3
+    assert report["updated"] == 1
+    assert report["failed"] == 2
+    assert {(e["line"], e["sku"]) for e in report["errors"]} == {
+        (6, "IMP-BAD"),
+        (7, "IMP-DUP-NAME"),
+    }
+
+    products = {
+        p["sku"]: p
+        for p in client.get("/api/v1/products/", params={"limit": 100}).json()
+    }
+    assert products["IMP-EXISTING"]["name"] == "Import Existing Renamed"
+    assert products["IMP-EXISTING"]["stock"] == 7
+    assert products["IMP-2"]["description"] == "Multi-line\ndescription"
+    assert products["IMP-2"]["stock"] == 0
+    assert "IMP-DUP-NAME" not in products
+
+
+def test_import_jsonl(client):
+    lines = [
+        json.dumps({"sku": "JSONL-1", "name": "JSONL One", "price": 5.0}),
+        "{not json",
+        "",
+        json.dumps({"sku": "JSONL-2", "name": "JSONL Two", "price": 6.0}),
+    ]
+    response = upload(client, "catalog.jsonl", "\n".join(lines))
+    report = response.json()
+    assert report["created"] == 2
+    assert report["failed"] == 1
+    assert report["errors"][0]["line"] == 2
+
+
+def test_import_requires_known_format(client):
+    response = upload(client, "catalog.txt", "sku,name,price\n")
+    assert response.status_code == 400
+
+
+def test_partial_import_keeps_unsupplied_fields(client):
+    kept = client.post(
+        "/api/v1/products/",
+        json={
+            "name": "Partial Kept",
+            "description": "Keep me",
+            "price": 5.0,
+            "stock": 99,
+            "sku": "PARTIAL-1",
+            "image_url": "https://example.com/kept.png",
+        },
+    ).json()
+    deleted = client.post(
+        "/api/v1/products/",
+        json={"name": "Partial Deleted", "price": 5.0, "stock": 3, "sku": "PARTIAL-2"},
+    ).json()
+    client.delete(f"/api/v1/products/{deleted['id']}")
+
+    csv_data = "\n".join(
+        [
+            "sku,name,price,stock",
+            "PARTIAL-1,Partial Kept,6.50,",  # empty cell: stock not supplied
+            "PARTIAL-2,Partial Deleted,7.00,4",
+            "PARTIAL-3,Partial New,8.00,",
+        ]
+    )
+    report = upload(client, "prices.csv", csv_data).json()
+    assert (report["created"], report["updated"], report["failed"]) == (1, 2, 0)
+
+    product = client.get(f"/api/v1/products/{kept['id']}").json()
+    assert product["price"] == 6.5
+    assert product["stock"] == 99
+    assert product["description"] == "Keep me"
+    assert product["image_url"] == "https://example.com/kept.png"
+    product = client.get(f"/api/v1/products/{deleted['id']}").json()
+    assert product["stock"] == 4
+    assert product["is_active"] is False
+    products = client.get("/api/v1/products/", params={"limit": 100}).json()
+    assert "PARTIAL-2" not in {p["sku"] for p in products}
+    new = next(p for p in products if p["sku"] == "PARTIAL-3")
+    assert (new["stock"], new["is_active"]) == (0, True)
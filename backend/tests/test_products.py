@@ -2,6 +2,10 @@
 Tests for product endpoints.
 """
 
+import csv
+import io
+import json
+
 
 def test_create_product(client):
     response = client.post(
@@ -130,3 +134,207 @@ def test_check_stock(client):
     )
     assert response.status_code == 200
     assert response.json()["has_sufficient_stock"] is False
+
+
+def test_read_products_cursor_pagination(client):
+    created = []
+    for i in range(5):
+        response = client.post(
+            "/api/v1/products/",
+            json={"name": f"Page Product {i}", "price": 1.0, "sku": f"PAGE-{i}"},
+        )
+        created.append(response.json()["id"])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 3}
+        if cursor:
+            params["cursor"] = cursor
+        response = client.get("/api/v1/products/", params=params)
+        assert response.status_code == 200
+        seen.extend(p["id"] for p in response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+
+    assert seen == sorted(set(seen))
+    assert set(created) <= set(seen)
+
+    bad = client.get("/api/v1/products/", params={"cursor": "e30"})
+    assert bad.status_code == 400
+
+
+def test_product_etag_and_not_modified(client):
+    response = client.post(
+        "/api/v1/products/",
+        json={"name": "ETag Product", "price": 3.0, "sku": "ETAG-001"},
+    )
+    product_id = response.json()["id"]
+
+    first = client.get(f"/api/v1/products/{product_id}")
+    etag = first.headers["ETag"]
+    assert first.headers["Cache-Control"] == "public, no-cache"
+
+    not_modified = client.get(
+        f"/api/v1/products/{product_id}", headers={"If-None-Match": etag}
+    )
+    assert not_modified.status_code == 304
+    assert not_modified.content == b""
+    assert not_modified.headers["ETag"] == etag
+
+    # Weak form from a compressing proxy still validates
+    weak = client.get(
+        f"/api/v1/products/{product_id}", headers={"If-None-Match": f"W/{etag}"}
+    )
+    assert weak.status_code == 304
+
+    client.put(f"/api/v1/products/{product_id}", json={"price": 4.0})
+    changed = client.get(
+        f"/api/v1/products/{product_id}", headers={"If-None-Match": etag}
+    )
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+
+    listing = client.get("/api/v1/products/")
+    assert (
+        client.get(
+            "/api/v1/products/", headers={"If-None-Match": listing.headers["ETag"]}
+        ).status_code
+        == 304
+    )
+
+
+def test_search_products(client):
+    for name, description, sku in [
+        ("Benchy Boat", "Calibration print", "SEARCH-BENCHY"),
+        ("Planter", "Self-watering planter shaped like a boat", "SEARCH-PLANTER"),
+        ("Boat Hook", None, "SEARCH-HOOK"),
+    ]:
+        client.post(
+            "/api/v1/products/",
+            json={"name": name, "description": description, "price": 2.0, "sku": sku},
+        )
+
+    response = client.get("/api/v1/products/search", params={"q": "boat"})
+    assert response.status_code == 200
+    names = [p["name"] for p in response.json()]
+    # Name matches rank above a description-only match
+    assert set(names[:2]) == {"Benchy Boat", "Boat Hook"}
+    assert names[2] == "Planter"
+
+    # Prefix match on SKU; operator characters in the query are ignored
+    response = client.get("/api/v1/products/search", params={"q": 'search-ben" OR'})
+    assert response.json() == []
+    response = client.get("/api/v1/products/search", params={"q": '"search-ben'})
+    assert [p["sku"] for p in response.json()] == ["SEARCH-BENCHY"]
+
+    # Keyset pagination walks the same ranking
+    first = client.get("/api/v1/products/search", params={"q": "boat", "limit": 2})
+    second = client.get(
+        "/api/v1/products/search",
+        params={"q": "boat", "limit": 2, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert [p["name"] for p in first.json() + second.json()] == names
+
+    # The index follows product updates
+    hook_id = next(p["id"] for p in first.json() if p["name"] == "Boat Hook")
+    client.put(f"/api/v1/products/{hook_id}", json={"name": "Coat Hook"})
+    names = [
+        p["name"]
+        for p in client.get("/api/v1/products/search", params={"q": "boat"}).json()
+    ]
+    assert "Coat Hook" not in names
+    assert (
+        client.get("/api/v1/products/search", params={"q": "coat"}).json()[0]["id"]
+        == hook_id
+    )
+
+
+def test_get_products_batch(client, query_count):
+    ids = [
+        client.post(
+            "/api/v1/products/",
+            json={"name": f"Batch Product {i}", "price": 1.0, "sku": f"BATCH-{i}"},
+        ).json()["id"]
+        for i in range(3)
+    ]
+
+    requested = [ids[2], 999999, ids[0], ids[2], ids[1]]
+    response = client.post("/api/v1/products/batch", json={"ids": requested})
+    assert response.status_code == 200
+    data = response.json()
+    assert [p["id"] for p in data["products"]] == [ids[2], ids[0], ids[1]]
+    assert data["missing"] == [999999]
+    assert query_count(response) == 1
+
+    response = client.post("/api/v1/products/batch", json={"ids": []})
+    assert response.status_code == 422
+
+
+def test_check_cart_stock(client, query_count):
+    first = client.post(
+        "/api/v1/products/",
+        json={"name": "Cart One", "price": 4.5, "stock": 5, "sku": "CART-1"},
+    ).json()["id"]
+    second = client.post(
+        "/api/v1/products/",
+        json={"name": "Cart Two", "price": 8.0, "stock": 1, "sku": "CART-2"},
+    ).json()["id"]
+
+    response = client.post(
+        "/api/v1/products/check-stock",
+        json={
+            "items": [
+                {"product_id": first, "quantity": 3},
+                {"product_id": second, "quantity": 1},
+                {"product_id": 999999, "quantity": 1},
+            ]
+        },
+    )
+    assert response.status_code == 200
+    assert query_count(response) == 1
+    data = response.json()
+    assert data["all_available"] is False
+    lines = data["items"]
+    assert [line["product_id"] for line in lines] == [first, second, 999999]
+    assert lines[0]["price"] == 4.5
+    assert lines[0]["has_sufficient_stock"] is True
+    assert lines[1]["has_sufficient_stock"] is True
+    assert lines[2]["has_sufficient_stock"] is False
+    assert lines[2]["price"] is None
+
+    # Split lines for one product count against the same stock
+    response = client.post(
+        "/api/v1/products/check-stock",
+        json={
+            "items": [
+                {"product_id": first, "quantity": 3},
+                {"product_id": first, "quantity": 3},
+            ]
+        },
+    )
+    assert response.json()["all_available"] is False
+
+
+def test_export_products(client):
+    for i in range(3):
+        client.post(
+            "/api/v1/products/",
+            json={"name": f"Export {i}", "price": 2.0, "stock": i, "sku": f"EXP-{i}"},
+        )
+    listed = client.get("/api/v1/products/", params={"limit": 100}).json()
+
+    response = client.get("/api/v1/products/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert [r["id"] for r in rows] == [p["id"] for p in listed]
+
+    response = client.get("/api/v1/products/export", params={"format": "csv"})
+    assert response.headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(response.text)))
+    assert [int(r["id"]) for r in records] == [p["id"] for p in listed]
+    assert records[0].keys() >= {"sku", "name", "price", "stock"}
+
+    assert client.get("/api/v1/products/export?format=xml").status_code == 400
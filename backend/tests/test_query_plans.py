@@ -0,0 +1,163 @@
+"""
+Every service query must be answered from an index, never a full table scan.
+"""
+
+import asyncio
+from datetime import datetime
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import Base, create_database_engine
+from app.models.order import Order, OrderItem
+from app.models.product import Product
+from app.models.user import User
+from app.schemas.product import ProductCreate, ProductUpdate
+from app.services.idempotency_service import IdempotencyService
+from app.services.order_service import OrderService
+from app.services.outbox_service import OutboxService
+from app.services.product_export import ProductExportService
+from app.services.product_service import ProductService
+from app.services.user_service import UserService
+from tests.query_plan import capture_statements, explain, plan_problems
+
+AFTER_ORDER = (datetime(2026, 1, 1), 10)
+
+
+async def export_all(db):
+    return [chunk async for chunk in ProductExportService.iter_export(db, "ndjson")]
+
+
+async def reserve_and_roll_back(db):
+    await ProductService.reserve_stock(db, {2: 1})
+    await db.rollback()
+
+
+# Ordered listings of a whole table: walking an index until LIMIT is the plan
+INDEX_WALKS = {"products.list", "products.export", "orders.all"}
+# Ordered by computed relevance, which no index can provide
+RANKED = {"products.search", "products.search_after"}
+
+
+async def claim_and_replay(db):
+    await IdempotencyService.claim(db, "/plans", "key", "fingerprint")
+    await IdempotencyService.complete(db, "/plans", "key", 200, "{}")
+    await IdempotencyService.claim(db, "/plans", "key", "fingerprint")
+    await IdempotencyService.release(db, "/plans", "key")
+
+
+async def deliver_outbox(db):
+    OutboxService.add(db, "plans", {})
+    OutboxService.add(db, "plans", {})
+    await db.commit()
+    delivered, failed = await OutboxService.claim_batch(db, 2)
+    await OutboxService.finish_batch(db, [delivered.id], [(failed, "error")])
+
+
+SERVICE_CALLS = {
+    "products.list": lambda db: ProductService.get_all_products(db, skip=5),
+    "products.list_after": lambda db: ProductService.get_all_products(db, after_id=5),
+    "products.search": lambda db: ProductService.search_products(db, "widget"),
+    "products.search_after": lambda db: ProductService.search_products(
+        db, "widget", after=(-1.0, 5)
+    ),
+    "products.by_id": lambda db: ProductService.get_product_by_id(db, 1),
+    "products.by_ids": lambda db: ProductService.get_products_by_ids(db, [1, 2, 3]),
+    "products.by_sku": lambda db: ProductService.get_product_by_sku(db, "PLAN-1"),
+    "products.upsert": lambda db: ProductService.upsert_products(
+        db, [ProductCreate(name="Plan Widget 1", price=1.0, sku="PLAN-1")]
+    ),
+    "products.update": lambda db: ProductService.update_product(
+        db, 3, ProductUpdate(price=2.0)
+    ),
+    "products.delete": lambda db: ProductService.delete_product(db, 20),
+    "products.reserve_stock": reserve_and_roll_back,
+    "products.export": export_all,
+    "orders.by_id": lambda db: OrderService.get_order_by_id(db, 1),
+    "orders.by_number": lambda db: OrderService.get_order_by_number(db, "ORD-1"),
+    "orders.by_email": lambda db: OrderService.get_orders_by_email(
+        db, "plan1@example.com", skip=1
+    ),
+    "orders.by_email_after": lambda db: OrderService.get_orders_by_email(
+        db, "plan1@example.com", after=AFTER_ORDER
+    ),
+    "orders.by_user": lambda db: OrderService.get_orders_by_user_id(db, 1, skip=1),
+    "orders.by_user_after": lambda db: OrderService.get_orders_by_user_id(
+        db, 1, after=AFTER_ORDER
+    ),
+    "orders.all": lambda db: OrderService.get_all_orders(db, skip=1),
+    "orders.all_after": lambda db: OrderService.get_all_orders(db, after=AFTER_ORDER),
+    "orders.placed_between": lambda db: OrderService.get_orders_placed_between(
+        db, datetime(2026, 1, 1), datetime(2026, 2, 1)
+    ),
+    "orders.update_status": lambda db: OrderService.update_order_status(
+        db, 2, "shipped"
+    ),
+    "orders.pay": lambda db: OrderService.pay_order(db, 3, "pi_paid"),
+    "orders.by_payment_id": lambda db: OrderService.update_order_status_by_payment_id(
+        db, "pi_1", "paid"
+    ),
+    "idempotency.claim": claim_and_replay,
+    "idempotency.purge": lambda db: IdempotencyService.purge_expired(db, force=True),
+    "outbox.deliver": deliver_outbox,
+    "users.by_id": lambda db: UserService.get_user_by_id(db, 1),
+    "users.by_email": lambda db: UserService.get_user_by_email(db, "plan1@example.com"),
+}
+
+
+def test_service_queries_use_indexes(tmp_path):
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'plans.db'}")
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def seed(db):
+        db.add_all(
+            User(email=f"plan{i}@example.com", hashed_password="x") for i in range(5)
+        )
+        db.add_all(
+            Product(
+                name=f"Plan Widget {i}",
+                price=1.0,
+                stock=10,
+                sku=f"PLAN-{i}",
+                is_active=i % 4 != 0,
+            )
+            for i in range(1, 21)
+        )
+        db.add_all(
+            Order(
+                order_number=f"ORD-{i}",
+                customer_email=f"plan{i % 5}@example.com",
+                customer_name="Plan",
+                total_amount=1.0,
+                stripe_payment_id=f"pi_{i}",
+                user_id=i % 5 + 1,
+                items=[OrderItem(product_id=i, quantity=1, price_at_purchase=1.0)],
+            )
+            for i in range(1, 21)
+        )
+        await db.commit()
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as db:
+            await seed(db)
+
+        problems = {}
+        for name, call in SERVICE_CALLS.items():
+            with capture_statements(engine) as statements:
+                async with sessions() as db:
+                    await call(db)
+            assert statements, f"{name} ran no queries"
+            async with engine.connect() as conn:
+                for statement, parameters in statements:
+                    found = plan_problems(
+                        await explain(conn, statement, parameters),
+                        allow_index_walk=name in INDEX_WALKS,
+                        allow_sort=name in RANKED,
+                    )
+                    if found:
+                        problems.setdefault(name, []).extend(found)
+        await engine.dispose()
+        return problems
+
+    assert asyncio.run(run()) == {}
@@ -0,0 +1,66 @@
+"""
+Tests for per-request query counting and N+1 detection.
+"""
+
+import logging
+
+from fastapi.testclient import TestClient
+
+from app.core.middleware import QueryStatsMiddleware
+from app.core.query_log import RequestQueryStats, current_query_stats
+
+
+def test_server_timing_header(client, query_count):
+    client.post(
+        "/api/v1/products/",
+        json={"name": "Timing Product", "price": 1.0, "stock": 1, "sku": "TIMING-1"},
+    )
+    response = client.get("/api/v1/products/")
+    assert response.status_code == 200
+    assert "db;dur=" in response.headers["server-timing"]
+    assert "app;dur=" in response.headers["server-timing"]
+    assert query_count(response) == 1
+
+    # No database work: zero queries reported
+    assert query_count(client.get("/api/v1/ping")) == 0
+
+
+def test_streamed_response_logs_totals(client, caplog):
+    client.post(
+        "/api/v1/products/",
+        json={"name": "Streamed Product", "price": 1.0, "stock": 1, "sku": "TIMING-2"},
+    )
+    with caplog.at_level(logging.DEBUG, logger="app.db.queries"):
+        response = client.get("/api/v1/products/export?format=ndjson")
+    assert response.status_code == 200
+    assert "Streamed Product" in response.text
+    # The body's queries run after the headers are sent, so no header
+    assert "server-timing" not in response.headers
+    (record,) = [r for r in caplog.records if "streamed" in r.getMessage()]
+    assert record.args[2] >= 1
+
+
+def test_repeated_statements_detected():
+    stats = RequestQueryStats()
+    for product_id in range(7):
+        stats.record(f"SELECT * FROM order_items WHERE order_id = {product_id}", 0.1)
+    stats.record("SELECT * FROM orders", 0.1)
+
+    repeated = stats.repeated(threshold=5)
+    assert repeated == [("SELECT * FROM order_items WHERE order_id = ?", 7)]
+    assert stats.count == 8
+
+
+def test_repeated_statements_logged(caplog):
+    async def app(scope, receive, send):
+        stats = current_query_stats.get()
+        for _ in range(3):
+            stats.record("SELECT * FROM order_items WHERE order_id = ?", 0.1)
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b""})
+
+    middleware = QueryStatsMiddleware(app, warn_repeated=True, repeated_threshold=2)
+    with caplog.at_level(logging.WARNING, logger="app.db.queries"):
+        response = TestClient(middleware).get("/orders")
+    assert 'desc="3 queries"' in response.headers["server-timing"]
+    assert any("possible N+1" in r.getMessage() for r in caplog.records)
@@ -0,0 +1,32 @@
+"""
+Cold-start regression tests for application import.
+"""
+
+import subprocess
+import sys
+
+from app.core.config import settings
+from benchmarks.import_profile import measure_import_seconds
+
+# Heavy dependencies that must only be imported on first use
+LAZY_MODULES = ["stripe", "passlib.context", "jose", "alembic", "PIL"]
+
+
+def test_import_app_within_budget():
+    seconds = measure_import_seconds("app.main")
+    assert seconds < settings.import_time_budget_seconds, (
+        f"import app.main took {seconds:.2f}s, budget is "
+        f"{settings.import_time_budget_seconds:.2f}s; "
+        "run `python -m benchmarks.import_profile` to find the regression"
+    )
+
+
+def test_heavy_modules_are_lazy():
+    code = (
+        "import sys, app.main; "
+        f"print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    )
+    assert result.stdout.strip() == ""
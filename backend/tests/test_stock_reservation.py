@@ -0,0 +1,104 @@
+"""
+Tests for atomic stock reservation on order creation.
+"""
+
+import asyncio
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.core.database import Base, create_database_engine
+from app.models.order import Order
+from app.models.product import Product
+from app.schemas.order import OrderCreate, OrderItemCreate
+from app.services.order_service import OrderService
+from app.services.product_service import InsufficientStockError
+
+
+def test_order_rejected_when_any_item_is_short(client):
+    plenty = client.post(
+        "/api/v1/products/",
+        json={"name": "Reserve Plenty", "price": 1.0, "stock": 10, "sku": "RES-A"},
+    ).json()["id"]
+    scarce = client.post(
+        "/api/v1/products/",
+        json={"name": "Reserve Scarce", "price": 1.0, "stock": 1, "sku": "RES-B"},
+    ).json()["id"]
+
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "reserve@example.com",
+            "customer_name": "Reserve",
+            "total_amount": 4.0,
+            "items": [
+                {"product_id": plenty, "quantity": 2, "price_at_purchase": 1.0},
+                {"product_id": scarce, "quantity": 2, "price_at_purchase": 1.0},
+            ],
+        },
+    )
+    assert response.status_code == 409
+    assert str(scarce) in response.json()["detail"]
+    # Nothing was taken from the product that did have stock
+    assert client.get(f"/api/v1/products/{plenty}").json()["stock"] == 10
+
+    # Two lines for the same product are reserved together
+    response = client.post(
+        "/api/v1/orders/",
+        json={
+            "customer_email": "reserve@example.com",
+            "customer_name": "Reserve",
+            "total_amount": 10.0,
+            "items": [
+                {"product_id": plenty, "quantity": 6, "price_at_purchase": 1.0},
+                {"product_id": plenty, "quantity": 5, "price_at_purchase": 1.0},
+            ],
+        },
+    )
+    assert response.status_code == 409
+    assert client.get(f"/api/v1/products/{plenty}").json()["stock"] == 10
+
+
+def test_concurrent_checkouts_never_oversell(tmp_path):
+    stock, buyers = 25, 60
+    engine = create_database_engine(f"sqlite:///{tmp_path / 'stress.db'}")
+    sessions = async_sessionmaker(bind=engine, expire_on_commit=False)
+
+    async def checkout(product_id: int) -> bool:
+        order = OrderCreate(
+            customer_email="buyer@example.com",
+            customer_name="Buyer",
+            total_amount=1.0,
+            items=[
+                OrderItemCreate(product_id=product_id, quantity=1, price_at_purchase=1)
+            ],
+        )
+        async with sessions() as db:
+            try:
+                await OrderService.create_order(db, order)
+                return True
+            except InsufficientStockError:
+                return False
+
+    async def run():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+        async with sessions() as db:
+            product = Product(name="Hot Item", price=1.0, stock=stock, sku="HOT-1")
+            db.add(product)
+            await db.commit()
+
+        results = await asyncio.gather(*(checkout(product.id) for _ in range(buyers)))
+
+        async with sessions() as db:
+            remaining = await db.scalar(
+                select(Product.stock).filter(Product.id == product.id)
+            )
+            orders = await db.scalar(select(func.count()).select_from(Order))
+        await engine.dispose()
+        return results, remaining, orders
+
+    results, remaining, orders = asyncio.run(run())
+    assert sum(results) == stock
+    assert remaining == 0
+    assert orders == stock
@@ -84,3 +84,33 @@ def test_create_order_guest(client: TestClient) -> None:
     assert response.status_code == 201
     created_order = response.json()
     assert created_order["user_id"] is None
+
+
+def test_user_orders_query_count_is_constant(client: TestClient, query_count) -> None:
+    email = "many_orders@example.com"
+    password = "Password123!"
+    client.post(
+        "/api/v1/auth/signup",
+        json={"email": email, "password": password, "full_name": "Many Orders"},
+    )
+    token = client.post(
+        "/api/v1/auth/login/access-token",
+        data={"username": email, "password": password},
+    ).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+
+    order_data = {
+        "customer_email": email,
+        "customer_name": "Many Orders",
+        "total_amount": 100.0,
+        "items": [{"product_id": 1, "quantity": 1, "price_at_purchase": 100.0}],
+    }
+    for _ in range(4):
+        client.post("/api/v1/orders/", json=order_data, headers=headers)
+
+    small = client.get("/api/v1/users/me/orders?limit=1", headers=headers)
+    large = client.get("/api/v1/users/me/orders?limit=50", headers=headers)
+    assert len(small.json()) == 1
+    assert len(large.json()) == 4
+    # User lookup, orders, and one batched load of their items
+    assert query_count(small) == query_count(large) == 3
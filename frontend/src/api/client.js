@@ -30,7 +30,9 @@ async function apiFetch(endpoint, options = {}) {
     }
 
     if (!response.ok) {
-      throw new Error(data.message || data.detail || 'API request failed');
+      const error = new Error(data.message || data.detail || 'API request failed');
+      error.status = response.status;
+      throw error;
     }
 
     return data;
@@ -102,19 +104,37 @@ export const productsApi = {
   },
   
   getById: (id) => apiFetch(`/products/${id}`),
+
+  // One request for many products: { products: [...], missing: [ids] }
+  getBatch: (ids) => apiFetch('/products/batch', {
+    method: 'POST',
+    body: JSON.stringify({ ids }),
+  }),
   
   checkStock: (id, quantity) => apiFetch(`/products/${id}/check-stock`, {
     method: 'POST',
     body: JSON.stringify({ quantity })
   }),
+
+  // Whole cart in one call: items = [{ product_id, quantity }]
+  checkCartStock: (items) => apiFetch('/products/check-stock', {
+    method: 'POST',
+    body: JSON.stringify({ items }),
+  }),
 };
 
 // Orders API
 export const ordersApi = {
-  create: (orderData) => apiFetch('/orders', {
+  create: (orderData, idempotencyKey) => apiFetch('/orders', {
     method: 'POST',
+    headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : {},
     body: JSON.stringify(orderData),
   }),
+
+  processPayment: (id, paymentId) => apiFetch(`/orders/${id}/process-payment`, {
+    method: 'POST',
+    body: JSON.stringify({ stripe_payment_id: paymentId }),
+  }),
   
   getById: (id) => apiFetch(`/orders/${id}`),
   
@@ -123,9 +143,10 @@ export const ordersApi = {
 
 // Payment API
 export const paymentApi = {
-  createIntent: (amount, currency = 'usd') => apiFetch('/payments/create-intent', {
+  // Charges the pending order's server-computed total
+  createIntent: (orderId, currency = 'usd') => apiFetch('/payments/create-intent', {
     method: 'POST',
-    body: JSON.stringify({ amount, currency }),
+    body: JSON.stringify({ order_id: orderId, currency }),
   }),
 };
 